@@ -0,0 +1,15 @@
+"""chess-island URL Configuration for the ASGI entry point
+
+Serves the async versions of the views that hash passwords and of the feeds, and every other URL as in urls.py.
+"""
+from django.urls import path
+from clubs import views
+from .urls import urlpatterns as wsgi_urlpatterns
+
+urlpatterns = [
+    path('sign_up/', views.sign_up_async, name='sign_up'),
+    path('log_in/', views.log_in_async, name='log_in'),
+    path('password/', views.password_async, name='password'),
+    path('feed/', views.feed_async, name='feed'),
+    path('club/<str:club_name>/feed/', views.club_feed_async, name='club_feed'),
+] + wsgi_urlpatterns
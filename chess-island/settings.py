@@ -43,20 +43,27 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'clubs.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'clubs.middleware.MembershipMiddleware',
+    'clubs.middleware.AsgiUrlconfMiddleware',
+    'clubs.middleware.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'chess-island.urls'
 
+# URLconf of requests made through the ASGI entry point, with async views for password hashing
+ASGI_URLCONF = 'chess-island.asgi_urls'
+
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'clubs.metrics.DjangoTemplates',
         'DIRS': [],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -80,9 +87,41 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Seconds each worker keeps its connection across requests
+        'CONN_MAX_AGE': 60,
     }
 }
 
+# Read replica that the read-only views read from, e.g. a copy of the primary kept up to date by
+# the replicate_sqlite command; without one every query goes to the primary
+if os.environ.get('DATABASE_REPLICA_NAME'):
+    DATABASES['replica'] = {**DATABASES['default'], 'NAME': os.environ['DATABASE_REPLICA_NAME']}
+DATABASE_ROUTERS = ['clubs.routers.PrimaryReplicaRouter']
+DATABASE_REPLICA_ALIAS = 'replica' if 'replica' in DATABASES else None
+DATABASE_REPLICA_URL_NAMES = ('feed', 'feed_all_clubs', 'feed_applied_clubs', 'club_feed', 'club_welcome', 'show_user')
+
+# Seconds a browser reads from the primary after it wrote, which should exceed the replication lag
+DATABASE_PRIMARY_PIN_SECONDS = 10
+DATABASE_PRIMARY_PIN_COOKIE = 'primary_pin'
+
+# SQLite pragmas applied to every new connection, by profile: 'production' lets concurrent workers
+# read while one writes and wait for the write lock, 'default' keeps SQLite's own settings
+SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE', 'production')
+SQLITE_PROFILES = {
+    'default': {},
+    'production': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64 * 1024,
+        'temp_store': 'MEMORY',
+    },
+}
+
+# Check persistent SQLite connections at the start of each request, and reconnect if they fail
+SQLITE_HEALTH_CHECKS = True
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -135,6 +174,71 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 AUTH_USER_MODEL = 'clubs.User'
 
 
+# Cache backends: locmem per process, and a file-based cache of memberships shared by every worker,
+# since a role change must reach the access checks of all of them
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'memberships': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'membership_cache',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
+# Test runner that isolates cached data between tests
+TEST_RUNNER = 'clubs.tests.runner.TestRunner'
+
+# Cache alias and timeout (seconds) for club memberships and roster versions; the alias must be shared
+# by every worker process, or a role change only reaches the process that made it
+MEMBERSHIP_CACHE_ALIAS = 'memberships'
+MEMBERSHIP_CACHE_TIMEOUT = 300
+
+# Threads hashing passwords for the async views, which caps how many hashes run at once
+PASSWORD_HASHING_WORKERS = 4
+
+# Threads, each with its own database connection, running the independent reads of the async feeds concurrently
+DATABASE_READ_WORKERS = 4
+
+# Timeout (seconds) of cached roster table fragments, which are also retired by any role change in the club
+ROSTER_FRAGMENT_CACHE_TIMEOUT = 300
+
+# Local avatar proxy: on-disk cache and its size bound, pruned every AVATAR_CACHE_PRUNE_INTERVAL stores,
+# cached sizes, upstream fetcher and HTTP cache lifetimes (seconds)
+AVATAR_CACHE_DIR = BASE_DIR / 'avatar_cache'
+AVATAR_CACHE_MAX_BYTES = 256 * 1024 * 1024
+AVATAR_CACHE_PRUNE_INTERVAL = 100
+AVATAR_SIZE_BUCKETS = (60, 120, 240)
+AVATAR_FETCHER = 'clubs.avatars.GravatarFetcher'
+AVATAR_FETCH_TIMEOUT = 3
+AVATAR_CACHE_TIMEOUT = 86400
+AVATAR_MAX_AGE = 86400
+AVATAR_FALLBACK_MAX_AGE = 60
+
+# Page sizes of the keyset paginated club directory and club roster lists
+CLUB_LIST_PAGE_SIZE = 50
+ROSTER_PAGE_SIZE = 50
+
+# Member search index: 'fts5', 'tokens', or 'auto' to use SQLite FTS5 where available
+MEMBER_SEARCH_BACKEND = 'auto'
+MEMBER_SEARCH_PAGE_SIZE = 20
+
+# Maximum number of typeahead suggestions, and of club prefix indexes kept in memory per process
+MEMBER_TYPEAHEAD_LIMIT = 10
+MEMBER_TYPEAHEAD_MAX_CLUBS = 100
+
+# Request metrics: latency histogram bucket bounds (seconds), and the directory where each worker
+# process writes its metrics every METRICS_FLUSH_SECONDS so the metrics endpoint covers all workers
+METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+METRICS_DIR = os.environ.get('METRICS_DIR')
+METRICS_FLUSH_SECONDS = 10
+
+# Responses carrying a Server-Timing header with their time split: 'all', 'staff' (staff users only) or 'off'
+SERVER_TIMING = os.environ.get('SERVER_TIMING', 'staff')
+
 # URL where @login_prohibited redirects to
 REDIRECT_URL_WHEN_LOGGED_IN = 'feed'
 
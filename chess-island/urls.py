@@ -22,10 +22,14 @@ urlpatterns = [
     path('sign_up/', views.SignUpView.as_view(), name='sign_up'),
     path('log_in/', views.LogInView.as_view(), name='log_in'),
     path('feed/', views.FeedView.as_view(), name='feed'),
+    path('feed/all_clubs/', views.FeedAllClubsView.as_view(), name='feed_all_clubs'),
+    path('feed/applied_clubs/', views.FeedAppliedClubsView.as_view(), name='feed_applied_clubs'),
     path('profile/', views.ProfileUpdateView.as_view(), name='profile'),
     path('password/', views.PasswordView.as_view(), name='password'),
     path('log_out/', views.log_out, name='log_out'),
     path('user/<int:user_id>/', views.ShowUserView.as_view(), name='show_user'),
+    path('avatar/<str:gravatar_hash>/<int:size>/', views.avatar, name='avatar'),
+    path('metrics/', views.metrics, name='metrics'),
     path('club/<str:club_name>/feed/', views.ClubFeedView.as_view() ,name='club_feed'),
     path('club/<int:club_id>/', views.ClubWelcomeView.as_view() ,name='club_welcome'),
     path('club/<str:club_name>/applicants/accept/<int:user_id>/', views.accept_applicant,name='accept_applicant'),
@@ -33,8 +37,10 @@ urlpatterns = [
     path('club/<str:club_name>/member_management/ban/<int:user_id>/', views.ban_member,name='ban_member'),
     path('club/<str:club_name>/member_management/unban/<int:user_id>/', views.unban_member,name='unban_member'),
     path('club/<str:club_name>/member_management/', views.MemberManagementListView.as_view(),name='member_management'),
+    path('club/<str:club_name>/member_management/bulk/', views.bulk_moderate_members,name='bulk_moderate_members'),
     path('club/<str:club_name>/member_management/promote_member/<int:user_id>/', views.promote_member,name='promote_member'),
     path('club/<str:club_name>/applicants/',views.ApplicantListView.as_view(),name='applicants_list'),
+    path('club/<str:club_name>/applicants/bulk/',views.bulk_moderate_applicants,name='bulk_moderate_applicants'),
     path('club/<str:club_name>/officer_management/',views.OfficerListView.as_view(),name='officer_list'),
     path('club/<str:club_name>/officer_management/new_owner/<int:user_id>/', views.transfer_ownership,name='transfer_ownership'),
     path('club/<str:club_name>/officer_management/demote_officer/<int:user_id>/', views.demote_officer,name='demote_officer'),
@@ -42,6 +48,7 @@ urlpatterns = [
     path('create_club/', views.CreateClubView.as_view(),name='create_club'),
     path('club/<str:club_name>/delete/', views.delete_club, name = 'delete_club'),
     path('club/<str:club_name>/search_member/', views.search_member ,name='search_member'),
+    path('club/<str:club_name>/search_member/typeahead/', views.search_member_typeahead ,name='search_member_typeahead'),
     path('withdraw_application/<str:club_name>/<int:user_id>/', views.withdraw_application, name = 'withdraw_application'),
 
 ]
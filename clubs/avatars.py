@@ -0,0 +1,165 @@
+from django.conf import settings
+from django.utils.module_loading import import_string
+from urllib.error import HTTPError, URLError
+from urllib.request import urlopen
+import itertools
+import os
+import tempfile
+import threading
+import time
+
+"""Local avatar proxy. Avatars are fetched from upstream at a fixed set of sizes and kept in an
+on-disk cache keyed by size and email hash, falling back to a generated default image. The cache is
+pruned to AVATAR_CACHE_MAX_BYTES every AVATAR_CACHE_PRUNE_INTERVAL stores, oldest files first."""
+
+EXTENSIONS = {
+    'image/jpeg': 'jpg',
+    'image/png': 'png',
+    'image/gif': 'gif',
+    'image/svg+xml': 'svg',
+}
+CONTENT_TYPES = {extension: content_type for content_type, extension in EXTENSIONS.items()}
+
+DEFAULT_AVATAR = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" viewBox="0 0 100 100">'
+    '<rect width="100" height="100" fill="hsl({hue}, 40%, 60%)"/>'
+    '<circle cx="50" cy="38" r="18" fill="#fff"/>'
+    '<path d="M16 100c0-22 15-34 34-34s34 12 34 34z" fill="#fff"/>'
+    '</svg>')
+
+
+class AvatarFetchError(Exception):
+    """Raised by fetchers when upstream cannot be reached."""
+
+
+class GravatarFetcher:
+    """Fetches avatars from Gravatar, returning None for email hashes without one."""
+
+    URL = 'https://www.gravatar.com/avatar/{hash}?size={size}&default=404'
+
+    def fetch(self, gravatar_hash, size):
+        """Returns (content_type, content) of the avatar, or None if there is no avatar."""
+        try:
+            with urlopen(self.URL.format(hash=gravatar_hash, size=size), timeout=settings.AVATAR_FETCH_TIMEOUT) as response:
+                return response.headers.get_content_type(), response.read()
+        except HTTPError as error:
+            if error.code == 404:
+                return None
+            raise AvatarFetchError(error) from error
+        except (URLError, OSError) as error:
+            raise AvatarFetchError(error) from error
+
+
+class CachedAvatar:
+    """An avatar file in the disk cache."""
+
+    def __init__(self, path, content_type, modified):
+        self.path = path
+        self.content_type = content_type
+        self.modified = modified
+
+    @property
+    def etag(self):
+        return f'"{os.path.basename(self.path)}-{self.modified_ns:x}"'
+
+    @property
+    def modified_ns(self):
+        return int(self.modified * 1000000000)
+
+
+def get_size_bucket(size):
+    """Returns the smallest cached size that is at least the requested size, or the largest cached size."""
+    buckets = sorted(settings.AVATAR_SIZE_BUCKETS)
+    for bucket in buckets:
+        if size <= bucket:
+            return bucket
+    return buckets[-1]
+
+def get_default_avatar(gravatar_hash, size):
+    """Returns a silhouette whose colour is derived from the email hash."""
+    return 'image/svg+xml', DEFAULT_AVATAR.format(size=size, hue=int(gravatar_hash[:4], 16) % 360).encode()
+
+def get_fetcher():
+    return import_string(settings.AVATAR_FETCHER)()
+
+def _get_directory(gravatar_hash, size):
+    return os.path.join(settings.AVATAR_CACHE_DIR, str(size), gravatar_hash[:2])
+
+def _find_cached(gravatar_hash, size):
+    directory = _get_directory(gravatar_hash, size)
+    for extension, content_type in CONTENT_TYPES.items():
+        path = os.path.join(directory, f'{gravatar_hash}.{extension}')
+        try:
+            modified = os.stat(path).st_mtime
+        except FileNotFoundError:
+            continue
+        return CachedAvatar(path, content_type, modified)
+    return None
+
+def _store(gravatar_hash, size, content_type, content):
+    """Writes the avatar to a temporary file first, so readers never see a partial image."""
+    directory = _get_directory(gravatar_hash, size)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'{gravatar_hash}.{EXTENSIONS[content_type]}')
+    descriptor, temporary_path = tempfile.mkstemp(dir=directory)
+    try:
+        with os.fdopen(descriptor, 'wb') as file:
+            file.write(content)
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+    for extension in CONTENT_TYPES:
+        other_path = os.path.join(directory, f'{gravatar_hash}.{extension}')
+        if other_path != path and os.path.exists(other_path):
+            os.unlink(other_path)
+    return CachedAvatar(path, content_type, os.stat(path).st_mtime)
+
+_stores = itertools.count(1)
+_prune_lock = threading.Lock()
+
+def prune_cache():
+    """Deletes the least recently fetched avatars until the cache holds at most AVATAR_CACHE_MAX_BYTES."""
+    files = []
+    for directory, _, names in os.walk(settings.AVATAR_CACHE_DIR):
+        for name in names:
+            path = os.path.join(directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= settings.AVATAR_CACHE_MAX_BYTES:
+            break
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+def _prune_when_due():
+    """Skips pruning while another thread prunes, as one pass serves both"""
+    if next(_stores) % settings.AVATAR_CACHE_PRUNE_INTERVAL == 0 and _prune_lock.acquire(blocking=False):
+        try:
+            prune_cache()
+        finally:
+            _prune_lock.release()
+
+def get_avatar(gravatar_hash, size):
+    """Returns the cached avatar of a size bucket, fetching it if it is missing or older than
+    AVATAR_CACHE_TIMEOUT. Returns None if upstream fails and nothing is cached, in which case
+    callers serve the default avatar without caching it."""
+    cached = _find_cached(gravatar_hash, size)
+    if cached is not None and time.time() - cached.modified < settings.AVATAR_CACHE_TIMEOUT:
+        return cached
+    try:
+        fetched = get_fetcher().fetch(gravatar_hash, size)
+    except AvatarFetchError:
+        return cached
+    if fetched is None or fetched[0] not in EXTENSIONS:
+        fetched = get_default_avatar(gravatar_hash, size)
+    cached = _store(gravatar_hash, size, *fetched)
+    _prune_when_due()
+    return cached
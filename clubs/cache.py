@@ -0,0 +1,160 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from .models import Role
+from . import routers
+import hashlib
+import threading
+import time
+
+"""Cross-request cache of club memberships and cached club page fragments.
+
+Entries are stored under versioned keys. Changing a role bumps the version of the
+user and the club involved, so stale entries are never read again and simply expire."""
+
+USER_NAMESPACE = 'memberships'
+CLUB_NAMESPACE = 'roster'
+FRAGMENT_NAMESPACE = 'fragment'
+
+"""Stands in for the CSRF token while a cached fragment renders, since the token differs between users"""
+CSRF_TOKEN_PLACEHOLDER = 'CSRFTOKENPLACEHOLDER'
+
+
+class CacheStats:
+    """Per-process hit and miss counters for each cache namespace."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._seconds_saved = {}
+
+    def record(self, namespace, hit, seconds_saved=0.0):
+        with self._lock:
+            hits, misses = self._counts.get(namespace, (0, 0))
+            self._counts[namespace] = (hits + 1, misses) if hit else (hits, misses + 1)
+            self._seconds_saved[namespace] = self._seconds_saved.get(namespace, 0.0) + seconds_saved
+
+    def get(self, namespace):
+        """Returns a dictionary with the hits and misses recorded for a namespace."""
+        with self._lock:
+            hits, misses = self._counts.get(namespace, (0, 0))
+        return {'hits': hits, 'misses': misses}
+
+    def get_hit_rate(self, namespace):
+        """Returns the fraction of lookups in a namespace that were hits, or None before the first lookup."""
+        counts = self.get(namespace)
+        lookups = counts['hits'] + counts['misses']
+        return counts['hits'] / lookups if lookups else None
+
+    def get_namespaces(self):
+        """Returns the namespaces with recorded lookups."""
+        with self._lock:
+            return list(self._counts)
+
+    def get_seconds_saved(self, namespace):
+        """Returns the total time that hits in a namespace saved, in seconds."""
+        with self._lock:
+            return self._seconds_saved.get(namespace, 0.0)
+
+    def reset(self):
+        with self._lock:
+            self._counts = {}
+            self._seconds_saved = {}
+
+stats = CacheStats()
+
+
+def _get_cache():
+    return caches[settings.MEMBERSHIP_CACHE_ALIAS]
+
+def _version_key(namespace, object_id):
+    return f'{namespace}:{object_id}:version'
+
+def _get_version(namespace, object_id):
+    cache = _get_cache()
+    key = _version_key(namespace, object_id)
+    version = cache.get(key)
+    if version is None:
+        """Start from the current time so a lost version key never revives old entries"""
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+def _bump_version(namespace, object_id):
+    cache = _get_cache()
+    key = _version_key(namespace, object_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+def _bump(namespace, object_id):
+    """Bump now, and again on commit so readers inside the transaction window cannot
+    store data that is about to change under the new version."""
+    _bump_version(namespace, object_id)
+    transaction.on_commit(lambda: _bump_version(namespace, object_id))
+
+def _get_or_compute(namespace, object_id, compute):
+    cache = _get_cache()
+    key = f'{namespace}:{object_id}:{_get_version(namespace, object_id)}'
+    value = cache.get(key)
+    stats.record(namespace, value is not None)
+    if value is None:
+        """Stale replica reads stored under the current version would outlive the replication lag"""
+        with routers.primary_reads():
+            value = compute()
+        cache.set(key, value, timeout=settings.MEMBERSHIP_CACHE_TIMEOUT)
+    return value
+
+
+def get_user_roles(user_id):
+    """Returns (club_id, club_name, club_role) for every club the user holds a role in."""
+    return _get_or_compute(USER_NAMESPACE, user_id, lambda: list(
+        Role.objects.filter(user_id=user_id).order_by('club_id').values_list(
+            'club_id', 'club__club_name', 'club_role')))
+
+def get_club_version(club_id):
+    """Returns the current version of the club's roster, which changes whenever a role in the club changes."""
+    return _get_version(CLUB_NAMESPACE, club_id)
+
+def _fragment_key(name, club_id, vary_on):
+    vary_hash = hashlib.md5(':'.join(str(value) for value in vary_on).encode()).hexdigest()
+    return f'{FRAGMENT_NAMESPACE}:{name}:{club_id}:{get_club_version(club_id)}:{vary_hash}'
+
+def has_club_fragment(name, club_id, vary_on):
+    """Returns whether the fragment is cached for the club's current roster version."""
+    return _get_cache().has_key(_fragment_key(name, club_id, vary_on))
+
+def get_club_fragment(name, club_id, vary_on, render):
+    """Returns the HTML of a fragment of a club page, rendering and storing it on a miss.
+
+    Entries are keyed on the club's roster version, so any role change in the club retires
+    them, and are rendered from the primary database. Each hit records the time the original render took as time saved."""
+    cache = _get_cache()
+    key = _fragment_key(name, club_id, vary_on)
+    namespace = f'{FRAGMENT_NAMESPACE}:{name}'
+    entry = cache.get(key)
+    if entry is not None:
+        html, seconds = entry
+        stats.record(namespace, True, seconds)
+        return html
+    stats.record(namespace, False)
+    start = time.perf_counter()
+    with routers.primary_reads():
+        html = render()
+    cache.set(key, (html, time.perf_counter() - start), timeout=settings.ROSTER_FRAGMENT_CACHE_TIMEOUT)
+    return html
+
+def insert_csrf_token(html, csrf_token):
+    """Returns the HTML of a cached fragment with the requesting user's CSRF token in its forms."""
+    return html.replace(CSRF_TOKEN_PLACEHOLDER, str(csrf_token or ''))
+
+def get_user_version(user_id):
+    """Returns the current version of the user's details and roles, which changes whenever either changes."""
+    return _get_version(USER_NAMESPACE, user_id)
+
+def invalidate_user(user_id):
+    _bump(USER_NAMESPACE, user_id)
+
+def invalidate_club(club_id):
+    _bump(CLUB_NAMESPACE, club_id)
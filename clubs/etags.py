@@ -0,0 +1,73 @@
+from django.contrib.messages import get_messages
+from django.middleware.csrf import get_token
+from asgiref.sync import sync_to_async
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from functools import wraps
+from . import cache, routers
+import asyncio
+import hashlib
+
+"""Strong validators for pages that only change with the roles and details of the clubs and users on them.
+
+Every validator covers the viewer, their roles and their CSRF cookie, so a page is never revalidated
+for a different user or with a stale form token. Pages with pending messages get no validator, since
+the browser's cached copy would not show them."""
+
+def _make_etag(request, *versions):
+    if not request.user.is_authenticated or len(get_messages(request)):
+        return None
+    """Make sure the CSRF cookie exists, as the page's forms will carry a token for it"""
+    get_token(request)
+    parts = (
+        request.path, request.GET.urlencode(), request.user.id, cache.get_user_version(request.user.id),
+        request.META.get('CSRF_COOKIE', ''), *versions)
+    return hashlib.md5(':'.join(str(part) for part in parts).encode()).hexdigest()
+
+def club_welcome_etag(request, club_id, *args, **kwargs):
+    """The club's row and owner are covered by its roster version, and the viewer's role by their version."""
+    return _make_etag(request, club_id, cache.get_club_version(club_id))
+
+def club_feed_etag(request, club_name, *args, **kwargs):
+    club_id = request.memberships.get_club_id(club_name)
+    if club_id is None:
+        return None
+    return _make_etag(request, club_id, cache.get_club_version(club_id))
+
+def show_user_etag(request, user_id, *args, **kwargs):
+    return _make_etag(request, user_id, cache.get_user_version(user_id))
+
+def conditional_page(etag_func):
+    """Answers GET requests whose If-None-Match matches the page's validator with a 304, before the
+    view runs, and makes browsers revalidate the private page on every visit. Works like Django's
+    condition decorator, for async views too."""
+    def decorator(view_function):
+        if asyncio.iscoroutinefunction(view_function):
+            @wraps(view_function)
+            async def modified_view_function(request, *args, **kwargs):
+                etag = await sync_to_async(_get_etag)(etag_func, request, *args, **kwargs)
+                response = get_conditional_response(request, etag=etag)
+                if response is None:
+                    response = await view_function(request, *args, **kwargs)
+                return _add_validator(request, response, etag)
+        else:
+            @wraps(view_function)
+            def modified_view_function(request, *args, **kwargs):
+                etag = _get_etag(etag_func, request, *args, **kwargs)
+                response = get_conditional_response(request, etag=etag)
+                if response is None:
+                    response = view_function(request, *args, **kwargs)
+                return _add_validator(request, response, etag)
+        return modified_view_function
+    return decorator
+
+def _get_etag(etag_func, request, *args, **kwargs):
+    etag = etag_func(request, *args, **kwargs)
+    return quote_etag(etag) if etag is not None else None
+
+def _add_validator(request, response, etag):
+    """Pages read from a lagging replica may predate the versions in their validator"""
+    if etag is not None and request.method in ('GET', 'HEAD') and not routers.reads_from_replica():
+        response.headers.setdefault('ETag', etag)
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -2,6 +2,8 @@ from django import forms
 from django.core.validators import RegexValidator
 from .models import User,Club
 from django.contrib.auth import authenticate
+from asgiref.sync import sync_to_async
+from . import hashing
 
 class NewPasswordMixin(forms.Form):
     """Form mixing for new_password and password_confirmation fields."""
@@ -51,6 +53,15 @@ class SignUpForm(NewPasswordMixin, forms.ModelForm):
         )
         return user
 
+    async def save_async(self):
+        """Create a new user, hashing the password in the password hashing pool."""
+
+        user = super().save(commit=False)
+        user.username = User.normalize_username(user.username)
+        user.password = await hashing.make_password(self.cleaned_data.get('new_password'))
+        await sync_to_async(user.save)()
+        return user
+
 """Form enabling registered users to log in"""
 class LogInForm(forms.Form):
     username = forms.EmailField(label="Email")
@@ -66,6 +77,16 @@ class LogInForm(forms.Form):
             user = authenticate(username=username, password=password)
         return user
 
+    async def get_user_async(self):
+        """Returns authenticated user if possible, hashing in the password hashing pool."""
+
+        user = None
+        if self.is_valid():
+            username = self.cleaned_data.get('username')
+            password = self.cleaned_data.get('password')
+            user = await hashing.authenticate(username, password)
+        return user
+
 """Form enabling logged in users to create a club"""
 class NewClubForm(forms.ModelForm):
     class Meta:
@@ -108,11 +129,14 @@ class PasswordForm(NewPasswordMixin):
 
         super().__init__(**kwargs)
         self.user = user
+        self.check_current_password = True
 
     def clean(self):
         """Clean the data and generate messages for any errors."""
 
         super().clean()
+        if not self.check_current_password:
+            return
         password = self.cleaned_data.get('password')
         if self.user is not None:
             user = authenticate(username=self.user.username, password=password)
@@ -121,6 +145,16 @@ class PasswordForm(NewPasswordMixin):
         if user is None:
             self.add_error('password', "Password is invalid")
 
+    async def is_valid_async(self):
+        """Validate the form, checking the current password in the password hashing pool."""
+
+        self.check_current_password = False
+        self.is_valid()
+        password = self.cleaned_data.get('password')
+        if self.user is None or password is None or await hashing.authenticate(self.user.username, password) is None:
+            self.add_error('password', "Password is invalid")
+        return not self.errors
+
     def save(self):
         """Save the user's new password."""
 
@@ -129,3 +163,12 @@ class PasswordForm(NewPasswordMixin):
             self.user.set_password(new_password)
             self.user.save()
         return self.user
+
+    async def save_async(self):
+        """Save the user's new password, hashing it in the password hashing pool."""
+
+        new_password = self.cleaned_data['new_password']
+        if self.user is not None:
+            self.user.password = await hashing.make_password(new_password)
+            await sync_to_async(self.user.save)()
+        return self.user
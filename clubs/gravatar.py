@@ -0,0 +1,14 @@
+from libgravatar import md5_hash, sanitize_email
+
+"""Gravatar URLs built from stored email hashes, in the format libgravatar produces."""
+
+GRAVATAR_URL = 'https://www.gravatar.com/avatar/{hash}?size={size}&default=mp'
+
+def get_gravatar_hash(email):
+    """Returns the MD5 hash of the normalised email address, as Gravatar expects."""
+    return md5_hash(sanitize_email(email))
+
+def get_gravatar_url(gravatar_hash, size):
+    if not 0 < size < 2048:
+        raise ValueError('Invalid image size.')
+    return GRAVATAR_URL.format(hash=gravatar_hash, size=size)
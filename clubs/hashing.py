@@ -0,0 +1,63 @@
+from asgiref.sync import sync_to_async
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth import hashers
+from .models import User
+import asyncio
+import functools
+import threading
+
+"""Password hashing off the request thread, for the async views served through the ASGI entry point.
+
+Hashers such as PBKDF2 spend hundreds of milliseconds of CPU on every call. Running them in a
+bounded pool keeps the event loop free for other requests and caps how many hash at once.
+hashlib releases the GIL while it hashes, so the pool threads hash in parallel."""
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_executor():
+    """Returns the process-wide password hashing pool, sized by PASSWORD_HASHING_WORKERS."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASHING_WORKERS, thread_name_prefix='password-hashing')
+        return _executor
+
+async def _run(function, *args):
+    return await asyncio.get_running_loop().run_in_executor(get_executor(), functools.partial(function, *args))
+
+def _check_password(password, encoded):
+    """Returns whether the password matches the hash, and a new hash if the hasher's settings changed."""
+    updated = []
+    valid = hashers.check_password(password, encoded, setter=lambda raw: updated.append(hashers.make_password(raw)))
+    return valid, updated[0] if updated else None
+
+async def make_password(password):
+    """Returns the hash of the password, computed in the password hashing pool."""
+    return await _run(hashers.make_password, password)
+
+async def check_user_password(user, password):
+    """Returns whether the password is the user's, upgrading their stored hash like User.check_password."""
+    valid, updated_hash = await _run(_check_password, password, user.password)
+    if updated_hash is not None:
+        user.password = updated_hash
+        await sync_to_async(user.save)(update_fields=['password'])
+    return valid
+
+async def authenticate(username, password):
+    """Returns the active user with the username and password, or None.
+
+    Mirrors ModelBackend, the project's only authentication backend, with the hashing done in
+    the password hashing pool."""
+    try:
+        user = await sync_to_async(User._default_manager.get_by_natural_key)(username)
+    except User.DoesNotExist:
+        """Hash anyway, so the response time does not reveal whether the user exists"""
+        await make_password(password)
+        return None
+    if await check_user_password(user, password) and user.is_active:
+        user.backend = 'django.contrib.auth.backends.ModelBackend'
+        return user
+    return None
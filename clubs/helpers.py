@@ -2,10 +2,13 @@ from django.shortcuts import redirect
 from django.conf import settings
 from .models import User,Club,Role
 from django.core.exceptions import ObjectDoesNotExist
+from .metrics import timing_check
 
 def login_prohibited(view_function):
     def modified_view_function(request):
-        if request.user.is_authenticated:
+        with timing_check():
+            is_authenticated = request.user.is_authenticated
+        if is_authenticated:
             return redirect(settings.REDIRECT_URL_WHEN_LOGGED_IN)
         else:
             return view_function(request)
@@ -14,63 +17,52 @@ def login_prohibited(view_function):
 """check whether the user is an officer or an owner"""
 def management_required(view_function):
     def modified_view_function(request,club_name,*args,**kwargs):
-        try:
-            club = Club.objects.get(club_name=club_name)
-            role = club.get_club_role(request.user)
-        except ObjectDoesNotExist:
-            return redirect(settings.REDIRECT_URL_WHEN_LOGGED_IN)
+        with timing_check():
+            role = request.memberships.get_club_role_by_name(club_name)
+        if role == 'OFF' or role == 'OWN':
+            return view_function(request,club_name,*args,**kwargs)
         else:
-            if role == 'OFF' or role == 'OWN':
-                return view_function(request,club_name,*args,**kwargs)
-            else:
-                return redirect(settings.REDIRECT_URL_WHEN_LOGGED_IN)
+            return redirect(settings.REDIRECT_URL_WHEN_LOGGED_IN)
     return modified_view_function
 
 """check whether the user is an owner"""
 def owner_required(view_function):
     def modified_view_function(request,club_name,*args,**kwargs):
-        try:
-            club = Club.objects.get(club_name=club_name)
-            role = club.get_club_role(request.user)
-        except ObjectDoesNotExist:
-            return redirect(settings.REDIRECT_URL_WHEN_LOGGED_IN)
+        with timing_check():
+            role = request.memberships.get_club_role_by_name(club_name)
+        if role == 'OWN':
+            return view_function(request,club_name,*args,**kwargs)
         else:
-            if role == 'OWN':
-                return view_function(request,club_name,*args,**kwargs)
-            else:
-                return redirect(settings.REDIRECT_URL_WHEN_LOGGED_IN)
+            return redirect(settings.REDIRECT_URL_WHEN_LOGGED_IN)
     return modified_view_function
 
 """check whether the user is a member"""
 def membership_required(view_function):
         def modified_view_function(request,club_name,*args,**kwargs):
-            try:
-                club = Club.objects.get(club_name=club_name)
-                role = request.user.role_set.get(club=club)
-            except ObjectDoesNotExist:
-                return redirect(settings.REDIRECT_URL_WHEN_LOGGED_IN)
+            with timing_check():
+                role = request.memberships.get_club_role_by_name(club_name)
+            if role in Role.IN_CLUB_ROLES:
+                return view_function(request,club_name,*args,**kwargs)
             else:
-                if role.club_role == 'MEM' or role.club_role == 'OFF' or role.club_role == 'OWN':
-                    return view_function(request,club_name,*args,**kwargs)
-                else:
-                    return redirect(settings.REDIRECT_URL_WHEN_LOGGED_IN)
+                return redirect(settings.REDIRECT_URL_WHEN_LOGGED_IN)
         return modified_view_function
 
 """check whether the club exists"""
 def club_exists(view_function):
     def modified_view_function(request,club_name,*args,**kwargs):
-        try:
-            club = Club.objects.get(club_name=club_name)
-        except ObjectDoesNotExist:
-            return redirect(settings.REDIRECT_URL_WHEN_LOGGED_IN)
-        else:
+        with timing_check():
+            exists = request.memberships.has_club(club_name) or Club.objects.filter(club_name=club_name).exists()
+        if exists:
             return view_function(request,club_name,*args,**kwargs)
+        else:
+            return redirect(settings.REDIRECT_URL_WHEN_LOGGED_IN)
     return modified_view_function
 
 def club_exists_id(view_function):
     def modified_view_function(request,club_id,*args,**kwargs):
         try:
-            club = Club.objects.get(id=club_id)
+            with timing_check():
+                club = Club.objects.get(id=club_id)
         except ObjectDoesNotExist:
             return redirect(settings.REDIRECT_URL_WHEN_LOGGED_IN)
         else:
@@ -80,21 +72,32 @@ def club_exists_id(view_function):
 def user_exists(view_function):
     def modified_view_function(request,user_id,*args,**kwargs):
         try:
-            user = User.objects.get(id=user_id)
+            with timing_check():
+                user = User.objects.get(id=user_id)
         except ObjectDoesNotExist:
             return redirect(settings.REDIRECT_URL_WHEN_LOGGED_IN)
         else:
             return view_function(request,user_id,*args,**kwargs)
     return modified_view_function
 
-def user_in_club(view_function):
-    def modified_view_function(request,club_name,user_id,*args,**kwargs):
-        try:
-            club = Club.objects.get(club_name=club_name)
-            user = User.objects.get(id=user_id)
-            role = club.get_club_role(user)
-        except ObjectDoesNotExist:
-            return redirect(settings.REDIRECT_URL_WHEN_LOGGED_IN)
-        else:
-            return view_function(request,club_name,user_id,*args,**kwargs)
-    return modified_view_function
+"""check the roles of the requesting user and of the target user in the club with a single query,
+and call the view with the club and target user instead of club_name and user_id"""
+def club_access(actor_roles,target_role,target_is_actor=False):
+    def decorator(view_function):
+        def modified_view_function(request,club_name,user_id,*args,**kwargs):
+            with timing_check():
+                roles = Role.objects.select_related('club','user').filter(
+                    club__club_name=club_name, user_id__in={request.user.id,user_id})
+                roles = {role.user_id: role for role in roles}
+            actor = roles.get(request.user.id)
+            target = roles.get(user_id)
+            if actor is None or actor.club_role not in actor_roles:
+                return redirect(settings.REDIRECT_URL_WHEN_LOGGED_IN)
+            elif target is None or target.club_role != target_role:
+                return redirect(settings.REDIRECT_URL_WHEN_LOGGED_IN)
+            elif target_is_actor and target.user_id != actor.user_id:
+                return redirect(settings.REDIRECT_URL_WHEN_LOGGED_IN)
+            else:
+                return view_function(request,target.club,target.user,*args,**kwargs)
+        return modified_view_function
+    return decorator
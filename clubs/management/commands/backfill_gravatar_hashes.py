@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from clubs.gravatar import get_gravatar_hash
+from clubs.models import User
+
+class Command(BaseCommand):
+    """Stores the gravatar hash of users saved before it was stored, or whose stored hash is stale.
+
+    Users are streamed in chunks ordered by primary key, so memory use stays flat and each
+    chunk is a single indexed range query."""
+
+    help = 'Backfill stored gravatar hashes of existing users'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        last_id = 0
+        checked = 0
+        updated = 0
+        while True:
+            chunk = list(User.objects.filter(id__gt=last_id).order_by('id').values_list(
+                'id', 'email', 'username', 'gravatar_hash')[:options['chunk_size']])
+            if not chunk:
+                break
+            stale = []
+            for user_id, email, username, gravatar_hash in chunk:
+                expected = get_gravatar_hash(email or username)
+                if gravatar_hash != expected:
+                    stale.append(User(id=user_id, gravatar_hash=expected))
+            User.objects.bulk_update(stale, ['gravatar_hash'])
+            checked += len(chunk)
+            updated += len(stale)
+            last_id = chunk[-1][0]
+            self.stdout.write(f'Checked {checked} users', ending='\r')
+        self.stdout.write(self.style.SUCCESS(f'Checked {checked} users, updated {updated} gravatar hashes.'))
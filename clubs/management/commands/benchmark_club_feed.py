@@ -0,0 +1,126 @@
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from django.test import AsyncClient, Client
+from django.urls import reverse
+from clubs.models import Club, User
+import asyncio
+import os
+import tempfile
+import time
+
+class Command(BaseCommand):
+    """Compares the latency of the sync ClubFeedView and of the async view of the ASGI entry point,
+    when every database query takes extra time, as it does against a database server across a network.
+
+    The latency is simulated by sleeping before every query, on every connection. Every request has a
+    query string of its own, so it misses the roster table cache and both views run all their reads; the async view runs its independent
+    reads concurrently in the database read pool. Runs against a scratch SQLite database, so it never
+    touches the project database."""
+
+    help = 'Benchmark club feed latency through the sync and async views, with simulated query latency'
+
+    PASSWORD = 'Password123'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--members', type=int, default=200)
+        parser.add_argument('--requests', type=int, default=50, help='Requests made through each path, per latency')
+        parser.add_argument(
+            '--latencies', type=float, nargs='+', default=[0, 1, 5, 10], help='Simulated query latencies (milliseconds)')
+
+    def handle(self, *args, **options):
+        self.latency = 0
+        with tempfile.TemporaryDirectory() as directory:
+            self._use_scratch_database(os.path.join(directory, 'club_feed.sqlite3'))
+            connection_created.connect(self._add_latency)
+            try:
+                self._run(options)
+            finally:
+                connection_created.disconnect(self._add_latency)
+                connections.close_all()
+
+    def _use_scratch_database(self, name):
+        connections.close_all()
+        database = connections.databases['default']
+        if database['ENGINE'] != 'django.db.backends.sqlite3':
+            raise CommandError('The benchmark runs on SQLite only.')
+        database['NAME'] = settings.DATABASES['default']['NAME'] = name
+        call_command('migrate', verbosity=0)
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode=WAL')
+
+    def _add_latency(self, sender, connection, **kwargs):
+        """A thread reconnects through the same connection handler, which keeps its wrappers"""
+        if self._delay not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self._delay)
+
+    def _delay(self, execute, sql, params, many, context):
+        time.sleep(self.latency)
+        return execute(sql, params, many, context)
+
+    def _run(self, options):
+        club = Club.objects.create(club_name='Benchmark', location='London', description='Benchmark club')
+        users = [
+            User.objects.create_user(
+                username=f'user{number}@example.org', first_name='Club', last_name=f'Feed{number}',
+                password=self.PASSWORD)
+            for number in range(3)]
+        User.objects.bulk_create([
+            User(username=f'user{number}@example.org', first_name='Club', last_name=f'Feed{number}')
+            for number in range(3, options['members'])])
+        club.club_members.add(users[0], through_defaults={'club_role': 'OWN'})
+        club.club_members.add(users[1], through_defaults={'club_role': 'OFF'})
+        club.club_members.add(
+            *User.objects.exclude(id__in=[users[0].id, users[1].id]), through_defaults={'club_role': 'MEM'})
+        """The test clients send requests to the host 'testserver'"""
+        settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'testserver']
+        url = reverse('club_feed', kwargs={'club_name': club.club_name})
+        client = Client()
+        client.login(username=users[2].username, password=self.PASSWORD)
+        async_client = AsyncClient()
+        async_client.cookies = client.cookies
+        connections.close_all()
+
+        self.stdout.write(
+            f"{options['requests']} club feed requests per path, {options['members']} members (milliseconds)")
+        self.stdout.write(
+            f"{'query latency':<15}{'sync p50':>10}{'sync p95':>10}{'async p50':>10}{'async p95':>10}{'speedup':>10}")
+        for latency in options['latencies']:
+            self.latency = latency / 1000
+            sync_latencies = self._measure_sync(client, url, f'sync{latency}', options['requests'])
+            async_latencies = asyncio.run(
+                self._measure_async(async_client, url, f'async{latency}', options['requests']))
+            sync_median = self._percentile(sync_latencies, 0.5)
+            async_median = self._percentile(async_latencies, 0.5)
+            self.stdout.write(
+                f'{latency:<15g}{sync_median:>10.1f}{self._percentile(sync_latencies, 0.95):>10.1f}'
+                f'{async_median:>10.1f}{self._percentile(async_latencies, 0.95):>10.1f}'
+                f'{sync_median / async_median:>9.2f}x')
+
+    def _percentile(self, latencies, fraction):
+        latencies = sorted(latencies)
+        return latencies[min(int(len(latencies) * fraction), len(latencies) - 1)] if latencies else float('nan')
+
+    def _measure_sync(self, client, url, label, request_count):
+        latencies = []
+        client.get(url)
+        for number in range(request_count):
+            start = time.perf_counter()
+            self._check(client.get(url, {'request': f'{label}-{number}'}))
+            latencies.append((time.perf_counter() - start) * 1000)
+        return latencies
+
+    async def _measure_async(self, client, url, label, request_count):
+        latencies = []
+        await client.get(url)
+        for number in range(request_count):
+            start = time.perf_counter()
+            self._check(await client.get(url, {'request': f'{label}-{number}'}))
+            latencies.append((time.perf_counter() - start) * 1000)
+        return latencies
+
+    def _check(self, response):
+        if response.status_code != 200:
+            raise CommandError(f'The club feed failed with status {response.status_code}.')
@@ -0,0 +1,178 @@
+from asgiref.sync import sync_to_async
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import AsyncClient, Client
+from django.urls import reverse
+from django.utils.http import urlencode
+from clubs.models import User
+import asyncio
+import os
+import random
+import tempfile
+import threading
+import time
+
+class Command(BaseCommand):
+    """Measures log in throughput and tail latency under concurrent load, through the sync LogInView
+    and through the async view of the ASGI entry point.
+
+    Both paths serve the same logins from the same number of concurrent clients. The sync path serves
+    them in order with --workers threads, like as many sync gunicorn workers. The async path runs on one event loop,
+    hashing in a pool of --workers threads. Meanwhile one more client keeps loading the home page,
+    showing how long other requests wait while logins hash. Runs against a scratch SQLite database
+    in WAL mode, so it never touches the project database."""
+
+    help = 'Benchmark log in throughput and latency through the sync and async views'
+
+    PASSWORD = 'Password123'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--requests', type=int, default=200, help='Logins made through each path')
+        parser.add_argument('--clients', type=int, default=32, help='Concurrent clients')
+        parser.add_argument('--workers', type=int, default=4, help='Sync workers, and password hashing threads')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            self._use_scratch_database(os.path.join(directory, 'log_in.sqlite3'))
+            try:
+                self._run(options)
+            finally:
+                connections.close_all()
+
+    def _use_scratch_database(self, name):
+        connections.close_all()
+        database = connections.databases['default']
+        if database['ENGINE'] != 'django.db.backends.sqlite3':
+            raise CommandError('The benchmark runs on SQLite only.')
+        database['NAME'] = settings.DATABASES['default']['NAME'] = name
+        call_command('migrate', verbosity=0)
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode=WAL')
+
+    def _run(self, options):
+        password = make_password(self.PASSWORD)
+        User.objects.bulk_create([
+            User(username=f'user{number}@example.org', first_name='Log', last_name=f'In{number}', password=password)
+            for number in range(options['users'])])
+        generator = random.Random(options['seed'])
+        logins = [
+            {'username': f"user{generator.randrange(options['users'])}@example.org", 'password': self.PASSWORD}
+            for _ in range(options['requests'])]
+        settings.PASSWORD_HASHING_WORKERS = options['workers']
+        """The test clients send requests to the host 'testserver'"""
+        settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'testserver']
+        connections.close_all()
+
+        results = {
+            'sync': self._measure_sync(logins, options['clients'], options['workers']),
+            'async': asyncio.run(self._measure_async(logins, options['clients'])),
+        }
+
+        self.stdout.write(
+            f"{options['requests']} logins per path from {options['clients']} concurrent clients, "
+            f"{options['workers']} workers (milliseconds)")
+        self.stdout.write(
+            f"{'path':<8}{'logins/s':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}{'home p50':>10}{'home p99':>10}")
+        for path, (elapsed, latencies, home_latencies) in results.items():
+            self.stdout.write(
+                f'{path:<8}{len(latencies) / elapsed:>10.1f}{self._percentile(latencies, 0.5):>10.1f}'
+                f'{self._percentile(latencies, 0.95):>10.1f}{self._percentile(latencies, 0.99):>10.1f}'
+                f'{max(latencies):>10.1f}{self._percentile(home_latencies, 0.5):>10.1f}'
+                f'{self._percentile(home_latencies, 0.99):>10.1f}')
+
+    def _percentile(self, latencies, fraction):
+        latencies = sorted(latencies)
+        return latencies[min(int(len(latencies) * fraction), len(latencies) - 1)] if latencies else float('nan')
+
+    def _measure_sync(self, logins, client_count, worker_count):
+        """Requests queue in order for the worker threads, as they do for sync gunicorn workers."""
+        pending = iter(logins)
+        lock = threading.Lock()
+        latencies = []
+        url = reverse('log_in')
+        local = threading.local()
+
+        done = threading.Event()
+        home_latencies = []
+
+        def get_client():
+            if not hasattr(local, 'client'):
+                local.client = Client()
+            local.client.cookies.clear()
+            return local.client
+
+        def log_in(data):
+            return get_client().post(url, data)
+
+        def load_home(workers):
+            while not done.is_set():
+                start = time.perf_counter()
+                workers.submit(lambda: get_client().get('/')).result()
+                home_latencies.append((time.perf_counter() - start) * 1000)
+
+        def work(workers):
+            while True:
+                with lock:
+                    data = next(pending, None)
+                if data is None:
+                    return
+                start = time.perf_counter()
+                self._check(workers.submit(log_in, data).result())
+                with lock:
+                    latencies.append((time.perf_counter() - start) * 1000)
+
+        with ThreadPoolExecutor(max_workers=worker_count) as workers:
+            threads = [threading.Thread(target=work, args=(workers,)) for _ in range(client_count)]
+            home_loader = threading.Thread(target=load_home, args=(workers,))
+            start = time.perf_counter()
+            home_loader.start()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+            done.set()
+            home_loader.join()
+        return elapsed, latencies, home_latencies
+
+    async def _measure_async(self, logins, client_count):
+        pending = iter(logins)
+        latencies = []
+        url = reverse('log_in')
+        done = asyncio.Event()
+        home_latencies = []
+
+        async def load_home():
+            client = AsyncClient()
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get('/')
+                home_latencies.append((time.perf_counter() - start) * 1000)
+
+        async def work():
+            client = AsyncClient()
+            for data in pending:
+                start = time.perf_counter()
+                response = await client.post(url, urlencode(data), content_type='application/x-www-form-urlencoded')
+                client.cookies.clear()
+                self._check(response)
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        home_loader = asyncio.ensure_future(load_home())
+        start = time.perf_counter()
+        await asyncio.gather(*(work() for _ in range(client_count)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await home_loader
+        await sync_to_async(connections.close_all)()
+        return elapsed, latencies, home_latencies
+
+    def _check(self, response):
+        if response.status_code != 302:
+            raise CommandError(f'Log in failed with status {response.status_code}.')
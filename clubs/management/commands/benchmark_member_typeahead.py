@@ -0,0 +1,94 @@
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.models import Value
+from django.db.models.functions import Concat
+from faker import Faker
+from clubs.models import User,Club,Role
+from clubs.typeahead import MemberPrefixIndex
+import os
+import random
+import statistics
+import tempfile
+import time
+
+class Command(BaseCommand):
+    """Compares typeahead lookups in a club's member prefix index with the Concat/__contains
+    query search_member used to make.
+
+    Runs against a scratch SQLite database, so it never touches the project database."""
+
+    help = 'Benchmark member typeahead lookups against the Concat/__contains query'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--members', type=int, default=50000)
+        parser.add_argument('--lookups', type=int, default=2000)
+        parser.add_argument('--limit', type=int, default=10)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            self._use_scratch_database(os.path.join(directory, 'typeahead.sqlite3'))
+            try:
+                self._run(options)
+            finally:
+                connections.close_all()
+
+    def _use_scratch_database(self, name):
+        connections.close_all()
+        database = connections.databases['default']
+        if database['ENGINE'] != 'django.db.backends.sqlite3':
+            raise CommandError('The benchmark runs on SQLite only.')
+        database['NAME'] = settings.DATABASES['default']['NAME'] = name
+        call_command('migrate', verbosity=0)
+
+    def _create_club(self, member_count, seed):
+        faker = Faker('en_GB')
+        faker.seed_instance(seed)
+        club = Club.objects.create(club_name='Benchmark Chess Club', location='London', description='Benchmark')
+        User.objects.bulk_create([
+            User(username=f'member{number}@example.org', first_name=faker.first_name(), last_name=faker.last_name())
+            for number in range(member_count)], batch_size=5000)
+        Role.objects.bulk_create([
+            Role(club=club, user_id=user_id, club_role='MEM')
+            for user_id in User.objects.values_list('id', flat=True)], batch_size=5000)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        return club
+
+    def _run(self, options):
+        club = self._create_club(options['members'], options['seed'])
+        generator = random.Random(options['seed'])
+        names = list(User.objects.values_list('first_name', 'last_name'))
+        """Typed prefixes of one to four letters of a member's first or last name"""
+        queries = [generator.choice(generator.choice(names))[:generator.randint(1, 4)] for _ in range(options['lookups'])]
+        limit = options['limit']
+
+        start = time.perf_counter()
+        index = MemberPrefixIndex(club.get_all_users_in_club().values_list('id', 'first_name', 'last_name'))
+        build = (time.perf_counter() - start) * 1000
+
+        members = club.get_all_users_in_club()
+        def contains_query(query):
+            queryset = members.annotate(search_name=Concat('first_name', Value(' '), 'last_name'))
+            return list(queryset.filter(search_name__contains=query).values_list('id', 'first_name', 'last_name')[:limit])
+
+        results = {
+            'Concat/__contains': self._measure(contains_query, queries),
+            'prefix index': self._measure(lambda query: index.search(query, limit), queries),
+        }
+        self.stdout.write(f"{options['members']} members, {options['lookups']} lookups of up to {limit} results (milliseconds)")
+        self.stdout.write(f'Prefix index built in {build:.0f} ms')
+        self.stdout.write(f"{'lookup':<20}{'p50':>10}{'p95':>10}{'p99':>10}")
+        for name, (p50, p95, p99) in results.items():
+            self.stdout.write(f'{name:<20}{p50:>10.3f}{p95:>10.3f}{p99:>10.3f}')
+
+    def _measure(self, lookup, queries):
+        timings = []
+        for query in queries:
+            start = time.perf_counter()
+            lookup(query)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        return statistics.median(timings), timings[int(len(timings) * 0.95)], timings[int(len(timings) * 0.99)]
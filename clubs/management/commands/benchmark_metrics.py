@@ -0,0 +1,113 @@
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from django.test import Client, override_settings
+from django.urls import reverse
+from clubs import metrics
+from clubs.models import Club, User
+import os
+import tempfile
+import time
+
+class Command(BaseCommand):
+    """Measures the overhead of recording request metrics, by serving the same requests with and without
+    the metrics middleware, the timed template backend and the SQL timing wrapper.
+
+    Batches with and without metrics alternate, so drift in the machine's speed affects both alike.
+    Runs against a scratch SQLite database, so it never touches the project database."""
+
+    help = 'Benchmark the overhead of recording request metrics'
+
+    PASSWORD = 'Password123'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--members', type=int, default=200)
+        parser.add_argument('--requests', type=int, default=50, help='Requests per view in each batch')
+        parser.add_argument('--rounds', type=int, default=10, help='Batches with and without metrics')
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            self._use_scratch_database(os.path.join(directory, 'metrics.sqlite3'))
+            try:
+                self._run(options)
+            finally:
+                connections.close_all()
+
+    def _use_scratch_database(self, name):
+        connections.close_all()
+        database = connections.databases['default']
+        if database['ENGINE'] != 'django.db.backends.sqlite3':
+            raise CommandError('The benchmark runs on SQLite only.')
+        database['NAME'] = settings.DATABASES['default']['NAME'] = name
+        call_command('migrate', verbosity=0)
+
+    def _run(self, options):
+        club = Club.objects.create(club_name='Benchmark', location='London', description='Benchmark club')
+        user = User.objects.create_user(
+            username='user0@example.org', first_name='Club', last_name='Metrics0', password=self.PASSWORD)
+        User.objects.bulk_create([
+            User(username=f'user{number}@example.org', first_name='Club', last_name=f'Metrics{number}')
+            for number in range(1, options['members'])])
+        club.club_members.add(user, through_defaults={'club_role': 'OWN'})
+        club.club_members.add(*User.objects.exclude(id=user.id), through_defaults={'club_role': 'MEM'})
+        """The test client sends requests to the host 'testserver'"""
+        settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'testserver']
+        urls = [
+            reverse('feed'),
+            reverse('club_feed', kwargs={'club_name': club.club_name}),
+            reverse('show_user', kwargs={'user_id': user.id})]
+        """Each client loads the middleware of the settings it first serves a request with"""
+        instrumented = Client()
+        instrumented.login(username=user.username, password=self.PASSWORD)
+        baseline = Client()
+        baseline.cookies = instrumented.cookies
+        with self._without_metrics():
+            self._measure(baseline, urls, 1)
+        self._measure(instrumented, urls, 1)
+
+        instrumented_seconds = baseline_seconds = 0.0
+        for _ in range(options['rounds']):
+            with self._without_metrics():
+                baseline_seconds += self._measure(baseline, urls, options['requests'])
+            instrumented_seconds += self._measure(instrumented, urls, options['requests'])
+        request_count = options['rounds'] * options['requests'] * len(urls)
+        self.stdout.write(f"{request_count} requests with and without metrics, {options['members']} members")
+        self.stdout.write(f'{"without metrics":<20}{baseline_seconds / request_count * 1000:>8.3f} ms per request')
+        self.stdout.write(f'{"with metrics":<20}{instrumented_seconds / request_count * 1000:>8.3f} ms per request')
+        self.stdout.write(f'{"overhead":<20}{(instrumented_seconds / baseline_seconds - 1) * 100:>8.2f} %')
+
+    def _without_metrics(self):
+        """Settings without the metrics middleware and with the stock template backend, which also
+        takes the SQL timing wrapper off the connection while they apply"""
+        class WithoutMetrics(override_settings):
+            def enable(self):
+                super().enable()
+                connection_created.disconnect(metrics.instrument_connection)
+                connection.execute_wrappers.remove(metrics._time_query)
+
+            def disable(self):
+                connection_created.connect(metrics.instrument_connection)
+                connection.execute_wrappers.append(metrics._time_query)
+                super().disable()
+
+        return WithoutMetrics(
+            MIDDLEWARE=[path for path in settings.MIDDLEWARE if path != 'clubs.middleware.MetricsMiddleware'],
+            TEMPLATES=[
+                {**engine, 'BACKEND': 'django.template.backends.django.DjangoTemplates'}
+                for engine in settings.TEMPLATES])
+
+    def _measure(self, client, urls, request_count):
+        """Returns the seconds taken by the requests, after a request to each view to load its templates"""
+        for url in urls:
+            self._check(client.get(url))
+        start = time.perf_counter()
+        for _ in range(request_count):
+            for url in urls:
+                self._check(client.get(url))
+        return time.perf_counter() - start
+
+    def _check(self, response):
+        if response.status_code != 200:
+            raise CommandError(f'A request failed with status {response.status_code}.')
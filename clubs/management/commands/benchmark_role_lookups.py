@@ -0,0 +1,86 @@
+from django.core.management.base import BaseCommand
+import random
+import sqlite3
+import statistics
+import time
+
+class Command(BaseCommand):
+    """Measures Role lookup latency before and after the composite Role indexes.
+
+    Runs against a scratch in-memory SQLite database shaped like clubs_role,
+    so it never touches the project database."""
+
+    help = 'Benchmark Role lookups with and without the composite Role indexes'
+
+    ROLES = ['APP', 'MEM', 'OFF', 'BAN']
+
+    """Mirrors the lookups made by Club.get_club_role, Club.get_members and User.get_user_clubs"""
+    QUERIES = {
+        'role of user in club': (
+            'SELECT club_role FROM clubs_role WHERE club_id = ? AND user_id = ?',
+            lambda club, user: (club, user)),
+        'members of club': (
+            "SELECT user_id FROM clubs_role WHERE club_id = ? AND club_role = 'MEM'",
+            lambda club, user: (club,)),
+        'clubs of user': (
+            "SELECT club_id FROM clubs_role WHERE user_id = ? AND club_role IN ('MEM', 'OFF', 'OWN')",
+            lambda club, user: (user,)),
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument('--roles', type=int, default=1000000)
+        parser.add_argument('--clubs', type=int, default=10000)
+        parser.add_argument('--users', type=int, default=100000)
+        parser.add_argument('--lookups', type=int, default=2000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        connection = sqlite3.connect(':memory:')
+        self._create_roles(connection, options['roles'], options['clubs'], options['users'])
+        samples = [
+            (self.random.randrange(1, options['clubs'] + 1), self.random.randrange(1, options['users'] + 1))
+            for _ in range(options['lookups'])
+        ]
+
+        before = self._measure(connection, samples)
+        connection.execute('CREATE UNIQUE INDEX unique_club_user_role ON clubs_role (club_id, user_id)')
+        connection.execute('CREATE INDEX role_club_club_role_idx ON clubs_role (club_id, club_role)')
+        connection.execute('CREATE INDEX role_user_club_role_idx ON clubs_role (user_id, club_role)')
+        connection.execute('ANALYZE')
+        after = self._measure(connection, samples)
+
+        self.stdout.write(f"{options['roles']} roles, {options['lookups']} lookups per query (microseconds)")
+        self.stdout.write(f"{'query':<22}{'before p50':>12}{'before p95':>12}{'after p50':>12}{'after p95':>12}")
+        for name in self.QUERIES:
+            self.stdout.write(
+                f'{name:<22}{before[name][0]:>12.1f}{before[name][1]:>12.1f}'
+                f'{after[name][0]:>12.1f}{after[name][1]:>12.1f}')
+
+    def _create_roles(self, connection, role_count, club_count, user_count):
+        """Create clubs_role with only the implicit foreign key indexes, as before migration 0003."""
+        connection.execute(
+            'CREATE TABLE clubs_role (id INTEGER PRIMARY KEY, club_role VARCHAR(3) NOT NULL, '
+            'club_id INTEGER NOT NULL, user_id INTEGER NOT NULL)')
+        connection.execute('CREATE INDEX clubs_role_club_id ON clubs_role (club_id)')
+        connection.execute('CREATE INDEX clubs_role_user_id ON clubs_role (user_id)')
+        pairs = set()
+        while len(pairs) < role_count:
+            pairs.add((self.random.randrange(1, club_count + 1), self.random.randrange(1, user_count + 1)))
+        connection.executemany(
+            'INSERT INTO clubs_role (club_role, club_id, user_id) VALUES (?, ?, ?)',
+            ((self.random.choice(self.ROLES), club, user) for club, user in pairs))
+        connection.commit()
+        connection.execute('ANALYZE')
+
+    def _measure(self, connection, samples):
+        results = {}
+        for name, (sql, parameters) in self.QUERIES.items():
+            timings = []
+            for club, user in samples:
+                start = time.perf_counter()
+                connection.execute(sql, parameters(club, user)).fetchall()
+                timings.append((time.perf_counter() - start) * 1000000)
+            timings.sort()
+            results[name] = (statistics.median(timings), timings[int(len(timings) * 0.95)])
+        return results
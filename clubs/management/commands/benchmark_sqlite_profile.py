@@ -0,0 +1,113 @@
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, OperationalError
+from clubs.models import User,Club,Role,ClubRoster
+import io
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+def _work(arguments):
+    """Reads rosters and toggles roles until the deadline, in a worker process of its own."""
+    club_ids, user_ids, write_ratio, seed, start_at, stop_at = arguments
+    generator = random.Random(seed)
+    counts = {'reads': 0, 'writes': 0, 'errors': 0}
+    time.sleep(max(start_at - time.time(), 0))
+    try:
+        while time.time() < stop_at:
+            club = Club(id=generator.choice(club_ids))
+            try:
+                if generator.random() < write_ratio:
+                    user = User(id=generator.choice(user_ids))
+                    if generator.random() < 0.5:
+                        club.toggle_officer(user)
+                    else:
+                        club.toggle_member(user)
+                    counts['writes'] += 1
+                else:
+                    list(club.get_members().only(*ClubRoster.USER_FIELDS).order_by(*ClubRoster.ORDERING)[
+                        :settings.ROSTER_PAGE_SIZE])
+                    counts['reads'] += 1
+            except OperationalError:
+                counts['errors'] += 1
+    finally:
+        connection.close()
+    return counts
+
+class Command(BaseCommand):
+    """Measures read and write throughput of concurrent worker processes sharing one SQLite file,
+    with each SQLite profile of settings.SQLITE_PROFILES.
+
+    Each worker process, like a gunicorn worker, keeps one connection and mixes roster page reads
+    with role toggles, as moderators do. Failed queries, such as 'database is locked', are counted
+    as errors. Every profile runs against a fresh scratch database, so it never touches the project database."""
+
+    help = 'Benchmark concurrent SQLite read and write throughput with each connection profile'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8], help='Worker process counts')
+        parser.add_argument('--profiles', nargs='+', default=list(settings.SQLITE_PROFILES))
+        parser.add_argument('--seconds', type=float, default=5, help='Duration of each run')
+        parser.add_argument('--write-ratio', type=float, default=0.5)
+        parser.add_argument('--clubs', type=int, default=20)
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        if connections.databases['default']['ENGINE'] != 'django.db.backends.sqlite3':
+            raise CommandError('The benchmark runs on SQLite only.')
+        unknown = set(options['profiles']) - set(settings.SQLITE_PROFILES)
+        if unknown:
+            raise CommandError(f"Unknown SQLite profiles: {', '.join(sorted(unknown))}.")
+        self.stdout.write(
+            f"{options['seconds']:g}s per run, {options['write_ratio']:.0%} writes, "
+            f"{options['clubs']} clubs of {options['users']} users (operations per second)")
+        self.stdout.write(f"{'profile':<12}{'workers':>8}{'reads/s':>10}{'writes/s':>10}{'errors':>8}")
+        with tempfile.TemporaryDirectory() as directory:
+            try:
+                for profile in options['profiles']:
+                    settings.SQLITE_PROFILE = profile
+                    for workers in options['workers']:
+                        self._use_scratch_database(os.path.join(directory, f'{profile}-{workers}.sqlite3'))
+                        club_ids, user_ids = self._create_clubs(options['clubs'], options['users'])
+                        counts = self._measure(club_ids, user_ids, workers, options)
+                        self.stdout.write(
+                            f"{profile:<12}{workers:>8}{counts['reads'] / options['seconds']:>10.0f}"
+                            f"{counts['writes'] / options['seconds']:>10.0f}{counts['errors']:>8}")
+            finally:
+                connections.close_all()
+
+    def _use_scratch_database(self, name):
+        connections.close_all()
+        connections.databases['default']['NAME'] = settings.DATABASES['default']['NAME'] = name
+        call_command('migrate', verbosity=0)
+
+    def _create_clubs(self, club_count, user_count):
+        generator = random.Random(0)
+        Club.objects.bulk_create([
+            Club(club_name=f'Benchmark{number}', location='London', description='Benchmark club')
+            for number in range(club_count)])
+        User.objects.bulk_create([
+            User(username=f'user{number}@example.org', first_name='Benchmark', last_name=f'User{number}')
+            for number in range(user_count)])
+        club_ids = list(Club.objects.values_list('id', flat=True))
+        user_ids = list(User.objects.values_list('id', flat=True))
+        Role.objects.bulk_create([
+            Role(club_id=club_id, user_id=user_id, club_role=generator.choice(('MEM', 'OFF')))
+            for club_id in club_ids for user_id in user_ids])
+        call_command('recount_clubs', verbosity=0, stdout=io.StringIO())
+        return club_ids, user_ids
+
+    def _measure(self, club_ids, user_ids, worker_count, options):
+        """Workers are forked with no open connection, so each opens its own with the current profile."""
+        connections.close_all()
+        start_at = time.time() + 0.5
+        arguments = [
+            (club_ids, user_ids, options['write_ratio'], options['seed'] + number, start_at, start_at + options['seconds'])
+            for number in range(worker_count)]
+        with multiprocessing.get_context('fork').Pool(worker_count) as pool:
+            results = pool.map(_work, arguments)
+        return {key: sum(result[key] for result in results) for key in results[0]}
@@ -0,0 +1,84 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import router, transaction
+from django.db.models import Q
+from django.db.models.deletion import CASCADE, get_candidate_relations_to_delete
+from clubs import cache
+from clubs.models import User,Club,Role,delete_rows
+from clubs.search import get_member_search_index
+import time
+
+class Command(BaseCommand):
+    """Deletes the seeded users and clubs, in bounded batches that each commit.
+
+    Roles go first, then clubs, then users, each in batches of --batch-size rows taken in primary key
+    order. A batch is deleted with set-based DELETE statements, as are the rows that cascade from it, so
+    neither memory use nor the time the write lock is held grows with the size of the database.
+    The rows to delete are selected by what they are rather than by progress, so an interrupted purge
+    resumes where it stopped when run again. No signals are sent, so each batch invalidates the cached
+    memberships of its users and the cached rosters of its clubs, including clubs that remain but lost
+    roles, and the role counters of the clubs that remain are recounted at the end."""
+
+    help = 'Delete the seeded users, clubs and roles in batches, resumably'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10000, help='Rows deleted per transaction')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('The batch size must be positive.')
+        self.batch_size = options['batch_size']
+        users = User.objects.filter(username__contains='@example.org')
+        clubs = Club.objects.filter(location__contains='London')
+        roles = Role.objects.filter(Q(user__in=users.values('id')) | Q(club__in=clubs.values('id')))
+        self._purge('roles', roles, ('user_id', 'club_id'), self._invalidate_roles)
+        self._purge('clubs', clubs, (), self._invalidate_clubs)
+        self._purge('users', users, (), self._invalidate_users, get_member_search_index().remove_users)
+        call_command('recount_clubs', stdout=self.stdout)
+
+    def _purge(self, name, queryset, fields, after_delete, before_delete=None):
+        """Deletes the rows of the queryset in batches, after the rows that cascade from them, and passes
+        the deleted rows, as tuples of their id and fields, to after_delete once each batch is committed"""
+        start = time.perf_counter()
+        deleted = 0
+        last_id = 0
+        while True:
+            rows = list(queryset.filter(id__gt=last_id).order_by('id').values_list('id', *fields)[:self.batch_size])
+            if not rows:
+                break
+            ids = [row[0] for row in rows]
+            with transaction.atomic(using=router.db_for_write(queryset.model)):
+                if before_delete is not None:
+                    before_delete(ids)
+                self._delete_dependents(queryset.model, ids)
+                deleted += delete_rows(queryset.model._base_manager.filter(id__in=ids))
+            after_delete(rows)
+            last_id = ids[-1]
+            seconds = time.perf_counter() - start
+            self.stdout.write(f'Purged {deleted} {name} up to id {last_id} ({deleted / seconds:.0f} per second)')
+        self.stdout.write(f'Purged {deleted} {name}')
+
+    def _delete_dependents(self, model, objects):
+        """Deletes the rows that would cascade from deleting the objects, which are ids or a queryset"""
+        for relation in get_candidate_relations_to_delete(model._meta):
+            if relation.on_delete is not CASCADE:
+                raise CommandError(
+                    f'{relation.related_model.__name__}.{relation.field.name} does not cascade, so purging '
+                    f'{model.__name__} would need the deletion collector.')
+            dependents = relation.related_model._base_manager.filter(**{f'{relation.field.name}__in': objects})
+            self._delete_dependents(relation.related_model, dependents.values('pk'))
+            delete_rows(dependents)
+
+    def _invalidate_roles(self, rows):
+        for user_id in {user_id for _, user_id, _ in rows}:
+            cache.invalidate_user(user_id)
+        for club_id in {club_id for _, _, club_id in rows}:
+            cache.invalidate_club(club_id)
+
+    def _invalidate_clubs(self, rows):
+        for club_id, in rows:
+            cache.invalidate_club(club_id)
+
+    def _invalidate_users(self, rows):
+        for user_id, in rows:
+            cache.invalidate_user(user_id)
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from clubs.models import User
+from clubs.search import get_member_search_index
+
+class Command(BaseCommand):
+    """Rebuilds the member search index, e.g. after changing MEMBER_SEARCH_BACKEND."""
+
+    help = 'Rebuild the member name search index'
+
+    def handle(self, *args, **options):
+        index = get_member_search_index()
+        index.rebuild(User.objects.only('id', 'first_name', 'last_name').iterator(chunk_size=2000))
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt the member search index with {type(index).__name__}.'))
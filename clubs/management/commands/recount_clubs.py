@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Q, F, Subquery
+from django.db.models.functions import Coalesce
+from clubs.models import Club,Role
+
+class Command(BaseCommand):
+    """Recounts the role counters of every club from its roles, repairing any drift.
+
+    Clubs are processed in chunks ordered by primary key. Each chunk is repaired with a
+    single UPDATE that only touches clubs whose stored counts differ from their roles."""
+
+    help = 'Recount the role counters of clubs, repairing any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        expected = self._expected_counts()
+        drift = Q()
+        for field in Club.COUNTER_FIELDS:
+            drift |= ~Q(**{field: F(f'expected_{field}')})
+        last_id = 0
+        checked = 0
+        repaired = 0
+        while True:
+            club_ids = list(Club.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:options['chunk_size']])
+            if not club_ids:
+                break
+            with transaction.atomic():
+                drifted = Club.objects.filter(id__in=club_ids).annotate(
+                    **{f'expected_{field}': count for field, count in expected.items()}).filter(drift).values('id')
+                repaired += Club.objects.filter(id__in=drifted).update(**expected)
+            checked += len(club_ids)
+            last_id = club_ids[-1]
+        self.stdout.write(self.style.SUCCESS(f'Checked {checked} clubs, repaired the counters of {repaired}.'))
+
+    def _expected_counts(self):
+        """Returns, for each counter, an expression counting the roles it counts"""
+        counted_roles = {field: [] for field in Club.COUNTER_FIELDS}
+        for club_role, fields in Club.ROLE_COUNTERS.items():
+            for field in fields:
+                counted_roles[field].append(club_role)
+        return {
+            field: Coalesce(Subquery(
+                Role.objects.filter(club=OuterRef('pk'), club_role__in=club_roles).order_by().values(
+                    'club').annotate(count=Count('id')).values('count')), 0)
+            for field, club_roles in counted_roles.items()
+        }
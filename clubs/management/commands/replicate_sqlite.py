@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+import time
+
+class Command(BaseCommand):
+    """Copies the primary SQLite database onto the replica, standing in for replication.
+
+    Uses SQLite's online backup, so the primary stays usable while it copies. With --interval it
+    copies repeatedly, and the interval is the replication lag the read-only views see."""
+
+    help = 'Copy the primary SQLite database onto the replica, once or every --interval seconds'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, help='Seconds between copies, to keep replicating')
+
+    def handle(self, *args, **options):
+        if settings.DATABASE_REPLICA_ALIAS is None:
+            raise CommandError('No replica is configured; set DATABASE_REPLICA_NAME.')
+        primary, replica = connections['default'], connections[settings.DATABASE_REPLICA_ALIAS]
+        if primary.vendor != 'sqlite' or replica.vendor != 'sqlite':
+            raise CommandError('Replication runs between SQLite databases only.')
+        while True:
+            start = time.perf_counter()
+            primary.ensure_connection()
+            replica.ensure_connection()
+            primary.connection.backup(replica.connection)
+            self.stdout.write(f'Replicated in {(time.perf_counter() - start) * 1000:.1f} ms.')
+            if options['interval'] is None:
+                return
+            time.sleep(options['interval'])
@@ -1,87 +1,160 @@
+from django.contrib.auth.hashers import make_password
 from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
 from faker import Faker
 import random
+import re
+import time
 from clubs.models import User,Club,Role
+from clubs.gravatar import get_gravatar_hash
+from clubs.search import get_member_search_index
 from django.core import management
-from django.db.utils import IntegrityError
 
 class Command(BaseCommand):
+    """Seeds the database with the required users and clubs, and with --users random users and --clubs
+    random clubs.
+
+    Users, clubs and roles are bulk inserted in batches with explicit primary keys, and every user
+    gets the same password hash, so the database grows at insert speed: a million users and ten
+    thousand clubs take minutes. Club sizes follow a Pareto distribution with exponent
+    --size-exponent, so most clubs are small and a few are very large, and the roles besides the
+    owner are drawn with the weights of --role-mix. The counters and search index entries that
+    bulk inserts skip are written alongside. The same --seed gives the same database."""
+
+    help = 'Seed the database with required and random users, clubs and roles'
 
     PASSWORD = "Password123"
     USER_COUNT = 30
     CLUB_COUNT = 4
-
-    def __init__(self):
-        super().__init__()
-        self.faker = Faker('en_GB')
+    ROLE_MIX = 'MEM=80,APP=10,OFF=6,BAN=4'
+    NAME_POOL_SIZE = 1000
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=self.USER_COUNT, help='Random users to create')
+        parser.add_argument('--clubs', type=int, default=self.CLUB_COUNT, help='Random clubs to create')
+        parser.add_argument('--seed', type=int, help='Random seed, to create the same data again')
+        parser.add_argument('--min-club-size', type=int, default=5, help='Roles in the smallest clubs')
+        parser.add_argument(
+            '--size-exponent', type=float, default=1.2, help='Pareto exponent of club sizes; lower means larger clubs')
+        parser.add_argument(
+            '--role-mix', default=self.ROLE_MIX, help='Weights of the roles besides the owner, as ROLE=WEIGHT,...')
+        parser.add_argument('--batch-size', type=int, default=10000, help='Rows inserted per transaction')
 
     def handle(self, *args, **options):
-        management.call_command('loaddata', 'clubs/management/commands/fixtures/required_clubs.json')
-        management.call_command('loaddata', 'clubs/management/commands/fixtures/required_users.json')
+        self.random = random.Random(options['seed'])
+        self.faker = Faker('en_GB')
+        self.faker.seed_instance(options['seed'])
+        self.batch_size = options['batch_size']
+        role_mix = self._parse_role_mix(options['role_mix'])
+        if options['min_club_size'] < 1 or options['size_exponent'] <= 0:
+            raise CommandError('Clubs need at least their owner, and the size exponent must be positive.')
+
+        management.call_command('loaddata', 'clubs/management/commands/fixtures/required_clubs.json', stdout=self.stdout)
+        management.call_command('loaddata', 'clubs/management/commands/fixtures/required_users.json', stdout=self.stdout)
         self._create_required_roles()
 
-        user_count = 0
-        club_count = 0
-        while user_count < Command.USER_COUNT:
-            print(f'Seeding user {user_count}',  end='\r')
-            try:
-                self._create_user()
-            except IntegrityError as e:
-                continue
-            user_count += 1
-        print('User seeding complete')
-
-        while club_count < Command.CLUB_COUNT:
-            try:
-                self._create_club()
-            except IntegrityError as e:
-                continue
-            club_count += 1
-
-        print('Club seeding complete')
-
-    def _create_user(self):
-        first_name = self.faker.first_name()
-        last_name = self.faker.last_name()
-        username = self._email(first_name, last_name)
-        bio = "Hi, my name is " + first_name + " " + last_name
-        chess_experience_level=self.faker.pyint(min_value=1,max_value=5)
-
-        User.objects.create_user(
-            username = username,
-            first_name=first_name,
-            last_name=last_name,
-            password=Command.PASSWORD,
-            bio=bio,
-            chess_experience_level=chess_experience_level,
-        )
-
-
-    def _email(self, first_name, last_name):
-        email = f'{first_name.lower()}.{last_name.lower()}@example.org'
-        return email
-
-    def _create_club(self):
-        club_name = self.faker.word().capitalize() + " Chess Club"
-        location = 'London'
-        description = "At " + club_name + " our aim is make you the best chess player you can be."
-
-        new_club = Club.objects.create(
-                club_name=club_name,
-                location=location,
-                description=description,
-            )
-
-        self._create_club_roles(new_club)
-
-    def _create_club_roles(self,club):
-        club_owner=random.choice(User.objects.all())
-        club.club_members.add(club_owner,through_defaults={'club_role':'OWN'})
-
-        club_roles = ['APP','MEM','OFF','BAN']
-        for user_number in range(1, int(self.USER_COUNT/3)):
-            current_user = random.choice(User.objects.all().difference(club.get_all_users_in_club()))
-            club.club_members.add(current_user,through_defaults={'club_role':random.choice(club_roles)})
+        user_ids = self._create_users(options['users'])
+        if options['clubs'] and not user_ids:
+            raise CommandError('Random clubs need random users to join them.')
+        self._create_clubs(options['clubs'], user_ids, options['min_club_size'], options['size_exponent'], role_mix)
+        self._reset_sequences()
+
+    def _parse_role_mix(self, role_mix):
+        try:
+            weights = {role: float(weight) for role, weight in (item.split('=') for item in role_mix.split(','))}
+        except ValueError:
+            raise CommandError(f'Invalid role mix: {role_mix}')
+        if not set(weights) <= {'APP', 'MEM', 'OFF', 'BAN'} or sum(weights.values()) <= 0:
+            raise CommandError('The role mix weighs APP, MEM, OFF and BAN roles; a club has a single owner.')
+        return weights
+
+    def _create_users(self, user_count):
+        """Returns the range of ids of the created users"""
+        first_id = self._get_next_id(User)
+        first_names = self._get_pool(self.faker.first_name)
+        last_names = self._get_pool(self.faker.last_name)
+        password = make_password(Command.PASSWORD)
+        index = get_member_search_index()
+        start = time.perf_counter()
+        for batch_start in range(first_id, first_id + user_count, self.batch_size):
+            users = []
+            for user_id in range(batch_start, min(batch_start + self.batch_size, first_id + user_count)):
+                first_name = self.random.choice(first_names)
+                last_name = self.random.choice(last_names)
+                username = self._email(first_name, last_name, user_id)
+                users.append(User(
+                    id=user_id,
+                    username=username,
+                    first_name=first_name,
+                    last_name=last_name,
+                    password=password,
+                    bio="Hi, my name is " + first_name + " " + last_name,
+                    chess_experience_level=self.random.randint(1, 5),
+                    gravatar_hash=get_gravatar_hash(username),
+                ))
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+                index.add_users(users)
+            self._report('users', users[-1].id - first_id + 1, user_count, start)
+        self.stdout.write('User seeding complete')
+        return range(first_id, first_id + user_count)
+
+    def _get_pool(self, fake):
+        """Returns distinct fake values to draw from, which is much faster than faking every one"""
+        return sorted({fake() for _ in range(self.NAME_POOL_SIZE)})
+
+    def _email(self, first_name, last_name, user_id):
+        """The user id keeps emails of users with the same name unique"""
+        first_name, last_name = (re.sub(r'[^a-z]', '', name.lower()) for name in (first_name, last_name))
+        return f'{first_name}.{last_name}.{user_id}@example.org'
+
+    def _create_clubs(self, club_count, user_ids, min_club_size, size_exponent, role_mix):
+        first_id = self._get_next_id(Club)
+        words = [word for word in self._get_pool(self.faker.word) if 4 <= len(word) <= 12]
+        roles, weights = list(role_mix), list(role_mix.values())
+        start = time.perf_counter()
+        role_count = 0
+        for batch_start in range(first_id, first_id + club_count, self.batch_size):
+            clubs = []
+            club_roles = []
+            for club_id in range(batch_start, min(batch_start + self.batch_size, first_id + club_count)):
+                size = min(int(min_club_size * self.random.paretovariate(size_exponent)), len(user_ids))
+                owner_id, *other_ids = self.random.sample(user_ids, size)
+                roles_of_club = [('OWN', owner_id), *zip(self.random.choices(roles, weights, k=len(other_ids)), other_ids)]
+                club_name = f'{self.random.choice(words).capitalize()} {club_id}'
+                club = Club(
+                    id=club_id,
+                    club_name=club_name,
+                    location='London',
+                    description="At " + club_name + " our aim is make you the best chess player you can be.",
+                )
+                for club_role, _ in roles_of_club:
+                    for field in Club.ROLE_COUNTERS[club_role]:
+                        setattr(club, field, getattr(club, field) + 1)
+                clubs.append(club)
+                club_roles.extend(
+                    Role(club_id=club_id, user_id=user_id, club_role=club_role) for club_role, user_id in roles_of_club)
+            with transaction.atomic():
+                Club.objects.bulk_create(clubs)
+                Role.objects.bulk_create(club_roles, batch_size=self.batch_size)
+            role_count += len(club_roles)
+            self._report('clubs', clubs[-1].id - first_id + 1, club_count, start)
+        self.stdout.write(f'Club seeding complete, with {role_count} roles')
+
+    def _get_next_id(self, model):
+        return (model.objects.aggregate(Max('id'))['id__max'] or 0) + 1
+
+    def _reset_sequences(self):
+        """Primary keys were set explicitly, which databases with sequences do not notice"""
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [User, Club]):
+                cursor.execute(sql)
+
+    def _report(self, name, done, total, start):
+        seconds = time.perf_counter() - start
+        self.stdout.write(f'Seeded {done}/{total} {name} ({done / seconds:.0f} per second)')
 
     def _create_required_roles(self):
 
@@ -0,0 +1,128 @@
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, OperationalError
+from clubs.models import User,Club,Role
+import os
+import random
+import tempfile
+import threading
+import time
+
+class Command(BaseCommand):
+    """Races concurrent role transitions against a scratch SQLite database in WAL mode.
+
+    Every thread repeatedly promotes and demotes the same members and hands ownership of the
+    club to them. Afterwards each member's final role must match the transitions reported as
+    applied, and the club must still have exactly one owner."""
+
+    help = 'Stress test concurrent role transitions on SQLite in WAL mode'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--users', type=int, default=20)
+        parser.add_argument('--transitions', type=int, default=500, help='Transitions attempted by each thread')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            self._use_scratch_database(os.path.join(directory, 'stress.sqlite3'))
+            try:
+                club, users, owner = self._create_club(options['users'])
+                self._run(options, club, users, owner)
+            finally:
+                connections.close_all()
+
+    def _use_scratch_database(self, name):
+        connections.close_all()
+        database = connections.databases['default']
+        if database['ENGINE'] != 'django.db.backends.sqlite3':
+            raise CommandError('The stress test runs on SQLite only.')
+        database['NAME'] = settings.DATABASES['default']['NAME'] = name
+        call_command('migrate', verbosity=0)
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode=WAL')
+
+    def _create_club(self, user_count):
+        club = Club.objects.create(club_name='Stress Chess Club', location='London', description='Stress test')
+        User.objects.bulk_create([
+            User(username=f'stress{user_id}@example.org', first_name='Stress', last_name=f'User{user_id}')
+            for user_id in range(user_count + 1)])
+        users = list(User.objects.order_by('id'))
+        owner = users.pop()
+        Role.objects.bulk_create([Role(club=club, user=user, club_role='MEM') for user in users])
+        Role.objects.create(club=club, user=owner, club_role='OWN')
+        call_command('recount_clubs', stdout=self.stdout)
+        return club, users, owner
+
+    def _run(self, options, club, users, owner):
+        lock = threading.Lock()
+        applied = {user.id: 0 for user in users + [owner]}
+        totals = {'attempted': 0, 'applied': 0, 'transfers': 0, 'errors': 0}
+
+        def work(thread_number):
+            generator = random.Random(options['seed'] + thread_number)
+            local_applied = {user.id: 0 for user in users + [owner]}
+            local_totals = {'attempted': 0, 'applied': 0, 'transfers': 0, 'errors': 0}
+            try:
+                for _ in range(options['transitions']):
+                    user = generator.choice(users)
+                    local_totals['attempted'] += 1
+                    try:
+                        if generator.random() < 0.1:
+                            current_owner = User.objects.get(role__club=club, role__club_role='OWN')
+                            if club.transfer_ownership(current_owner, user):
+                                local_totals['transfers'] += 1
+                                local_totals['applied'] += 1
+                        elif generator.random() < 0.5:
+                            if club.toggle_officer(user):
+                                local_applied[user.id] += 1
+                                local_totals['applied'] += 1
+                        elif club.toggle_member(user):
+                            local_applied[user.id] -= 1
+                            local_totals['applied'] += 1
+                    except OperationalError:
+                        local_totals['errors'] += 1
+            finally:
+                connection.close()
+            with lock:
+                for user_id, count in local_applied.items():
+                    applied[user_id] += count
+                for key, count in local_totals.items():
+                    totals[key] += count
+
+        threads = [threading.Thread(target=work, args=(number,)) for number in range(options['threads'])]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(
+            f"{options['threads']} threads attempted {totals['attempted']} transitions in {elapsed:.2f}s "
+            f"({totals['attempted'] / elapsed:.0f}/s), {totals['applied']} applied "
+            f"({totals['transfers']} ownership transfers), {totals['errors']} database errors")
+        self._verify(club, users, owner, applied)
+
+    def _verify(self, club, users, owner, applied):
+        """Ownership transfers keep both users among the officers and owner, so each user is an
+        officer or the owner at the end exactly when they started as the owner or one more
+        promotion than demotion applied to them. Any lost update breaks this count, and the club's
+        role counters must match the roles held."""
+        roles = dict(Role.objects.filter(club=club).values_list('user_id', 'club_role'))
+        owners = [user_id for user_id, club_role in roles.items() if club_role == 'OWN']
+        if len(owners) != 1:
+            raise CommandError(f'Expected exactly one owner, found {len(owners)}.')
+        lost = [user.id for user in users + [owner]
+            if (roles[user.id] in ('OFF', 'OWN')) != (applied[user.id] + (user == owner) == 1)]
+        if lost:
+            raise CommandError(f'Lost updates detected for users {lost}.')
+        club.refresh_from_db()
+        officer_count = sum(club_role == 'OFF' for club_role in roles.values())
+        member_count = sum(club_role in Role.IN_CLUB_ROLES for club_role in roles.values())
+        if (club.officer_count, club.member_count) != (officer_count, member_count):
+            raise CommandError(
+                f'Counters drifted: {club.officer_count} officers and {club.member_count} members stored, '
+                f'{officer_count} and {member_count} held.')
+        self.stdout.write(self.style.SUCCESS('No lost updates.'))
@@ -1,7 +1,11 @@
-from django.core.management.base import BaseCommand, CommandError
-from clubs.models import User,Club,Role
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
 
 class Command(BaseCommand):
+    """Deletes the seeded data; see purge, which does the work in resumable batches."""
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10000, help='Rows deleted per transaction')
+
     def handle(self, *args, **options):
-        User.objects.filter(username__contains='@example.org').delete()
-        Club.objects.filter(location__contains='London').delete()
+        call_command('purge', batch_size=options['batch_size'], stdout=self.stdout)
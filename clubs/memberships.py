@@ -0,0 +1,38 @@
+from .models import Role
+from . import cache
+
+class Memberships:
+    """Roles of a user in every club they hold a role in, loaded with at most one query."""
+
+    def __init__(self, user):
+        self._roles = {}
+        self._club_ids = {}
+        if user.is_authenticated:
+            for club_id, club_name, club_role in cache.get_user_roles(user.id):
+                self._roles[club_id] = club_role
+                self._club_ids[club_name] = club_id
+
+    def get_club_role(self, club):
+        """Returns the user's role in the club, or None if they hold no role in it."""
+        return self._roles.get(club.id)
+
+    def get_club_role_by_id(self, club_id):
+        """Returns the user's role in the club with the given id, or None if they hold no role in it."""
+        return self._roles.get(club_id)
+
+    def get_club_role_by_name(self, club_name):
+        """Returns the user's role in the named club, or None if they hold no role in it."""
+        return self._roles.get(self._club_ids.get(club_name))
+
+    def get_club_id(self, club_name):
+        """Returns the id of the named club, or None if the user holds no role in it."""
+        return self._club_ids.get(club_name)
+
+    def has_club(self, club_name):
+        """Returns whether the user holds any role in the named club."""
+        return club_name in self._club_ids
+
+    def get_user_club_names(self):
+        """Returns the names of the clubs the user is in, as an owner, officer or member."""
+        return [club_name for club_name, club_id in self._club_ids.items()
+            if self._roles[club_id] in Role.IN_CLUB_ROLES]
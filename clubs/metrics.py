@@ -0,0 +1,265 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.template.backends import django as django_backend
+from . import cache
+import bisect
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+import weakref
+
+"""Per-view request metrics: request count, latency histogram, SQL query count and time, and template
+render time, by resolved URL name, with the cache hit and miss counters alongside. The same recorder
+splits the time of each response for its Server-Timing header.
+
+Each thread records into a store of its own, so recording takes no lock; stores are merged when read.
+With settings.METRICS_DIR set, each worker process also writes its metrics to a file there every
+METRICS_FLUSH_SECONDS, and the metrics endpoint adds up the files of every worker."""
+
+_current = contextvars.ContextVar('request_metrics', default=None)
+_local = threading.local()
+_stores = []
+_retired = {}
+_stores_lock = threading.Lock()
+_last_flush = 0.0
+
+class RequestMetrics:
+    """The SQL, access check and template time of one request, shared with the threads it reads in."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.seconds = None
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.check_seconds = 0.0
+        self.check_query_seconds = 0.0
+        self.checking = False
+        self.template_seconds = 0.0
+        self.template_query_seconds = 0.0
+        self.template_depth = 0
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    """A thread reconnects through the same connection handler, which keeps its wrappers"""
+    if _time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_time_query)
+
+def _time_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        seconds = time.perf_counter() - start
+        metrics.queries += 1
+        metrics.query_seconds += seconds
+        if metrics.checking:
+            metrics.check_query_seconds += seconds
+        elif metrics.template_depth:
+            metrics.template_query_seconds += seconds
+
+@contextlib.contextmanager
+def timing_check():
+    """Times the access check of a view decorator within the block."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    metrics.checking = True
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.checking = False
+        metrics.check_seconds += time.perf_counter() - start
+
+class Template(django_backend.Template):
+    def render(self, context=None, request=None):
+        metrics = _current.get()
+        if metrics is None:
+            return super().render(context, request)
+        """Templates rendered while another renders are part of its time"""
+        metrics.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics.template_depth -= 1
+            if not metrics.template_depth:
+                metrics.template_seconds += time.perf_counter() - start
+
+class DjangoTemplates(django_backend.DjangoTemplates):
+    """Django template backend that records how long each request spends rendering templates,
+    including the queries that templates run lazily."""
+
+    def from_string(self, template_code):
+        return Template(super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        return Template(super().get_template(template_name).template, self)
+
+def start_request():
+    """Starts recording the SQL and template time of the current request, and returns its metrics."""
+    metrics = RequestMetrics()
+    _current.set(metrics)
+    return metrics
+
+def end_request(metrics, view):
+    """Records the request under the view's name, and writes the worker's metrics file when it is due."""
+    _current.set(None)
+    seconds = metrics.seconds = time.perf_counter() - metrics.start
+    store = _get_store()
+    stats = store.get(view)
+    if stats is None:
+        stats = store[view] = _new_stats()
+    stats['requests'] += 1
+    stats['buckets'][bisect.bisect_left(settings.METRICS_LATENCY_BUCKETS, seconds)] += 1
+    stats['seconds'] += seconds
+    stats['queries'] += metrics.queries
+    stats['query_seconds'] += metrics.query_seconds
+    stats['template_seconds'] += metrics.template_seconds
+    if settings.METRICS_DIR is not None and time.monotonic() - _last_flush >= settings.METRICS_FLUSH_SECONDS:
+        flush()
+
+def get_server_timing(metrics):
+    """Returns the Server-Timing header of a recorded request, splitting its time in milliseconds between
+    access checks, SQL queries, templates and the rest, which is the view and middleware code.
+    Queries count under db only, wherever they run."""
+    checks = metrics.check_seconds - metrics.check_query_seconds
+    templates = metrics.template_seconds - metrics.template_query_seconds
+    """Concurrent reads make the query time add up to more than the request took"""
+    view = max(metrics.seconds - metrics.query_seconds - checks - templates, 0.0)
+    return ', '.join([
+        f'auth;desc="Access checks";dur={checks * 1000:.2f}',
+        f'db;desc="{metrics.queries} queries";dur={metrics.query_seconds * 1000:.2f}',
+        f'view;desc="View and middleware";dur={view * 1000:.2f}',
+        f'tpl;desc="Templates";dur={templates * 1000:.2f}',
+        f'total;dur={metrics.seconds * 1000:.2f}'])
+
+def _new_stats():
+    return {
+        'requests': 0, 'buckets': [0] * (len(settings.METRICS_LATENCY_BUCKETS) + 1), 'seconds': 0.0,
+        'queries': 0, 'query_seconds': 0.0, 'template_seconds': 0.0}
+
+def _get_store():
+    try:
+        return _local.store
+    except AttributeError:
+        store = _local.store = {}
+        with _stores_lock:
+            _stores.append(store)
+        """Fold the store of a finished thread into the retired totals, so short-lived threads do not pile up"""
+        weakref.finalize(threading.current_thread(), _retire, store)
+        return store
+
+def _retire(store):
+    with _stores_lock:
+        _merge_views(_retired, store)
+        _stores.remove(store)
+
+def _merge_views(totals, views):
+    for view, stats in list(views.items()):
+        total = totals.setdefault(view, _new_stats())
+        for key, value in list(stats.items()):
+            if key == 'buckets':
+                total[key] = [count + other for count, other in zip(total[key], value)]
+            else:
+                total[key] += value
+
+def _merge(totals, snapshot):
+    _merge_views(totals['views'], snapshot['views'])
+    for namespace, counts in snapshot['cache'].items():
+        total = totals['cache'].setdefault(namespace, {'hits': 0, 'misses': 0, 'seconds_saved': 0.0})
+        for key, value in counts.items():
+            total[key] += value
+
+def get_snapshot():
+    """Returns the metrics recorded by this process, by view and by cache namespace."""
+    views = {}
+    with _stores_lock:
+        _merge_views(views, _retired)
+        for store in _stores:
+            _merge_views(views, store)
+    return {
+        'views': views,
+        'cache': {
+            namespace: {**cache.stats.get(namespace), 'seconds_saved': cache.stats.get_seconds_saved(namespace)}
+            for namespace in cache.stats.get_namespaces()}}
+
+def get_all_snapshots():
+    """Returns the metrics of every worker, including those that have written a metrics file."""
+    totals = {'views': {}, 'cache': {}}
+    _merge(totals, get_snapshot())
+    if settings.METRICS_DIR is not None and os.path.isdir(settings.METRICS_DIR):
+        own_file = f'{os.getpid()}.json'
+        for name in os.listdir(settings.METRICS_DIR):
+            if name.endswith('.json') and name != own_file:
+                try:
+                    with open(os.path.join(settings.METRICS_DIR, name)) as file:
+                        _merge(totals, json.load(file))
+                except (OSError, ValueError):
+                    """The worker may be replacing its file"""
+                    continue
+    return totals
+
+def flush():
+    """Writes this worker's metrics to its file in METRICS_DIR, replacing the previous one atomically."""
+    global _last_flush
+    _last_flush = time.monotonic()
+    os.makedirs(settings.METRICS_DIR, exist_ok=True)
+    path = os.path.join(settings.METRICS_DIR, f'{os.getpid()}.json')
+    temporary_path = f'{path}.{threading.get_ident()}.tmp'
+    with open(temporary_path, 'w') as file:
+        json.dump(get_snapshot(), file)
+    os.replace(temporary_path, path)
+
+def render_prometheus(snapshot):
+    """Returns the metrics in the Prometheus text exposition format."""
+    lines = []
+
+    def family(name, kind, help_text):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+
+    views = sorted(snapshot['views'].items())
+    family('chess_island_request_duration_seconds', 'histogram', 'Time to serve a request, by URL name.')
+    for view, stats in views:
+        label = _escape(view)
+        cumulative = 0
+        for bound, count in zip([*settings.METRICS_LATENCY_BUCKETS, '+Inf'], stats['buckets']):
+            cumulative += count
+            lines.append(f'chess_island_request_duration_seconds_bucket{{view="{label}",le="{bound}"}} {cumulative}')
+        lines.append(f'chess_island_request_duration_seconds_sum{{view="{label}"}} {stats["seconds"]}')
+        lines.append(f'chess_island_request_duration_seconds_count{{view="{label}"}} {stats["requests"]}')
+    for name, key, help_text in (
+            ('chess_island_db_queries_total', 'queries', 'SQL queries run, by URL name.'),
+            ('chess_island_db_query_seconds_total', 'query_seconds', 'Time spent in SQL queries, by URL name.'),
+            ('chess_island_template_render_seconds_total', 'template_seconds',
+                'Time spent rendering templates, including their lazy queries, by URL name.')):
+        family(name, 'counter', help_text)
+        for view, stats in views:
+            lines.append(f'{name}{{view="{_escape(view)}"}} {stats[key]}')
+    cache_namespaces = sorted(snapshot['cache'].items())
+    for name, key, help_text in (
+            ('chess_island_cache_hits_total', 'hits', 'Cache hits, by namespace.'),
+            ('chess_island_cache_misses_total', 'misses', 'Cache misses, by namespace.'),
+            ('chess_island_cache_seconds_saved_total', 'seconds_saved', 'Render time saved by cache hits, by namespace.')):
+        family(name, 'counter', help_text)
+        for namespace, counts in cache_namespaces:
+            lines.append(f'{name}{{namespace="{_escape(namespace)}"}} {counts[key]}')
+    return '\n'.join(lines) + '\n'
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def reset():
+    with _stores_lock:
+        _retired.clear()
+        for store in _stores:
+            store.clear()
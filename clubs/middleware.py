@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject
+from .memberships import Memberships
+from . import metrics, routers
+
+"""The middleware supports both sync and async requests, so it does not make Django run the whole
+request in one thread when serving async views through the ASGI entry point."""
+
+class MetricsMiddleware(MiddlewareMixin):
+    """Middleware that records the latency, SQL queries and template render time of each request,
+    by the name of the URL it resolved to. It comes first, so its latency includes the other middleware.
+
+    With settings.SERVER_TIMING set to 'all', or to 'staff' for staff users, responses carry a
+    Server-Timing header with the request's time split between checks, queries, view and templates."""
+
+    def process_request(self, request):
+        request.metrics = metrics.start_request()
+
+    def process_response(self, request, response):
+        resolver_match = getattr(request, 'resolver_match', None)
+        metrics.end_request(request.metrics, resolver_match.view_name if resolver_match else 'unresolved')
+        if self._shows_server_timing(request):
+            response['Server-Timing'] = metrics.get_server_timing(request.metrics)
+        return response
+
+    def _shows_server_timing(self, request):
+        if settings.SERVER_TIMING == 'staff':
+            user = getattr(request, 'user', None)
+            return user is not None and user.is_staff
+        return settings.SERVER_TIMING == 'all'
+
+
+class MembershipMiddleware(MiddlewareMixin):
+    """Middleware that attaches the requesting user's club roles as request.memberships.
+
+    The roles are loaded the first time request.memberships is used, so pages that
+    never look at club roles do not pay for the query."""
+
+    def process_request(self, request):
+        request.memberships = SimpleLazyObject(lambda: Memberships(request.user))
+
+
+class AsgiUrlconfMiddleware(MiddlewareMixin):
+    """Middleware that resolves requests made through the ASGI entry point with settings.ASGI_URLCONF,
+    which serves async versions of the views that hash passwords."""
+
+    def process_request(self, request):
+        if isinstance(request, ASGIRequest):
+            request.urlconf = settings.ASGI_URLCONF
+
+
+class ReplicaRoutingMiddleware(MiddlewareMixin):
+    """Middleware that sends the reads of read-only views to the database replica, unless the browser
+    wrote within the last DATABASE_PRIMARY_PIN_SECONDS, and pins browsers that write to the primary."""
+
+    def process_request(self, request):
+        routers.start_request()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (request.method in ('GET', 'HEAD')
+                and request.resolver_match.url_name in settings.DATABASE_REPLICA_URL_NAMES
+                and settings.DATABASE_PRIMARY_PIN_COOKIE not in request.COOKIES):
+            routers.use_replica()
+
+    def process_response(self, request, response):
+        if routers.end_request():
+            response.set_cookie(
+                settings.DATABASE_PRIMARY_PIN_COOKIE, '1', max_age=settings.DATABASE_PRIMARY_PIN_SECONDS,
+                httponly=True, samesite='Lax')
+        return response
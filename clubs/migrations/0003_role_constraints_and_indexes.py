@@ -0,0 +1,52 @@
+# Generated by Django 3.2.5 on 2026-10-18 06:24
+
+from django.db import migrations, models
+
+
+def remove_conflicting_roles(apps, schema_editor):
+    """Keep the oldest role of each (club, user) pair and a single owner per club."""
+    Role = apps.get_model('clubs', 'Role')
+    seen = set()
+    duplicates = []
+    for role_id, club_id, user_id in Role.objects.order_by('id').values_list('id', 'club_id', 'user_id').iterator():
+        if (club_id, user_id) in seen:
+            duplicates.append(role_id)
+        else:
+            seen.add((club_id, user_id))
+    Role.objects.filter(id__in=duplicates).delete()
+
+    owned_clubs = set()
+    extra_owners = []
+    for role_id, club_id in Role.objects.filter(club_role='OWN').order_by('id').values_list('id', 'club_id').iterator():
+        if club_id in owned_clubs:
+            extra_owners.append(role_id)
+        else:
+            owned_clubs.add(club_id)
+    Role.objects.filter(id__in=extra_owners).update(club_role='OFF')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0002_alter_role_club_role'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_conflicting_roles, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='role',
+            index=models.Index(fields=['club', 'club_role'], name='role_club_club_role_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='role',
+            index=models.Index(fields=['user', 'club_role'], name='role_user_club_role_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='role',
+            constraint=models.UniqueConstraint(fields=('club', 'user'), name='unique_club_user_role'),
+        ),
+        migrations.AddConstraint(
+            model_name='role',
+            constraint=models.UniqueConstraint(condition=models.Q(('club_role', 'OWN')), fields=('club',), name='unique_club_owner'),
+        ),
+    ]
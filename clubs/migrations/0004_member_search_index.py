@@ -0,0 +1,73 @@
+# Generated by Django 3.2.5 on 2026-10-18 06:43
+
+from django.conf import settings
+from django.db import migrations, models, OperationalError
+from text_unidecode import unidecode
+import django.db.models.deletion
+import re
+
+
+FTS_TABLE = 'clubs_member_name_fts'
+
+
+def get_name_tokens(user):
+    tokens = []
+    for token in re.findall(r'[a-z0-9]+', unidecode(f'{user.first_name} {user.last_name}').lower()):
+        if token not in tokens:
+            tokens.append(token)
+    return tokens
+
+
+def create_fts_table(apps, schema_editor):
+    """Create the FTS5 member name table where SQLite was compiled with FTS5."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        schema_editor.execute(f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(name)')
+    except OperationalError:
+        pass
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def index_member_names(apps, schema_editor):
+    """Index existing users in the FTS5 table if it exists, in the token table otherwise."""
+    User = apps.get_model('clubs', 'User')
+    MemberNameToken = apps.get_model('clubs', 'MemberNameToken')
+    connection = schema_editor.connection
+    users = User.objects.only('id', 'first_name', 'last_name').iterator()
+    if connection.vendor == 'sqlite' and FTS_TABLE in connection.introspection.table_names():
+        with connection.cursor() as cursor:
+            cursor.executemany(f'INSERT INTO {FTS_TABLE} (rowid, name) VALUES (%s, %s)',
+                ((user.id, ' '.join(get_name_tokens(user))) for user in users))
+    else:
+        MemberNameToken.objects.bulk_create(
+            (MemberNameToken(user_id=user.id, token=token) for user in users for token in get_name_tokens(user)),
+            batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0003_role_constraints_and_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemberNameToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=50)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='name_tokens', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='membernametoken',
+            index=models.Index(fields=['token', 'user'], name='member_name_token_idx'),
+        ),
+        migrations.RunPython(create_fts_table, drop_fts_table),
+        migrations.RunPython(index_member_names, migrations.RunPython.noop),
+    ]
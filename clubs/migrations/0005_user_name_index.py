@@ -0,0 +1,17 @@
+# Generated by Django 3.2.5 on 2026-10-18 07:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0004_member_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['last_name', 'first_name'], name='user_name_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.5 on 2026-10-18 07:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0005_user_name_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='gravatar_hash',
+            field=models.CharField(blank=True, editable=False, max_length=32),
+        ),
+    ]
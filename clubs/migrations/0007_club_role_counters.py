@@ -0,0 +1,56 @@
+# Generated by Django 3.2.5 on 2026-10-18 07:09
+
+from django.db import migrations, models
+
+
+ROLE_COUNTERS = {
+    'OWN': ('member_count',),
+    'OFF': ('member_count', 'officer_count'),
+    'MEM': ('member_count',),
+    'APP': ('applicant_count',),
+    'BAN': ('banned_count',),
+}
+
+
+def count_roles(apps, schema_editor):
+    """Set the counters of existing clubs from their roles."""
+    Club = apps.get_model('clubs', 'Club')
+    Role = apps.get_model('clubs', 'Role')
+    counts = {}
+    for club_id, club_role, count in Role.objects.values_list('club_id', 'club_role').annotate(models.Count('id')).order_by():
+        club_counts = counts.setdefault(club_id, {})
+        for field in ROLE_COUNTERS[club_role]:
+            club_counts[field] = club_counts.get(field, 0) + count
+    for club_id, club_counts in counts.items():
+        Club.objects.filter(id=club_id).update(**club_counts)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0006_user_gravatar_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='club',
+            name='applicant_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='club',
+            name='banned_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='club',
+            name='member_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='club',
+            name='officer_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_roles, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.5 on 2026-10-18 08:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clubs', '0007_club_role_counters'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='gravatar_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=32),
+        ),
+    ]
@@ -1,9 +1,10 @@
 from django.core.validators import RegexValidator, MinValueValidator, MaxValueValidator
-from django.db import models
+from django.db import connections, models, router, transaction
 from django.core.exceptions import ValidationError
 from django.db.models import When
+from django.db.models.functions import Greatest
 from django.contrib.auth.models import AbstractUser
-from libgravatar import Gravatar
+from .gravatar import get_gravatar_hash, get_gravatar_url
 from enum import Enum
 from django.core.exceptions import ObjectDoesNotExist
 from django.utils.translation import gettext_lazy as _
@@ -39,25 +40,25 @@ class User(AbstractUser):
         default=ChessExperience.BEGINNER,
         choices = ChessExperience.choices
     )
+    gravatar_hash = models.CharField(
+        max_length=32,
+        blank=True,
+        editable=False,
+        db_index=True
+    )
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['last_name', 'first_name'], name='user_name_idx'),
+        ]
 
     """Returns clubs that a user is in"""
     def get_user_clubs(self):
-        return Club.objects.all().filter(
-            club_members__username=self.username,role__club_role='MEM')|Club.objects.all().filter(
-            club_members__username=self.username,role__club_role='OFF')|Club.objects.all().filter(
-            club_members__username=self.username,role__club_role='OWN')
+        return Club.objects.filter(role__user=self, role__club_role__in=Role.IN_CLUB_ROLES)
 
     """Returns clubs that a user has applied to"""
     def get_applied_clubs(self):
-        return Club.objects.all().filter(club_members__username=self.username,role__club_role='APP')
-        clubs = Club.objects.all()
-        current_user = self
-        user_applicant_clubs = Club.objects.all().filter(
-            club_members__username = current_user.username,
-            role__club_role='APP')
-        user_clubs = Club.objects.all().filter(
-            club_members__username = current_user.username).difference(user_applicant_clubs)
-        return user_clubs
+        return Club.objects.filter(role__user=self, role__club_role='APP')
 
 
     def get_chess_experience(self):
@@ -74,9 +75,24 @@ class User(AbstractUser):
 
     def gravatar(self, size=120):
         """Return a URL to the user's gravatar."""
-        gravatar_object = Gravatar(self.email)
-        gravatar_url = gravatar_object.get_image(size=size, default='mp')
-        return gravatar_url
+        return get_gravatar_url(self.get_gravatar_hash(), size)
+
+    def get_gravatar_email(self):
+        """The username is the user's email address unless a separate email is set"""
+        return self.email or self.username
+
+    def get_gravatar_hash(self):
+        """Returns the stored gravatar hash, hashing the email only for users saved before it was stored."""
+        return self.gravatar_hash or get_gravatar_hash(self.get_gravatar_email())
+
+    def save(self, *args, **kwargs):
+        """Keep the stored gravatar hash in step with the email address"""
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'email', 'username'} & set(update_fields):
+            self.gravatar_hash = get_gravatar_hash(self.get_gravatar_email())
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'gravatar_hash'}
+        super().save(*args, **kwargs)
 
 """Create club model"""
 class Club(models.Model):
@@ -104,104 +120,184 @@ class Club(models.Model):
 
     club_members = models.ManyToManyField(User,through='Role')
 
+    """Number of users holding each role, kept in step with every role change. The member count
+    includes the owner and officers, like get_all_users_in_club."""
+    member_count = models.PositiveIntegerField(default=0, editable=False)
+    officer_count = models.PositiveIntegerField(default=0, editable=False)
+    applicant_count = models.PositiveIntegerField(default=0, editable=False)
+    banned_count = models.PositiveIntegerField(default=0, editable=False)
+
+    COUNTER_FIELDS = ('member_count', 'officer_count', 'applicant_count', 'banned_count')
+    ROLE_COUNTERS = {
+        'OWN': ('member_count',),
+        'OFF': ('member_count', 'officer_count'),
+        'MEM': ('member_count',),
+        'APP': ('applicant_count',),
+        'BAN': ('banned_count',),
+    }
+
+    def save(self, *args, **kwargs):
+        """Counters only change through update_role_counts, so an instance loaded before a role
+        change must not write its stale counts back"""
+        if self.pk is not None and not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS]
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def update_role_counts(cls, club_id, changes):
+        """Applies (club_role, change in number of holders) pairs to the club's counters with F() expressions"""
+        deltas = {}
+        for club_role, change in changes:
+            for field in cls.ROLE_COUNTERS[club_role]:
+                deltas[field] = deltas.get(field, 0) + change
+        """Decrements stop at zero, so drift left by bulk inserts cannot fail a role change before recount_clubs repairs it"""
+        updates = {field: Greatest(models.F(field) + delta, 0) for field, delta in deltas.items() if delta}
+        if updates:
+            cls.objects.filter(id=club_id).update(**updates)
+
     def get_club_role(self,user):
         return Role.objects.get(club = self, user = user).club_role
 
-    """Changes user's role to member"""
+    """Changes an applicant's or officer's role to member, returning whether it applied"""
     def toggle_member(self,user):
-        role = Role.objects.get(club=self,user=user)
-        role.club_role = 'MEM'
-        role.save()
+        return self._apply_transition(user,'toggle_member')
 
-    """Changes user's role to officer"""
+    """Changes a member's role to officer, returning whether it applied"""
     def toggle_officer(self,user):
-        role = Role.objects.get(club=self,user=user)
-        if role.club_role == 'APP' or role.club_role == 'BAN':
-            return
-        else:
-            role.club_role = 'OFF'
-            role.save()
-            return
-    """Bans a user from club"""
+        return self._apply_transition(user,'toggle_officer')
+
+    """Bans a member from club, returning whether it applied"""
     def ban_member(self,user):
-        role = Role.objects.get(club=self,user=user)
-        if role.club_role == 'MEM':
-            role.club_role = 'BAN'
-            role.save()
-            return
-        else:
-            return
-    """Unbans a banned user from club"""
+        return self._apply_transition(user,'ban_member')
+
+    """Unbans a banned user from club, returning whether it applied"""
     def unban_member(self,user):
-        role = Role.objects.get(club=self,user=user)
-        if role.club_role == 'BAN':
-            """User must re-apply to re-join club"""
-            role.delete()
-            return
-        else:
-            return
-    """Makes an officer the owner of the club"""
+        """User must re-apply to re-join club"""
+        return self._apply_transition(user,'unban_member')
+
+    """Makes an officer the owner of the club and the old owner an officer, returning whether it applied"""
     def transfer_ownership(self,old_owner,new_owner):
-        new_owner_role = Role.objects.get(club=self,user=new_owner)
-        old_owner_role = Role.objects.get(club=self,user=old_owner)
-        if new_owner_role.club_role == 'OFF':
-            new_owner_role.club_role = 'OWN'
-            new_owner_role.save()
-            """Old owner becomes an officer at the club"""
-            old_owner_role.club_role = 'OFF'
-            old_owner_role.save()
-            return
-        else:
-            return
+        with transaction.atomic():
+            """The old owner is demoted first, as a club may only have one owner at any point"""
+            demoted = Role.objects.filter(club=self,user=old_owner,club_role='OWN').update(club_role='OFF')
+            promoted = demoted and Role.objects.filter(club=self,user=new_owner,club_role='OFF').update(club_role='OWN')
+            if not promoted:
+                transaction.set_rollback(True)
+                return False
+            """Both users stay in the club and one officer replaces another, so no counter changes"""
+            self._roles_changed([old_owner.id,new_owner.id])
+        return True
 
     """Returns all user objects that are applicants of a club"""
     def get_applicants(self):
-        return self.club_members.all().filter(
-            club__club_name = self.club_name,
-            role__club_role='APP')
+        return User.objects.filter(role__club=self, role__club_role='APP')
 
     """Returns all user objects that are members of a club"""
     def get_members(self):
-        return self.club_members.all().filter(
-            club__club_name = self.club_name, role__club_role = 'MEM')
+        return User.objects.filter(role__club=self, role__club_role='MEM')
 
     """Returns all user objects that are in the club of a club"""
     def get_all_users_in_club(self):
-        return self.club_members.all().filter(
-            club__club_name = self.club_name, role__club_role = 'MEM')|self.club_members.all().filter(
-                club__club_name = self.club_name, role__club_role = 'OFF')|self.club_members.all().filter(
-                    club__club_name = self.club_name, role__club_role = 'OWN')
+        return User.objects.filter(role__club=self, role__club_role__in=Role.IN_CLUB_ROLES)
 
     """ Returns all banned users in the club"""
     def get_banned_members(self):
-        return self.club_members.all().filter(
-            club__club_name = self.club_name,
-            role__club_role='BAN')
+        return User.objects.filter(role__club=self, role__club_role='BAN')
 
     """ Returns all officer users in the club"""
     def get_officers(self):
-        return User.objects.all().filter(
-            club__club_name = self.club_name,
-            role__club_role='OFF')
+        return User.objects.filter(role__club=self, role__club_role='OFF')
 
     """Returns owner of club"""
     def get_owner(self):
-        return User.objects.all().filter(
-            club__club_name = self.club_name,
-            role__club_role='OWN')
+        return User.objects.filter(role__club=self, role__club_role='OWN')
 
     """Checks if user is in club"""
     def is_user_in_club(self,user):
-        try:
-             role = self.get_club_role(user)
-        except ObjectDoesNotExist:
-            return False
-        else:
-            return True
-    """Deletes user's role in the club"""
+        return Role.objects.filter(club=self, user=user).exists()
+    """Deletes user's role in the club, returning whether the user had one"""
     def remove_user_from_club(self,user):
-        role = Role.objects.get(club=self,user=user)
-        role.delete()
+        return self._delete_roles(Role.objects.filter(club=self,user=user),[user.id])
+
+    """Makes every listed applicant a member, returning the ids of the users that were accepted"""
+    def bulk_accept_applicants(self,user_ids):
+        return self._bulk_update_roles(user_ids,'APP','MEM')
+
+    """Removes every listed applicant from the club, returning the ids of the users that were rejected"""
+    def bulk_reject_applicants(self,user_ids):
+        with transaction.atomic():
+            rejected = set(Role.objects.select_for_update().filter(
+                club=self,user_id__in=user_ids,club_role='APP').values_list('user_id',flat=True))
+            self._delete_roles(Role.objects.filter(club=self,user_id__in=rejected),rejected,('APP',))
+        return rejected
+
+    """Bans every listed member, returning the ids of the users that were banned"""
+    def bulk_ban_members(self,user_ids):
+        return self._bulk_update_roles(user_ids,'MEM','BAN')
+
+    """Makes every listed member an officer, returning the ids of the users that were promoted"""
+    def bulk_promote_members(self,user_ids):
+        return self._bulk_update_roles(user_ids,'MEM','OFF')
+
+    def _bulk_update_roles(self,user_ids,from_role,to_role):
+        with transaction.atomic():
+            updated = set(Role.objects.select_for_update().filter(
+                club=self,user_id__in=user_ids,club_role=from_role).values_list('user_id',flat=True))
+            count = Role.objects.filter(club=self,user_id__in=updated,club_role=from_role).update(club_role=to_role)
+            Club.update_role_counts(self.id,[(from_role,-count),(to_role,count)])
+            self._roles_changed(updated)
+        return updated
+
+    def _apply_transition(self,user,transition):
+        """Change the user's role with a conditional statement per role it may change from, so that
+        concurrent changes to the same role cannot be lost and the counters know which role it left"""
+        from_roles, to_role = Role.TRANSITIONS[transition]
+        roles = Role.objects.filter(club=self,user=user)
+        if to_role is None:
+            return self._delete_roles(roles,[user.id],from_roles)
+        with transaction.atomic():
+            for from_role in from_roles:
+                if roles.filter(club_role=from_role).update(club_role=to_role):
+                    Club.update_role_counts(self.id,[(from_role,-1),(to_role,1)])
+                    self._roles_changed([user.id])
+                    return True
+        return False
+
+    def _delete_roles(self,roles,user_ids,club_roles=None):
+        """Delete with a single statement per role rather than the deletion collector, which reads
+        the roles first and then deletes them by id without rechecking their club_role"""
+        with transaction.atomic():
+            if club_roles is None:
+                club_roles = set(roles.values_list('club_role',flat=True))
+            changes = []
+            for club_role in club_roles:
+                changes.append((club_role,-delete_rows(roles.filter(club_role=club_role))))
+            Club.update_role_counts(self.id,changes)
+        applied = any(change for club_role, change in changes)
+        if applied:
+            self._roles_changed(user_ids)
+        return applied
+
+    def _roles_changed(self,user_ids):
+        """Queryset updates send no signals, so cached roles are invalidated here"""
+        from . import cache
+        for user_id in user_ids:
+            cache.invalidate_user(user_id)
+        cache.invalidate_club(self.id)
+
+
+def delete_rows(queryset):
+    """Deletes the rows of a queryset with a single DELETE statement, without the deletion collector
+    or signals, and returns the number of rows deleted."""
+    using = router.db_for_write(queryset.model)
+    connection = connections[using]
+    sql, params = queryset.order_by().values('pk').query.get_compiler(using).as_sql()
+    table = connection.ops.quote_name(queryset.model._meta.db_table)
+    column = connection.ops.quote_name(queryset.model._meta.pk.column)
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table} WHERE {column} IN ({sql})', params)
+        return cursor.rowcount
 
 
 """Create role model"""
@@ -222,5 +318,56 @@ class Role(models.Model):
         default = RoleOptions.APPLICANT,
         )
 
+    """Roles of users that are in the club, as opposed to applicants and banned users"""
+    IN_CLUB_ROLES = ('MEM', 'OFF', 'OWN')
+
+    """Role changes made by Club methods: the roles a user may hold before each change,
+    and the role they hold after it, None meaning that the role is deleted"""
+    TRANSITIONS = {
+        'toggle_member': (('APP', 'OFF'), 'MEM'),
+        'toggle_officer': (('MEM',), 'OFF'),
+        'ban_member': (('MEM',), 'BAN'),
+        'unban_member': (('BAN',), None),
+    }
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['club', 'user'], name='unique_club_user_role'),
+            models.UniqueConstraint(
+                fields=['club'],
+                condition=models.Q(club_role='OWN'),
+                name='unique_club_owner',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['club', 'club_role'], name='role_club_club_role_idx'),
+            models.Index(fields=['user', 'club_role'], name='role_user_club_role_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the role as loaded, so that saving a changed role can update the club's counters"""
+        role = super().from_db(db, field_names, values)
+        role._loaded_club_role = role.club_role if 'club_role' in field_names else None
+        return role
+
     def get_club_role(self):
         return self.RoleOptions(self.club_role).name.title()
+
+
+"""Create member name token model, indexing the normalised words of user names for member search"""
+class MemberNameToken(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='name_tokens')
+    token = models.CharField(max_length=50)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['token', 'user'], name='member_name_token_idx'),
+        ]
+
+
+"""Fields and order of the users listed in paginated club rosters"""
+class ClubRoster:
+    USER_FIELDS = ('id', 'username', 'email', 'first_name', 'last_name', 'bio', 'chess_experience_level', 'gravatar_hash')
+    """Stable order of users in roster lists, by name then pk"""
+    ORDERING = ('last_name', 'first_name', 'id')
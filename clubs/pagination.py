@@ -0,0 +1,122 @@
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.http import QueryDict
+from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
+import json
+
+"""Keyset pagination. A page is found by seeking past the ordering key of the last row
+seen instead of skipping rows with OFFSET, so a deep page costs the same as the first."""
+
+
+class KeysetPage:
+    """A page of objects with opaque cursors to the pages either side of it."""
+
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+class KeysetPaginator:
+    """Paginates a queryset ordered ascending by the given fields, the last of which must be unique."""
+
+    NEXT = 'n'
+    PREVIOUS = 'p'
+
+    def __init__(self, queryset, ordering, page_size):
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.page_size = page_size
+
+    def get_page(self, cursor=None):
+        """Returns the page a cursor points to, or the first page if the cursor is missing or invalid."""
+        direction, values = self.decode_cursor(cursor) or (self.NEXT, None)
+        forwards = direction == self.NEXT
+        queryset = self.queryset
+        if values is not None:
+            queryset = queryset.filter(self._seek(values, forwards))
+        ordering = self.ordering if forwards else tuple(f'-{field}' for field in self.ordering)
+        objects = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        has_more = len(objects) > self.page_size
+        objects = objects[:self.page_size]
+        if not forwards:
+            objects.reverse()
+        if not objects:
+            return KeysetPage(objects, None, None)
+        has_next = has_more if forwards else True
+        has_previous = values is not None if forwards else has_more
+        return KeysetPage(
+            objects,
+            self.encode_cursor(self.NEXT, objects[-1]) if has_next else None,
+            self.encode_cursor(self.PREVIOUS, objects[0]) if has_previous else None)
+
+    def encode_cursor(self, direction, obj):
+        values = [getattr(obj, field) for field in self.ordering]
+        return urlsafe_base64_encode(json.dumps([direction, values], separators=(',', ':')).encode())
+
+    def decode_cursor(self, cursor):
+        if not cursor:
+            return None
+        try:
+            direction, values = json.loads(urlsafe_base64_decode(cursor))
+        except (ValueError, TypeError):
+            return None
+        if direction not in (self.NEXT, self.PREVIOUS) or not isinstance(values, list) or len(values) != len(self.ordering):
+            return None
+        """Cursors come from the query string, so their values are checked like form input"""
+        try:
+            values = [self._to_python(field, value) for field, value in zip(self.ordering, values)]
+        except (ValidationError, ValueError, TypeError):
+            return None
+        return direction, values
+
+    def _to_python(self, name, value):
+        field = self.queryset.model._meta.get_field(name)
+        value = field.to_python(value)
+        if value is None:
+            raise ValidationError('Cursor values cannot be null.')
+        field.run_validators(value)
+        if isinstance(value, int) and not -2 ** 63 <= value < 2 ** 63:
+            """SQLite validates no integer ranges, and fails queries on integers wider than 64 bits"""
+            raise ValidationError('Cursor value out of range.')
+        return value
+
+    def _seek(self, values, forwards):
+        """Rows after (or before) the key: (a, b, c) > (x, y, z) expands to
+        a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z), bounded by a >= x
+        so the database can range scan an index on the leading field."""
+        lookup = 'gt' if forwards else 'lt'
+        condition = Q()
+        for position, field in enumerate(self.ordering):
+            equal = dict(zip(self.ordering[:position], values[:position]))
+            condition |= Q(**equal, **{f'{field}__{lookup}': values[position]})
+        return Q(**{f'{self.ordering[0]}__{lookup}e': values[0]}) & condition
+
+
+def paginate_request(request, queryset, ordering, page_size, cursor_parameter='cursor', keep_query=True):
+    """Returns the page of the queryset selected by the request's cursor, with URLs of the pages either side.
+    Without keep_query, the URLs carry the cursor alone."""
+    page = KeysetPaginator(queryset, ordering, page_size).get_page(request.GET.get(cursor_parameter))
+    page.next_url = _get_cursor_url(request, cursor_parameter, page.next_cursor, keep_query)
+    page.previous_url = _get_cursor_url(request, cursor_parameter, page.previous_cursor, keep_query)
+    return page
+
+def get_request_cursor(request, queryset, ordering, cursor_parameter='cursor'):
+    """Returns the request's cursor, or None if it is missing or invalid and so selects the first page, without querying."""
+    cursor = request.GET.get(cursor_parameter)
+    return cursor if KeysetPaginator(queryset, ordering, None).decode_cursor(cursor) else None
+
+def _get_cursor_url(request, cursor_parameter, cursor, keep_query=True):
+    if cursor is None:
+        return None
+    query = request.GET.copy() if keep_query else QueryDict(mutable=True)
+    query[cursor_parameter] = cursor
+    return f'?{query.urlencode()}'
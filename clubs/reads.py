@@ -0,0 +1,40 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import connections
+import asyncio
+import contextvars
+import threading
+
+"""Concurrent database reads for the async views served through the ASGI entry point.
+
+Django 3.2 has no async ORM, and its sync_to_async runs every database call of a request in one
+thread. Independent reads instead run in a bounded pool of threads, each with its own database
+connection, so their round trips overlap. Reads must not depend on the request's transaction."""
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_executor():
+    """Returns the process-wide database read pool, sized by DATABASE_READ_WORKERS."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.DATABASE_READ_WORKERS, thread_name_prefix='database-reads')
+        return _executor
+
+def _read(function):
+    """Runs a read, then closes the thread's connections once they outlive CONN_MAX_AGE, as at the end of a request."""
+    try:
+        return function()
+    finally:
+        for connection in connections.all():
+            connection.close_if_unusable_or_obsolete()
+
+async def gather_reads(*functions):
+    """Runs the functions concurrently in the database read pool and returns their results in order."""
+    loop = asyncio.get_running_loop()
+    """Each read runs in a copy of the request's context, which holds its database routing"""
+    return await asyncio.gather(*(
+        loop.run_in_executor(get_executor(), contextvars.copy_context().run, _read, function)
+        for function in functions))
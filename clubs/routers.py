@@ -0,0 +1,61 @@
+from django.conf import settings
+import contextlib
+import contextvars
+
+"""Routes the reads of read-only views to a replica of the database, and everything else to the primary.
+
+Read-only views, listed by URL name in settings.DATABASE_REPLICA_URL_NAMES, read from the alias
+settings.DATABASE_REPLICA_ALIAS when it is set. Writes always go to the primary, and so do the reads of
+a browser for DATABASE_PRIMARY_PIN_SECONDS after it wrote, so users see their own changes despite
+replication lag. The state lives in context variables, so it follows a request across sync_to_async
+and into the database read pool."""
+
+_replica_reads = contextvars.ContextVar('replica_reads', default=False)
+_writes = contextvars.ContextVar('writes', default=None)
+
+class PrimaryReplicaRouter:
+    """Database router sending the reads of replica requests to the replica, and all writes to the primary."""
+
+    def db_for_read(self, model, **hints):
+        """Primary reads ignore the database an instance was read from, which may be the replica"""
+        if _replica_reads.get() and settings.DATABASE_REPLICA_ALIAS:
+            return settings.DATABASE_REPLICA_ALIAS
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        writes = _writes.get()
+        if writes is not None:
+            writes.append(model)
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """The replica holds the same rows as the primary"""
+        return True
+
+def start_request():
+    """Starts recording the writes of a request, which reads from the primary until use_replica is called."""
+    _replica_reads.set(False)
+    _writes.set([])
+
+def use_replica():
+    """Sends the remaining reads of the request to the replica, if one is configured."""
+    _replica_reads.set(bool(settings.DATABASE_REPLICA_ALIAS))
+
+def reads_from_replica():
+    return _replica_reads.get()
+
+def end_request():
+    """Stops routing the request's reads to the replica, and returns whether the request wrote."""
+    writes = _writes.get()
+    _replica_reads.set(False)
+    _writes.set(None)
+    return bool(writes)
+
+@contextlib.contextmanager
+def primary_reads():
+    """Reads from the primary within the block, e.g. to compute values that outlive the replication lag."""
+    token = _replica_reads.set(False)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
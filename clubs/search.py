@@ -0,0 +1,155 @@
+from django.conf import settings
+from django.db import connection, models
+from text_unidecode import unidecode
+from .models import User,Role,MemberNameToken
+import re
+
+"""Member name search, backed by an SQLite FTS5 table where available and by a table of
+normalised name tokens otherwise. Both fold accents and case and match word prefixes."""
+
+FTS_TABLE = 'clubs_member_name_fts'
+
+def normalise(text):
+    """Returns the lowercase ASCII words of a text, with accents folded."""
+    return re.findall(r'[a-z0-9]+', unidecode(text or '').lower())
+
+def get_name_tokens(user):
+    tokens = []
+    for token in normalise(f'{user.first_name} {user.last_name}'):
+        if token not in tokens:
+            tokens.append(token)
+    return tokens
+
+
+class MemberSearchResults:
+    """A page of members matching a search, in rank order."""
+
+    def __init__(self, members, page, has_next):
+        self.members = members
+        self.page = page
+        self.has_next = has_next
+
+    @property
+    def has_previous(self):
+        return self.page > 1
+
+
+class TokenMemberSearchIndex:
+    """Search index storing each normalised word of a user's name as a MemberNameToken row.
+
+    A prefix is matched with a range scan over the (token, user) index."""
+
+    def update_user(self, user):
+        MemberNameToken.objects.filter(user=user).delete()
+        MemberNameToken.objects.bulk_create(
+            [MemberNameToken(user=user, token=token) for token in get_name_tokens(user)])
+
+    def remove_user(self, user_id):
+        MemberNameToken.objects.filter(user_id=user_id).delete()
+
+    def remove_users(self, user_ids):
+        """Tokens have no signal receivers or dependents, so this is a single DELETE statement"""
+        MemberNameToken.objects.filter(user_id__in=user_ids).delete()
+
+    def rebuild(self, users):
+        MemberNameToken.objects.all().delete()
+        self.add_users(users)
+
+    def add_users(self, users):
+        """Indexes users that are not in the index yet, e.g. users created with bulk_create."""
+        MemberNameToken.objects.bulk_create(
+            (MemberNameToken(user=user, token=token) for user in users for token in get_name_tokens(user)),
+            batch_size=1000)
+
+    def search(self, club, terms, offset, limit):
+        """Starts from the range of tokens matching the first term, so the cost follows the number of
+        matching names rather than the size of the club. Members whose name contains more of the
+        terms as whole words rank first."""
+        def prefix_range(term):
+            return {'token__gte': term, 'token__lt': term[:-1] + chr(ord(term[-1]) + 1)}
+
+        first_term, *other_terms = terms
+        users = User.objects.filter(
+            **{f'name_tokens__{lookup}': value for lookup, value in prefix_range(first_term).items()},
+            role__club=club, role__club_role__in=Role.IN_CLUB_ROLES)
+        for term in other_terms:
+            users = users.filter(id__in=MemberNameToken.objects.filter(**prefix_range(term)).values('user_id'))
+        exact_matches = MemberNameToken.objects.filter(token__in=terms, user_id=models.OuterRef('id'))
+        users = users.annotate(exact_matches=models.Subquery(
+            exact_matches.values('user_id').annotate(count=models.Count('id')).values('count'))).distinct()
+        return list(users.order_by(
+            models.F('exact_matches').desc(nulls_last=True), 'last_name', 'first_name', 'id'
+            ).values_list('id', flat=True)[offset:offset + limit])
+
+
+class Fts5MemberSearchIndex:
+    """Search index backed by an SQLite FTS5 table whose rowid is the user id, ranked with bm25."""
+
+    def update_user(self, user):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [user.id])
+            cursor.execute(f'INSERT INTO {FTS_TABLE} (rowid, name) VALUES (%s, %s)',
+                [user.id, ' '.join(get_name_tokens(user))])
+
+    def remove_user(self, user_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [user_id])
+
+    def remove_users(self, user_ids):
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [(user_id,) for user_id in user_ids])
+
+    def rebuild(self, users):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        self.add_users(users)
+
+    def add_users(self, users):
+        """Indexes users that are not in the index yet, e.g. users created with bulk_create."""
+        with connection.cursor() as cursor:
+            cursor.executemany(f'INSERT INTO {FTS_TABLE} (rowid, name) VALUES (%s, %s)',
+                ((user.id, ' '.join(get_name_tokens(user))) for user in users))
+
+    def search(self, club, terms, offset, limit):
+        """Terms only contain ASCII letters and digits, so they are safe inside an FTS5 string.
+        Members whose name contains more of the terms as whole words rank first, then by bm25."""
+        match = ' '.join(f'"{term}"*' for term in terms)
+        in_club_roles = ', '.join(['%s'] * len(Role.IN_CLUB_ROLES))
+        exact_matches = ' + '.join([f"(instr(' ' || name || ' ', %s) > 0)"] * len(terms))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT {FTS_TABLE}.rowid FROM {FTS_TABLE} '
+                f'JOIN {Role._meta.db_table} role ON role.user_id = {FTS_TABLE}.rowid '
+                f'WHERE {FTS_TABLE} MATCH %s AND role.club_id = %s AND role.club_role IN ({in_club_roles}) '
+                f'ORDER BY {exact_matches} DESC, bm25({FTS_TABLE}), {FTS_TABLE}.rowid LIMIT %s OFFSET %s',
+                [match, club.id, *Role.IN_CLUB_ROLES, *(f' {term} ' for term in terms), limit, offset])
+            return [row[0] for row in cursor.fetchall()]
+
+
+_fts5_tables = {}
+
+def _has_fts5_table():
+    name = connection.settings_dict['NAME']
+    if name not in _fts5_tables:
+        _fts5_tables[name] = connection.vendor == 'sqlite' and FTS_TABLE in connection.introspection.table_names()
+    return _fts5_tables[name]
+
+def get_member_search_index():
+    """Returns the index selected by MEMBER_SEARCH_BACKEND: 'fts5', 'tokens', or 'auto' to use FTS5 where available."""
+    backend = settings.MEMBER_SEARCH_BACKEND
+    if backend == 'fts5' or (backend == 'auto' and _has_fts5_table()):
+        return Fts5MemberSearchIndex()
+    return TokenMemberSearchIndex()
+
+def search_members(club, query, page=1, page_size=None):
+    """Returns a page of the owner, officers and members of the club whose names match every word of the query."""
+    page_size = page_size or settings.MEMBER_SEARCH_PAGE_SIZE
+    terms = normalise(query)
+    offset = (page - 1) * page_size
+    """Databases fail queries on offsets wider than 64 bits, and no club has that many members"""
+    if not terms or offset + page_size >= 2 ** 63:
+        return MemberSearchResults([], page, False)
+    user_ids = get_member_search_index().search(club, terms, offset, page_size + 1)
+    users = User.objects.in_bulk(user_ids[:page_size])
+    members = [users[user_id] for user_id in user_ids[:page_size] if user_id in users]
+    return MemberSearchResults(members, page, len(user_ids) > page_size)
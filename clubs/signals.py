@@ -0,0 +1,91 @@
+from django.db.models import Count
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from .models import User,Club,Role,ClubRoster
+from . import cache
+from .search import get_member_search_index
+
+"""Invalidate cached memberships and roster fragments whenever the data behind them changes"""
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+def invalidate_role(sender, instance, **kwargs):
+    cache.invalidate_user(instance.user_id)
+    cache.invalidate_club(instance.club_id)
+
+@receiver(m2m_changed, sender=Club.club_members.through)
+def invalidate_club_members(sender, instance, action, reverse, pk_set, **kwargs):
+    """Club.club_members.add() and friends bulk insert roles without sending post_save"""
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if action == 'pre_clear':
+        related = instance.role_set.values_list('user_id' if not reverse else 'club_id', flat=True)
+        pk_set = set(related)
+    for pk in pk_set or ():
+        cache.invalidate_user(instance.id if reverse else pk)
+        cache.invalidate_club(pk if reverse else instance.id)
+
+@receiver(post_save, sender=Club)
+def invalidate_saved_club(sender, instance, created, raw, **kwargs):
+    cache.invalidate_club(instance.id)
+    if not created and not raw:
+        """Cached memberships hold the club name, which may have changed"""
+        for user_id in Role.objects.filter(club=instance).values_list('user_id', flat=True):
+            cache.invalidate_user(user_id)
+
+@receiver(post_delete, sender=Club)
+def invalidate_deleted_club(sender, instance, **kwargs):
+    cache.invalidate_club(instance.id)
+
+@receiver(post_save, sender=User)
+def invalidate_saved_user(sender, instance, created, raw, update_fields, **kwargs):
+    cache.invalidate_user(instance.id)
+    listed = update_fields is None or set(ClubRoster.USER_FIELDS) & set(update_fields)
+    if not created and not raw and listed:
+        """Member prefix indexes and cached roster tables hold the details of the club's members"""
+        for club_id in Role.objects.filter(user=instance).values_list('club_id', flat=True):
+            cache.invalidate_club(club_id)
+
+@receiver(post_save, sender=User)
+def index_saved_user(sender, instance, update_fields, **kwargs):
+    """Also index users loaded from fixtures, which only hold fields of the user itself. Saves of other
+    fields, like the last_login update of every log in, leave the index as it is"""
+    if update_fields is None or {'first_name', 'last_name'} & set(update_fields):
+        get_member_search_index().update_user(instance)
+
+@receiver(post_delete, sender=User)
+def unindex_deleted_user(sender, instance, **kwargs):
+    get_member_search_index().remove_user(instance.id)
+
+
+"""Keep the role counters of clubs in step with roles saved, deleted or added outside Club methods.
+The signals are sent inside the transaction that changes the roles."""
+
+@receiver(post_save, sender=Role)
+def count_saved_role(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    loaded_club_role = getattr(instance, '_loaded_club_role', None)
+    if created:
+        Club.update_role_counts(instance.club_id, [(instance.club_role, 1)])
+    elif loaded_club_role is not None and loaded_club_role != instance.club_role:
+        Club.update_role_counts(instance.club_id, [(loaded_club_role, -1), (instance.club_role, 1)])
+    instance._loaded_club_role = instance.club_role
+
+@receiver(post_delete, sender=Role)
+def count_deleted_role(sender, instance, **kwargs):
+    Club.update_role_counts(instance.club_id, [(instance.club_role, -1)])
+
+@receiver(m2m_changed, sender=Club.club_members.through)
+def count_club_members(sender, instance, action, reverse, pk_set, **kwargs):
+    """Added roles are bulk inserted without post_save, so they are counted once inserted. Removed and
+    cleared roles are deleted one by one with post_delete, which counts them in count_deleted_role"""
+    if action != 'post_add':
+        return
+    roles = Role.objects.filter(**{'user' if reverse else 'club': instance})
+    roles = roles.filter(**{'club_id__in' if reverse else 'user_id__in': pk_set or ()})
+    changes = {}
+    for club_id, club_role, count in roles.values_list('club_id', 'club_role').annotate(Count('id')).order_by():
+        changes.setdefault(club_id, []).append((club_role, count))
+    for club_id, club_changes in changes.items():
+        Club.update_role_counts(club_id, club_changes)
@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+import sqlite3
+
+"""Connection tuning for SQLite, so concurrent workers share the database file without locking each other out.
+
+Every new SQLite connection gets the pragmas of settings.SQLITE_PROFILE. With WAL, readers never block
+the writer and the writer never blocks readers, and busy_timeout makes a writer wait for the lock
+instead of failing with 'database is locked'."""
+
+def get_pragmas(profile=None):
+    """Returns the pragmas of the profile, or of settings.SQLITE_PROFILE, in the order they are applied."""
+    return settings.SQLITE_PROFILES[profile or settings.SQLITE_PROFILE]
+
+def apply_pragmas(connection, pragmas):
+    """Applies the pragmas to a sqlite3 connection."""
+    for name, value in pragmas.items():
+        connection.execute(f'PRAGMA {name} = {value}')
+
+@receiver(connection_created)
+def tune_connection(sender, connection, **kwargs):
+    if connection.vendor == 'sqlite':
+        apply_pragmas(connection.connection, get_pragmas())
+
+@receiver(request_started)
+def check_connections(sender, **kwargs):
+    """Closes persistent connections that no longer answer, so the request reconnects.
+
+    Django 3.2 only checks a persistent connection after a query on it failed, and its SQLite backend
+    considers every connection usable."""
+    if settings.SQLITE_HEALTH_CHECKS:
+        for connection in connections.all():
+            if connection.vendor == 'sqlite':
+                check_connection(connection)
+
+def check_connection(connection):
+    """Closes the SQLite connection if it is open, outside a transaction, and fails a trivial query."""
+    if connection.connection is None or connection.in_atomic_block:
+        return
+    try:
+        connection.connection.execute('SELECT 1')
+    except sqlite3.Error:
+        connection.close()
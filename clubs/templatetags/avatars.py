@@ -0,0 +1,10 @@
+from django import template
+from django.urls import reverse
+from clubs.avatars import get_size_bucket
+
+register = template.Library()
+
+@register.simple_tag
+def avatar_url(user, size=60):
+    """Returns the URL of the user's avatar in the local avatar proxy, at the cached size for the given size."""
+    return reverse('avatar', kwargs={'gravatar_hash': user.get_gravatar_hash(), 'size': get_size_bucket(size)})
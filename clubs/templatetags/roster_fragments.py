@@ -0,0 +1,38 @@
+from django import template
+from clubs import cache
+
+register = template.Library()
+
+class RosterFragmentNode(template.Node):
+    def __init__(self, nodelist, name, club, vary_on):
+        self.nodelist = nodelist
+        self.name = name
+        self.club = club
+        self.vary_on = vary_on
+
+    def render(self, context):
+        club = self.club.resolve(context)
+        vary_on = [variable.resolve(context) for variable in self.vary_on]
+
+        def render_fragment():
+            with context.push(csrf_token=cache.CSRF_TOKEN_PLACEHOLDER):
+                return self.nodelist.render(context)
+
+        html = cache.get_club_fragment(self.name, club.id, vary_on, render_fragment)
+        return cache.insert_csrf_token(html, context.get('csrf_token'))
+
+@register.tag
+def roster_fragment(parser, token):
+    """Caches the enclosed fragment of a club page until a role in the club changes.
+
+    Usage: {% roster_fragment 'name' club [vary_on ...] %}...{% endroster_fragment %}"""
+    bits = token.split_contents()
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' takes a fragment name and a club.")
+    name = bits[1]
+    if not (name[0] == name[-1] and name[0] in ('"', "'")):
+        raise template.TemplateSyntaxError(f"The fragment name of '{bits[0]}' must be quoted.")
+    nodelist = parser.parse(('endroster_fragment',))
+    parser.delete_first_token()
+    return RosterFragmentNode(
+        nodelist, name[1:-1], parser.compile_filter(bits[2]), [parser.compile_filter(bit) for bit in bits[3:]])
@@ -0,0 +1,118 @@
+"""Unit tests for the membership cache."""
+import multiprocessing
+import tempfile
+from django.test import TestCase, override_settings
+from clubs import cache
+from clubs.models import User,Club,Role
+
+class MembershipCacheTestCase(TestCase):
+    """Unit tests for the membership cache."""
+
+    fixtures = [
+        'clubs/tests/fixtures/default_user.json',
+        'clubs/tests/fixtures/other_users.json',
+        'clubs/tests/fixtures/default_club.json']
+
+    def setUp(self):
+        self.owner = User.objects.get(username='johndoe@example.org')
+        self.user = User.objects.get(username='janedoe@example.org')
+        self.club = Club.objects.get(club_name='Beatles')
+        self.club.club_members.add(self.owner,through_defaults={'club_role':'OWN'})
+        self.club.club_members.add(self.user,through_defaults={'club_role':'APP'})
+        cache.stats.reset()
+
+    def test_user_roles_are_cached(self):
+        with self.assertNumQueries(1):
+            cache.get_user_roles(self.user.id)
+        with self.assertNumQueries(0):
+            roles = cache.get_user_roles(self.user.id)
+        self.assertEqual(roles,[(self.club.id,'Beatles','APP')])
+        self.assertEqual(cache.stats.get(cache.USER_NAMESPACE),{'hits': 1, 'misses': 1})
+
+    def test_toggle_member_invalidates_user_and_club(self):
+        version = self._warm_cache()
+        self.club.toggle_member(self.user)
+        self.assertEqual(cache.get_user_roles(self.user.id),[(self.club.id,'Beatles','MEM')])
+        self.assertNotEqual(cache.get_club_version(self.club.id),version)
+
+    def test_ban_member_invalidates_user(self):
+        self.club.toggle_member(self.user)
+        self._warm_cache()
+        self.club.ban_member(self.user)
+        self.assertEqual(cache.get_user_roles(self.user.id),[(self.club.id,'Beatles','BAN')])
+
+    def test_transfer_ownership_invalidates_both_users(self):
+        self.club.toggle_member(self.user)
+        self.club.toggle_officer(self.user)
+        self._warm_cache()
+        cache.get_user_roles(self.owner.id)
+        self.club.transfer_ownership(self.owner,self.user)
+        self.assertEqual(cache.get_user_roles(self.user.id),[(self.club.id,'Beatles','OWN')])
+        self.assertEqual(cache.get_user_roles(self.owner.id),[(self.club.id,'Beatles','OFF')])
+
+    def test_remove_user_from_club_invalidates_user_and_club(self):
+        version = self._warm_cache()
+        self.club.remove_user_from_club(self.user)
+        self.assertEqual(cache.get_user_roles(self.user.id),[])
+        self.assertNotEqual(cache.get_club_version(self.club.id),version)
+
+    def test_adding_club_members_invalidates_user(self):
+        other_user = User.objects.get(username='robertdoe@example.org')
+        self.assertEqual(cache.get_user_roles(other_user.id),[])
+        self.club.club_members.add(other_user,through_defaults={'club_role':'APP'})
+        self.assertEqual(cache.get_user_roles(other_user.id),[(self.club.id,'Beatles','APP')])
+
+    def test_deleting_club_invalidates_users_and_club(self):
+        version = self._warm_cache()
+        club_id = self.club.id
+        self.club.delete()
+        self.assertEqual(cache.get_user_roles(self.user.id),[])
+        self.assertNotEqual(cache.get_club_version(club_id),version)
+
+    def test_club_fragment_is_cached_until_roles_change(self):
+        renders = []
+        render = lambda: renders.append(1) or f'<table>{len(renders)}</table>'
+        self.assertEqual(cache.get_club_fragment('roster', self.club.id, ['member'], render),'<table>1</table>')
+        self.assertEqual(cache.get_club_fragment('roster', self.club.id, ['member'], render),'<table>1</table>')
+        self.assertEqual(cache.get_club_fragment('roster', self.club.id, ['staff'], render),'<table>2</table>')
+        self.club.toggle_member(self.user)
+        self.assertEqual(cache.get_club_fragment('roster', self.club.id, ['member'], render),'<table>3</table>')
+        self.assertEqual(cache.stats.get('fragment:roster'),{'hits': 1, 'misses': 3})
+        self.assertEqual(cache.stats.get_hit_rate('fragment:roster'),0.25)
+        self.assertGreater(cache.stats.get_seconds_saved('fragment:roster'),0)
+
+    def test_changing_member_details_invalidates_club(self):
+        version = cache.get_club_version(self.club.id)
+        self.user.save(update_fields=['last_login'])
+        self.assertEqual(cache.get_club_version(self.club.id),version)
+        self.user.chess_experience_level = 3
+        self.user.save()
+        self.assertNotEqual(cache.get_club_version(self.club.id),version)
+
+    def test_file_based_cache(self):
+        with tempfile.TemporaryDirectory() as location:
+            caches = {'memberships': {
+                'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': location,
+            }}
+            with override_settings(CACHES=caches):
+                self._warm_cache()
+                with self.assertNumQueries(0):
+                    cache.get_user_roles(self.user.id)
+                self.club.toggle_member(self.user)
+                self.assertEqual(cache.get_user_roles(self.user.id),[(self.club.id,'Beatles','MEM')])
+
+    def test_role_change_in_another_process_invalidates_cached_roles(self):
+        self.assertEqual(cache.get_user_roles(self.user.id),[(self.club.id,'Beatles','APP')])
+        """The role changes as another worker would change it, without this process's signals"""
+        Role.objects.filter(user=self.user).update(club_role='BAN')
+        worker = multiprocessing.get_context('fork').Process(target=cache.invalidate_user, args=(self.user.id,))
+        worker.start()
+        worker.join()
+        self.assertEqual(worker.exitcode,0)
+        self.assertEqual(cache.get_user_roles(self.user.id),[(self.club.id,'Beatles','BAN')])
+
+    def _warm_cache(self):
+        """Returns the club version the user's roles were cached under"""
+        cache.get_user_roles(self.user.id)
+        return cache.get_club_version(self.club.id)
@@ -0,0 +1,116 @@
+"""Unit tests for the primary and replica database router."""
+from asgiref.sync import sync_to_async
+from django.core.management import call_command
+from django.db import connections
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from clubs import routers
+from clubs.models import User,Club
+from clubs.routers import PrimaryReplicaRouter
+import io
+import os
+import tempfile
+
+@override_settings(DATABASE_REPLICA_ALIAS='replica')
+class PrimaryReplicaRouterTestCase(SimpleTestCase):
+    """Unit tests for the primary and replica database router."""
+
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        routers.start_request()
+        self.addCleanup(routers.end_request)
+
+    def test_reads_go_to_primary_by_default(self):
+        self.assertEqual(self.router.db_for_read(User), 'default')
+
+    def test_replica_requests_read_from_replica(self):
+        routers.use_replica()
+        self.assertEqual(self.router.db_for_read(User), 'replica')
+
+    def test_primary_reads_within_replica_request(self):
+        routers.use_replica()
+        with routers.primary_reads():
+            self.assertEqual(self.router.db_for_read(User), 'default')
+        self.assertEqual(self.router.db_for_read(User), 'replica')
+
+    def test_writes_go_to_primary_and_are_recorded(self):
+        routers.use_replica()
+        self.assertEqual(self.router.db_for_write(User), 'default')
+        self.assertTrue(routers.end_request())
+        self.assertEqual(self.router.db_for_read(User), 'default')
+
+    def test_request_without_writes(self):
+        self.assertFalse(routers.end_request())
+
+    @override_settings(DATABASE_REPLICA_ALIAS=None)
+    def test_no_replica_configured(self):
+        routers.use_replica()
+        self.assertEqual(self.router.db_for_read(User), 'default')
+
+
+@override_settings(DATABASE_REPLICA_ALIAS='replica')
+class ReplicaRoutingTestCase(TransactionTestCase):
+    """Unit tests for the routing of requests between a primary and a replica held in separate
+    SQLite databases, with replicate_sqlite standing in for replication."""
+
+    fixtures = [
+        'clubs/tests/fixtures/default_user.json',
+        'clubs/tests/fixtures/other_users.json',
+        'clubs/tests/fixtures/default_club.json',
+        'clubs/tests/fixtures/other_clubs.json']
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        connections.settings['replica'] = {
+            **connections.databases['default'], 'NAME': os.path.join(directory.name, 'replica.sqlite3')}
+        self.addCleanup(self._remove_replica)
+        self.user = User.objects.get(username='johndoe@example.org')
+        self.officer = User.objects.get(username='robertdoe@example.org')
+        self.member = User.objects.get(username='janedoe@example.org')
+        self.club = Club.objects.get(club_name='EliteChess')
+        self.club.club_members.add(self.officer,through_defaults={'club_role':'OFF'})
+        self.club.club_members.add(self.member,through_defaults={'club_role':'MEM'})
+        self.client.login(username=self.officer.username, password='Password123')
+        self._replicate()
+
+    def test_read_only_view_reads_replica(self):
+        User.objects.filter(id=self.user.id).update(first_name='Renamed')
+        url = reverse('show_user', kwargs={'user_id': self.user.id})
+        response = self.client.get(url)
+        self.assertContains(response, self.user.first_name)
+        self.assertNotContains(response, 'Renamed')
+        self.assertNotIn('ETag', response)
+        self._replicate()
+        self.assertContains(self.client.get(url), 'Renamed')
+
+    async def test_asgi_request_reads_replica(self):
+        await sync_to_async(User.objects.filter(id=self.user.id).update)(first_name='Renamed')
+        self.async_client.cookies = self.client.cookies
+        response = await self.async_client.get(reverse('show_user', kwargs={'user_id': self.user.id}))
+        self.assertNotContains(response, 'Renamed')
+
+    def test_write_pins_browser_to_primary(self):
+        response = self.client.post(
+            reverse('ban_member', kwargs={'club_name': self.club.club_name, 'user_id': self.member.id}))
+        self.assertEqual(response.cookies['primary_pin']['max-age'], 10)
+        response = self.client.get(reverse('club_feed', kwargs={'club_name': self.club.club_name}))
+        self.assertNotContains(response, self.member.username)
+        self.assertIn('ETag', response)
+
+    def test_read_only_view_does_not_pin(self):
+        response = self.client.get(reverse('show_user', kwargs={'user_id': self.user.id}))
+        self.assertNotIn('primary_pin', response.cookies)
+
+    def test_cached_roster_is_rendered_from_primary(self):
+        self.club.club_members.add(self.user,through_defaults={'club_role':'MEM'})
+        response = self.client.get(reverse('club_feed', kwargs={'club_name': self.club.club_name}))
+        self.assertContains(response, self.user.username)
+
+    def _replicate(self):
+        call_command('replicate_sqlite', stdout=io.StringIO())
+
+    def _remove_replica(self):
+        connections['replica'].close()
+        del connections['replica']
+        del connections.settings['replica']
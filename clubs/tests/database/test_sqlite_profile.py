@@ -0,0 +1,62 @@
+"""Unit tests for the SQLite connection profile."""
+from django.db import connections
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, override_settings
+from clubs import sqlite
+import os
+import tempfile
+
+class SQLiteProfileTestCase(SimpleTestCase):
+    """Unit tests for the SQLite connection profile."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_production_profile_is_the_default(self):
+        self.assertEqual(sqlite.get_pragmas(), sqlite.get_pragmas('production'))
+        self.assertEqual(sqlite.get_pragmas('default'), {})
+
+    def test_new_connections_get_production_pragmas(self):
+        wrapper = self._create_wrapper()
+        with wrapper.cursor() as cursor:
+            self.assertEqual(self._get_pragma(cursor, 'journal_mode'), 'wal')
+            self.assertEqual(self._get_pragma(cursor, 'synchronous'), 1)
+            self.assertEqual(self._get_pragma(cursor, 'busy_timeout'), 5000)
+            self.assertEqual(self._get_pragma(cursor, 'mmap_size'), 256 * 1024 * 1024)
+            self.assertEqual(self._get_pragma(cursor, 'cache_size'), -64 * 1024)
+            self.assertEqual(self._get_pragma(cursor, 'temp_store'), 2)
+        wrapper.close()
+
+    @override_settings(SQLITE_PROFILE='default')
+    def test_default_profile_keeps_sqlite_defaults(self):
+        wrapper = self._create_wrapper()
+        with wrapper.cursor() as cursor:
+            self.assertEqual(self._get_pragma(cursor, 'journal_mode'), 'delete')
+            self.assertEqual(self._get_pragma(cursor, 'synchronous'), 2)
+        wrapper.close()
+
+    def test_check_connection_keeps_healthy_connection(self):
+        wrapper = self._create_wrapper()
+        wrapper.ensure_connection()
+        raw_connection = wrapper.connection
+        sqlite.check_connection(wrapper)
+        self.assertIs(wrapper.connection, raw_connection)
+        wrapper.close()
+
+    def test_check_connection_closes_broken_connection(self):
+        wrapper = self._create_wrapper()
+        wrapper.ensure_connection()
+        wrapper.connection.close()
+        sqlite.check_connection(wrapper)
+        self.assertIsNone(wrapper.connection)
+        with wrapper.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        wrapper.close()
+
+    def _create_wrapper(self):
+        settings_dict = {**connections.databases['default'], 'NAME': os.path.join(self.directory.name, 'test.sqlite3')}
+        return DatabaseWrapper(settings_dict)
+
+    def _get_pragma(self, cursor, name):
+        return cursor.execute(f'PRAGMA {name}').fetchone()[0]
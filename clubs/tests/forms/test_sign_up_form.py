@@ -4,6 +4,7 @@ from clubs.models import User
 from clubs.forms import SignUpForm
 from django import forms
 from django.contrib.auth.hashers import check_password
+from hashlib import md5
 
 class SignUpFormTestCase(TestCase):
     """Unit tests of sign up form."""
@@ -47,6 +48,7 @@ class SignUpFormTestCase(TestCase):
         self.assertEqual(user.last_name, 'Doe')
         self.assertEqual(user.bio, 'My bio')
         self.assertEqual(user.chess_experience_level,1)
+        self.assertEqual(user.gravatar_hash, md5(b'janedoe@example.org').hexdigest())
         is_password_correct = check_password('Password123', user.password)
         self.assertTrue(is_password_correct)
 
@@ -1,6 +1,7 @@
 """Unit tests of the user form."""
 from django import forms
 from django.test import TestCase
+from hashlib import md5
 from clubs.forms import UserForm
 from clubs.models import User
 
@@ -52,3 +53,4 @@ class UserFormTestCase(TestCase):
         self.assertEqual(user.username, 'janedoe@example.org')
         self.assertEqual(user.bio, 'My bio')
         self.assertEqual(user.chess_experience_level,1)
+        self.assertEqual(user.gravatar_hash, md5(b'janedoe@example.org').hexdigest())
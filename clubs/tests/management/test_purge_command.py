@@ -0,0 +1,74 @@
+"""Unit tests for the purge and unseed commands."""
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from clubs.models import User,Club,Role,MemberNameToken
+from clubs.search import search_members
+from io import StringIO
+
+class PurgeCommandTestCase(TestCase):
+    """Unit tests for the purge and unseed commands."""
+
+    def setUp(self):
+        call_command('seed', '--users', '30', '--clubs', '6', '--seed', '1', stdout=StringIO())
+        self.kept_user = User.objects.create_user(
+            username='kept@chess.org', first_name='Kept', last_name='Player', password='Password123')
+        self.kept_club = Club.objects.create(club_name='Paris Chess', location='Paris', description='Kept club')
+        self.kept_club.club_members.add(self.kept_user,through_defaults={'club_role':'OWN'})
+        self.kept_club.club_members.add(*User.objects.filter(username__endswith='@example.org')[:5],
+            through_defaults={'club_role':'MEM'})
+
+    def _purge(self, command='purge', *args):
+        output = StringIO()
+        call_command(command, *args, stdout=output)
+        return output.getvalue()
+
+    def test_purges_seeded_data_in_batches(self):
+        output = self._purge('purge', '--batch-size', '4')
+        self.assertFalse(User.objects.filter(username__contains='@example.org').exists())
+        self.assertFalse(Club.objects.filter(location__contains='London').exists())
+        self.assertEqual(list(User.objects.all()), [self.kept_user])
+        self.assertEqual(list(Club.objects.all()), [self.kept_club])
+        self.assertEqual(list(Role.objects.values_list('user_id', flat=True)), [self.kept_user.id])
+        self.assertFalse(MemberNameToken.objects.exclude(user=self.kept_user).exists())
+        self.assertIn('Purged 4 users up to id', output)
+        self.assertIn('Purged 33 users\n', output)
+
+    def test_recounts_the_clubs_that_remain(self):
+        self._purge()
+        kept_club = Club.objects.get(id=self.kept_club.id)
+        self.assertEqual(kept_club.member_count, 1)
+
+    def test_purge_resumes_after_interruption(self):
+        """Deleting some of the users stands in for a purge that stopped part way"""
+        User.objects.filter(username__contains='@example.org').order_by('id')[:1].get().delete()
+        output = self._purge('purge', '--batch-size', '10')
+        self.assertIn('Purged 32 users\n', output)
+        self.assertEqual(User.objects.count(), 1)
+
+    def test_purge_of_purged_database(self):
+        self._purge()
+        output = self._purge()
+        self.assertIn('Purged 0 users\n', output)
+        self.assertIn('repaired the counters of 0', output)
+
+    def test_kept_users_remain_searchable(self):
+        self._purge()
+        self.assertEqual(search_members(self.kept_club, 'Kept Player').members, [self.kept_user])
+
+    def test_purge_invalidates_cached_memberships_and_rosters(self):
+        seeded_club = Club.objects.filter(location='London').order_by('-id').first()
+        seeded_club.club_members.add(self.kept_user,through_defaults={'club_role':'MEM'})
+        seeded_member = self.kept_club.club_members.filter(username__endswith='@example.org').first()
+        self.client.login(username=self.kept_user.username, password='Password123')
+        seeded_club_url = reverse('club_feed', kwargs={'club_name': seeded_club.club_name})
+        kept_club_url = reverse('club_feed', kwargs={'club_name': self.kept_club.club_name})
+        self.assertEqual(self.client.get(seeded_club_url).status_code, 200)
+        self.assertContains(self.client.get(kept_club_url), seeded_member.username)
+        self._purge()
+        self.assertRedirects(self.client.get(seeded_club_url), reverse('feed'))
+        self.assertNotContains(self.client.get(kept_club_url), seeded_member.username)
+
+    def test_unseed_purges(self):
+        self._purge('unseed')
+        self.assertEqual(User.objects.count(), 1)
@@ -0,0 +1,63 @@
+"""Unit tests for the seed command."""
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from clubs.gravatar import get_gravatar_hash
+from clubs.models import User,Club,Role
+from clubs.search import search_members
+from io import StringIO
+
+class SeedCommandTestCase(TestCase):
+    """Unit tests for the seed command."""
+
+    def _seed(self, *args):
+        output = StringIO()
+        call_command('seed', *args, stdout=output)
+        return output.getvalue()
+
+    def test_seeds_required_and_random_data(self):
+        output = self._seed('--users', '50', '--clubs', '20', '--seed', '1', '--batch-size', '7')
+        self.assertIn('Seeded 50/50 users', output)
+        self.assertEqual(User.objects.count(), 53)
+        self.assertEqual(Club.objects.count(), 24)
+        self.assertEqual(Role.objects.get(club__club_name='Kerbal Chess Club', club_role='OWN').user.username,
+            'billie@example.org')
+        for club in Club.objects.filter(id__gt=4):
+            self.assertEqual(Role.objects.filter(club=club, club_role='OWN').count(), 1)
+            self.assertGreaterEqual(Role.objects.filter(club=club).count(), 5)
+
+    def test_seeded_users_can_log_in(self):
+        self._seed('--users', '3', '--clubs', '0')
+        user = User.objects.order_by('-id').first()
+        self.assertTrue(self.client.login(username=user.username, password='Password123'))
+        self.assertEqual(user.gravatar_hash, get_gravatar_hash(user.username))
+
+    def test_seeded_counters_need_no_repair(self):
+        self._seed('--users', '40', '--clubs', '10', '--seed', '2')
+        output = StringIO()
+        call_command('recount_clubs', stdout=output)
+        self.assertIn('repaired the counters of 0', output.getvalue())
+
+    def test_seeded_users_are_searchable(self):
+        self._seed('--users', '30', '--clubs', '1', '--seed', '3', '--min-club-size', '30')
+        club = Club.objects.order_by('-id').first()
+        member = club.club_members.filter(role__club_role__in=Role.IN_CLUB_ROLES).first()
+        self.assertIn(member, search_members(club, member.full_name()).members)
+
+    def test_same_seed_gives_same_data(self):
+        self._seed('--users', '20', '--clubs', '5', '--seed', '4')
+        first = list(Role.objects.order_by('club_id', 'user_id').values_list('club__club_name', 'user__username', 'club_role'))
+        Role.objects.all().delete()
+        User.objects.all().delete()
+        Club.objects.all().delete()
+        self._seed('--users', '20', '--clubs', '5', '--seed', '4')
+        second = list(Role.objects.order_by('club_id', 'user_id').values_list('club__club_name', 'user__username', 'club_role'))
+        self.assertEqual(first, second)
+
+    def test_role_mix_is_applied(self):
+        self._seed('--users', '30', '--clubs', '5', '--role-mix', 'APP=1')
+        self.assertEqual(set(Role.objects.filter(club_id__gt=4).values_list('club_role', flat=True)), {'OWN', 'APP'})
+
+    def test_invalid_role_mix(self):
+        with self.assertRaises(CommandError):
+            self._seed('--role-mix', 'OWN=1')
@@ -0,0 +1,55 @@
+"""Unit tests for the membership middleware."""
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from clubs.memberships import Memberships
+from clubs.models import User,Club
+
+class MembershipMiddlewareTestCase(TestCase):
+    """Unit tests for the membership middleware."""
+
+    fixtures = [
+        'clubs/tests/fixtures/default_user.json',
+        'clubs/tests/fixtures/default_club.json',
+        'clubs/tests/fixtures/other_clubs.json']
+
+    def setUp(self):
+        self.user = User.objects.get(username='johndoe@example.org')
+        self.club = Club.objects.get(club_name='Beatles')
+        self.applied_club = Club.objects.get(club_name='ADCD')
+        self.other_club = Club.objects.get(club_name='EliteChess')
+        self.club.club_members.add(self.user,through_defaults={'club_role':'OFF'})
+        self.applied_club.club_members.add(self.user,through_defaults={'club_role':'APP'})
+
+    def test_memberships_of_user(self):
+        with self.assertNumQueries(1):
+            memberships = Memberships(self.user)
+        self.assertEqual(memberships.get_club_role(self.club),'OFF')
+        self.assertEqual(memberships.get_club_role_by_name('ADCD'),'APP')
+        self.assertIsNone(memberships.get_club_role(self.other_club))
+        self.assertTrue(memberships.has_club('Beatles'))
+        self.assertFalse(memberships.has_club('EliteChess'))
+        self.assertEqual(memberships.get_user_club_names(),['Beatles'])
+
+    def test_memberships_of_anonymous_user(self):
+        with self.assertNumQueries(0):
+            memberships = Memberships(AnonymousUser())
+        self.assertIsNone(memberships.get_club_role(self.club))
+        self.assertEqual(memberships.get_user_club_names(),[])
+
+    def test_club_page_loads_memberships_once(self):
+        self.client.login(username=self.user.username, password='Password123')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('club_feed',kwargs={'club_name': self.club.club_name}))
+        self.assertEqual(response.status_code, 200)
+        membership_queries = [query for query in queries
+            if 'FROM "clubs_role"' in query['sql'] and f'"clubs_role"."user_id" = {self.user.id}' in query['sql']]
+        self.assertEqual(len(membership_queries), 1)
+
+    def test_menu_lists_clubs_user_is_in(self):
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.client.get(reverse('feed'))
+        self.assertContains(response, reverse('club_feed',kwargs={'club_name': 'Beatles'}))
+        self.assertNotContains(response, reverse('club_feed',kwargs={'club_name': 'ADCD'}))
@@ -0,0 +1,81 @@
+"""Unit tests for the request metrics middleware and the metrics endpoint."""
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from clubs import cache, metrics
+from clubs.models import User,Club
+import json
+import os
+import tempfile
+import threading
+
+class MetricsMiddlewareTestCase(TestCase):
+    """Unit tests for the request metrics middleware and the metrics endpoint."""
+
+    fixtures = [
+        'clubs/tests/fixtures/default_user.json',
+        'clubs/tests/fixtures/default_club.json']
+
+    def setUp(self):
+        metrics.reset()
+        cache.stats.reset()
+        self.user = User.objects.get(username='johndoe@example.org')
+        self.club = Club.objects.get(club_name='Beatles')
+        self.club.club_members.add(self.user,through_defaults={'club_role':'OWN'})
+        self.client.login(username=self.user.username, password='Password123')
+
+    def test_records_request_by_url_name(self):
+        self.client.get(reverse('club_feed', kwargs={'club_name': self.club.club_name}))
+        self.client.get(reverse('club_feed', kwargs={'club_name': self.club.club_name}))
+        stats = metrics.get_snapshot()['views']['club_feed']
+        self.assertEqual(stats['requests'], 2)
+        self.assertEqual(sum(stats['buckets']), 2)
+        self.assertGreater(stats['queries'], 0)
+        self.assertGreater(stats['query_seconds'], 0)
+        self.assertGreater(stats['template_seconds'], 0)
+        self.assertGreaterEqual(stats['seconds'], stats['template_seconds'])
+
+    def test_records_unresolved_requests(self):
+        self.client.get('/no_such_page/')
+        self.assertEqual(metrics.get_snapshot()['views']['unresolved']['requests'], 1)
+
+    def test_queries_outside_requests_are_not_recorded(self):
+        User.objects.count()
+        self.assertEqual(metrics.get_snapshot()['views'], {})
+
+    def test_merges_the_stores_of_finished_threads(self):
+        thread = threading.Thread(target=lambda: metrics.end_request(metrics.RequestMetrics(), 'feed'))
+        thread.start()
+        thread.join()
+        del thread
+        metrics.end_request(metrics.RequestMetrics(), 'feed')
+        self.assertEqual(metrics.get_snapshot()['views']['feed']['requests'], 2)
+
+    def test_endpoint_is_staff_only(self):
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_endpoint_renders_prometheus_text(self):
+        User.objects.filter(id=self.user.id).update(is_staff=True)
+        self.client.get(reverse('club_feed', kwargs={'club_name': self.club.club_name}))
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        content = response.content.decode()
+        self.assertIn('# TYPE chess_island_request_duration_seconds histogram', content)
+        self.assertIn('chess_island_request_duration_seconds_bucket{view="club_feed",le="+Inf"} 1', content)
+        self.assertIn('chess_island_request_duration_seconds_count{view="club_feed"} 1', content)
+        self.assertIn('chess_island_db_queries_total{view="club_feed"}', content)
+        self.assertIn('chess_island_template_render_seconds_total{view="club_feed"}', content)
+        self.assertIn('chess_island_cache_misses_total{namespace="fragment:', content)
+
+    def test_endpoint_adds_up_the_files_of_other_workers(self):
+        User.objects.filter(id=self.user.id).update(is_staff=True)
+        with tempfile.TemporaryDirectory() as directory:
+            metrics.end_request(metrics.RequestMetrics(), 'feed')
+            with override_settings(METRICS_DIR=directory):
+                metrics.flush()
+                os.replace(os.path.join(directory, f'{os.getpid()}.json'), os.path.join(directory, '1.json'))
+                with open(os.path.join(directory, '1.json')) as file:
+                    self.assertEqual(json.load(file)['views']['feed']['requests'], 1)
+                response = self.client.get(reverse('metrics'))
+        self.assertContains(response, 'chess_island_request_duration_seconds_count{view="feed"} 2')
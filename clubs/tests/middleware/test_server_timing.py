@@ -0,0 +1,55 @@
+"""Unit tests for the Server-Timing header of the metrics middleware."""
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from clubs.models import User,Club
+
+class ServerTimingTestCase(TestCase):
+    """Unit tests for the Server-Timing header of the metrics middleware."""
+
+    fixtures = [
+        'clubs/tests/fixtures/default_user.json',
+        'clubs/tests/fixtures/default_club.json']
+
+    def setUp(self):
+        self.user = User.objects.get(username='johndoe@example.org')
+        self.club = Club.objects.get(club_name='Beatles')
+        self.club.club_members.add(self.user,through_defaults={'club_role':'OWN'})
+        self.url = reverse('club_feed', kwargs={'club_name': self.club.club_name})
+        self.client.login(username=self.user.username, password='Password123')
+
+    def test_staff_responses_carry_server_timing(self):
+        User.objects.filter(id=self.user.id).update(is_staff=True)
+        response = self.client.get(self.url)
+        timings = self._parse(response['Server-Timing'])
+        self.assertEqual(list(timings), ['auth', 'db', 'view', 'tpl', 'total'])
+        self.assertGreater(timings['auth'][1], 0)
+        self.assertGreater(timings['db'][1], 0)
+        self.assertGreater(timings['tpl'][1], 0)
+        self.assertRegex(timings['db'][0], r'^[1-9][0-9]* queries$')
+        self.assertAlmostEqual(
+            sum(duration for name, (_, duration) in timings.items() if name != 'total'), timings['total'][1],
+            delta=0.05)
+
+    def test_no_server_timing_for_other_users(self):
+        response = self.client.get(self.url)
+        self.assertNotIn('Server-Timing', response)
+
+    @override_settings(SERVER_TIMING='all')
+    def test_server_timing_for_everyone(self):
+        self.client.logout()
+        response = self.client.get(reverse('home'))
+        self.assertIn('db;desc="0 queries";dur=0.00', response['Server-Timing'])
+
+    @override_settings(SERVER_TIMING='off')
+    def test_server_timing_off(self):
+        User.objects.filter(id=self.user.id).update(is_staff=True)
+        response = self.client.get(self.url)
+        self.assertNotIn('Server-Timing', response)
+
+    def _parse(self, header):
+        timings = {}
+        for metric in header.split(', '):
+            name, *parameters = metric.split(';')
+            parameters = dict(parameter.split('=', 1) for parameter in parameters)
+            timings[name] = (parameters.get('desc', '').strip('"'), float(parameters['dur']))
+        return timings
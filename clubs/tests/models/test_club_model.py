@@ -1,5 +1,7 @@
 """Unit tests for the Club model."""
 from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from io import StringIO
 from django.test import TestCase
 from clubs.models import Role,User,Club
 from django.core.exceptions import ObjectDoesNotExist
@@ -149,6 +151,146 @@ class ClubModelTestCase(TestCase):
         self.assertFalse(self.club.club_members.all().filter(id=member_user.id,
             club__club_name = self.club.club_name).exists())
 
+    def test_transitions_report_whether_they_applied(self):
+        member_user = User.objects.get(username='robertdoe@example.org')
+        self.club.club_members.add(member_user,through_defaults={'club_role':'MEM'})
+        self.assertTrue(self.club.toggle_officer(member_user))
+        self.assertFalse(self.club.toggle_officer(member_user))
+        self.assertFalse(self.club.ban_member(member_user))
+        self.assertTrue(self.club.toggle_member(member_user))
+        self.assertTrue(self.club.ban_member(member_user))
+        self.assertFalse(self.club.toggle_member(member_user))
+        self.assertTrue(self.club.unban_member(member_user))
+        self.assertFalse(self.club.unban_member(member_user))
+        self.assertFalse(self.club.is_user_in_club(member_user))
+
+    def test_toggle_officer_must_not_demote_owner(self):
+        owner_user = User.objects.get(username='robertdoe@example.org')
+        self.club.club_members.add(owner_user,through_defaults={'club_role':'OWN'})
+        self.assertFalse(self.club.toggle_officer(owner_user))
+        self.assertEqual(self.club.get_club_role(owner_user),'OWN')
+
+    def test_transfer_ownership_requires_current_owner(self):
+        officer_user = User.objects.get(username='robertdoe@example.org')
+        other_officer_user = User.objects.get(username='bobdoe@example.org')
+        self.club.club_members.add(officer_user,through_defaults={'club_role':'OFF'})
+        self.club.club_members.add(other_officer_user,through_defaults={'club_role':'OFF'})
+        self.assertFalse(self.club.transfer_ownership(officer_user,other_officer_user))
+        self.assertEqual(self.club.get_club_role(officer_user),'OFF')
+        self.assertEqual(self.club.get_club_role(other_officer_user),'OFF')
+
+    def test_transfer_ownership_is_rolled_back_when_new_owner_is_not_officer(self):
+        owner_user = User.objects.get(username='robertdoe@example.org')
+        member_user = User.objects.get(username='bobdoe@example.org')
+        self.club.club_members.add(owner_user,through_defaults={'club_role':'OWN'})
+        self.club.club_members.add(member_user,through_defaults={'club_role':'MEM'})
+        self.assertFalse(self.club.transfer_ownership(owner_user,member_user))
+        self.assertEqual(self.club.get_club_role(owner_user),'OWN')
+
+    def test_bulk_ban_members_only_bans_members(self):
+        member_user = User.objects.get(username='robertdoe@example.org')
+        officer_user = User.objects.get(username='bobdoe@example.org')
+        self.club.club_members.add(member_user,through_defaults={'club_role':'MEM'})
+        self.club.club_members.add(officer_user,through_defaults={'club_role':'OFF'})
+        banned = self.club.bulk_ban_members([member_user.id,officer_user.id,self.user.id])
+        self.assertEqual(banned,{member_user.id})
+        self.assertEqual(self.club.get_club_role(member_user),'BAN')
+        self.assertEqual(self.club.get_club_role(officer_user),'OFF')
+
+    def test_bulk_reject_applicants_only_removes_applicants(self):
+        applicant_user = User.objects.get(username='robertdoe@example.org')
+        member_user = User.objects.get(username='bobdoe@example.org')
+        self.club.club_members.add(applicant_user,through_defaults={'club_role':'APP'})
+        self.club.club_members.add(member_user,through_defaults={'club_role':'MEM'})
+        rejected = self.club.bulk_reject_applicants([applicant_user.id,member_user.id])
+        self.assertEqual(rejected,{applicant_user.id})
+        self.assertFalse(self.club.is_user_in_club(applicant_user))
+        self.assertEqual(self.club.get_club_role(member_user),'MEM')
+
+    def test_role_counters_follow_club_methods(self):
+        users = list(User.objects.exclude(id=self.user.id)[:3])
+        self.club.club_members.add(self.user,through_defaults={'club_role':'OWN'})
+        for user in users:
+            self.club.club_members.add(user,through_defaults={'club_role':'APP'})
+        self._assert_counts(member=1, officer=0, applicant=3, banned=0)
+        self.club.toggle_member(users[0])
+        self.club.toggle_officer(users[0])
+        self._assert_counts(member=2, officer=1, applicant=2, banned=0)
+        self.club.bulk_accept_applicants([users[1].id, users[2].id])
+        self.club.ban_member(users[1])
+        self._assert_counts(member=3, officer=1, applicant=0, banned=1)
+        self.club.transfer_ownership(self.user, users[0])
+        self._assert_counts(member=3, officer=1, applicant=0, banned=1)
+        self.club.unban_member(users[1])
+        self.club.remove_user_from_club(users[2])
+        self._assert_counts(member=2, officer=1, applicant=0, banned=0)
+
+    def test_role_counters_are_unchanged_by_transitions_that_do_not_apply(self):
+        self.club.club_members.add(self.user,through_defaults={'club_role':'APP'})
+        self.club.ban_member(self.user)
+        self.club.unban_member(self.user)
+        self.club.bulk_promote_members([self.user.id])
+        self._assert_counts(member=0, officer=0, applicant=1, banned=0)
+
+    def test_role_counters_follow_saved_and_deleted_roles(self):
+        role = Role.objects.create(club=self.club, user=self.user, club_role='APP')
+        self._assert_counts(member=0, officer=0, applicant=1, banned=0)
+        role = Role.objects.get(id=role.id)
+        role.club_role = 'OFF'
+        role.save()
+        self._assert_counts(member=1, officer=1, applicant=0, banned=0)
+        role.delete()
+        self._assert_counts(member=0, officer=0, applicant=0, banned=0)
+
+    def test_role_counters_follow_removed_members_and_deleted_users(self):
+        other_user = User.objects.exclude(id=self.user.id).first()
+        self.club.club_members.add(self.user,through_defaults={'club_role':'MEM'})
+        self.club.club_members.add(other_user,through_defaults={'club_role':'BAN'})
+        self.club.club_members.remove(self.user)
+        self._assert_counts(member=0, officer=0, applicant=0, banned=1)
+        other_user.delete()
+        self._assert_counts(member=0, officer=0, applicant=0, banned=0)
+
+    def test_role_counters_follow_removed_and_cleared_members(self):
+        users = list(User.objects.all()[:3])
+        self.club.club_members.add(*users,through_defaults={'club_role':'MEM'})
+        self.club.club_members.remove(users[0])
+        self._assert_counts(member=2, officer=0, applicant=0, banned=0)
+        self._assert_recount_repairs_nothing()
+        users[1].club_set.remove(self.club)
+        self._assert_counts(member=1, officer=0, applicant=0, banned=0)
+        self._assert_recount_repairs_nothing()
+        self.club.club_members.clear()
+        self._assert_counts(member=0, officer=0, applicant=0, banned=0)
+        self._assert_recount_repairs_nothing()
+
+    def test_saving_stale_club_keeps_role_counters(self):
+        stale_club = Club.objects.get(id=self.club.id)
+        self.club.club_members.add(self.user,through_defaults={'club_role':'MEM'})
+        stale_club.description = 'New description'
+        stale_club.save()
+        self._assert_counts(member=1, officer=0, applicant=0, banned=0)
+        self.assertEqual(Club.objects.get(id=self.club.id).description, 'New description')
+
+    def test_recount_clubs_repairs_drift(self):
+        Role.objects.bulk_create([Role(club=self.club, user=user, club_role='MEM') for user in User.objects.all()])
+        Club.objects.filter(id=self.club.id).update(applicant_count=7)
+        output = StringIO()
+        call_command('recount_clubs', chunk_size=2, stdout=output)
+        self._assert_counts(member=User.objects.count(), officer=0, applicant=0, banned=0)
+        self.assertIn('repaired the counters of 1', output.getvalue())
+
+    def _assert_recount_repairs_nothing(self):
+        output = StringIO()
+        call_command('recount_clubs', stdout=output)
+        self.assertIn('repaired the counters of 0', output.getvalue())
+
+    def _assert_counts(self, member, officer, applicant, banned):
+        club = Club.objects.get(id=self.club.id)
+        self.assertEqual(
+            (club.member_count, club.officer_count, club.applicant_count, club.banned_count),
+            (member, officer, applicant, banned))
+
     def _assert_club_is_valid(self):
         try:
             self.club.full_clean()
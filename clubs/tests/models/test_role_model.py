@@ -1,5 +1,6 @@
 """Unit tests for the Member model."""
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
 from django.test import TestCase
 from clubs.models import Role,Club,User
 
@@ -33,6 +34,26 @@ class RoleModelTestCase(TestCase):
     def test_get_club_role(self):
         self.assertEqual(self.role.get_club_role(),'Member')
 
+    def test_user_may_only_have_one_role_per_club(self):
+        self.role.save()
+        with self.assertRaises(IntegrityError):
+            with transaction.atomic():
+                Role.objects.create(user = self.user, club = self.club, club_role = 'APP')
+        self.assertEqual(Role.objects.filter(user = self.user, club = self.club).count(), 1)
+
+    def test_club_may_only_have_one_owner(self):
+        other_user = User.objects.get(username='janedoe@example.org')
+        Role.objects.create(user = self.user, club = self.club, club_role = 'OWN')
+        with self.assertRaises(IntegrityError):
+            with transaction.atomic():
+                Role.objects.create(user = other_user, club = self.club, club_role = 'OWN')
+
+    def test_clubs_may_have_different_owners(self):
+        other_club = Club.objects.get(club_name='ADCD')
+        Role.objects.create(user = self.user, club = self.club, club_role = 'OWN')
+        Role.objects.create(user = self.user, club = other_club, club_role = 'OWN')
+        self.assertEqual(Role.objects.filter(user = self.user, club_role = 'OWN').count(), 2)
+
     def _assert_role_is_valid(self):
         try:
             self.role.full_clean()
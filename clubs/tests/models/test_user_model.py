@@ -1,6 +1,10 @@
 """Unit tests for the User model."""
 from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.template import Context, Template
 from django.test import TestCase
+from hashlib import md5
+from io import StringIO
 from clubs.models import User,Club,Role
 
 class UserModelTestCase(TestCase):
@@ -134,6 +138,35 @@ class UserModelTestCase(TestCase):
         clubs = self.user.get_user_clubs()
         self.assertEqual(clubs.count(),3)
         
+    def test_gravatar_hash_is_stored_from_normalised_email(self):
+        user = User.objects.create_user(' Ann.Smith@Example.org ', first_name='Ann', last_name='Smith')
+        self.assertEqual(user.gravatar_hash, md5(b'ann.smith@example.org').hexdigest())
+        self.assertEqual(user.mini_gravatar(),
+            f'https://www.gravatar.com/avatar/{user.gravatar_hash}?size=60&default=mp')
+
+    def test_gravatar_hash_follows_username_changes(self):
+        self.user.username = 'johnny@example.org'
+        self.user.save(update_fields=['username'])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.gravatar_hash, md5(b'johnny@example.org').hexdigest())
+
+    def test_gravatar_hash_prefers_email_when_set(self):
+        self.user.email = 'other@example.org'
+        self.user.save()
+        self.assertEqual(self.user.gravatar_hash, md5(b'other@example.org').hexdigest())
+
+    def test_avatar_url_tag_uses_stored_hash(self):
+        User.objects.filter(id=self.user.id).update(gravatar_hash='0' * 32)
+        user = User.objects.get(id=self.user.id)
+        rendered = Template('{% load avatars %}{% avatar_url user 80 %}').render(Context({'user': user}))
+        self.assertEqual(rendered, f'/avatar/{"0" * 32}/120/')
+
+    def test_backfill_gravatar_hashes(self):
+        User.objects.update(gravatar_hash='')
+        call_command('backfill_gravatar_hashes', chunk_size=2, stdout=StringIO())
+        for user in User.objects.all():
+            self.assertEqual(user.gravatar_hash, md5(user.username.encode()).hexdigest())
+
     def _assert_user_is_valid(self):
         try:
             self.user.full_clean()
@@ -0,0 +1,67 @@
+"""Unit tests for keyset pagination."""
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from clubs.models import User
+from clubs.pagination import KeysetPaginator
+from django.utils.http import urlsafe_base64_encode
+import json
+
+class KeysetPaginatorTestCase(TestCase):
+    """Unit tests for keyset pagination."""
+
+    def setUp(self):
+        """Users with equal last names, so pages must break ties by first name and pk"""
+        for number, (first_name, last_name) in enumerate([
+                ('Ann', 'Doe'), ('Bob', 'Doe'), ('Bob', 'Doe'), ('Cat', 'Doe'),
+                ('Ann', 'Roe'), ('Dan', 'Abbot'), ('Eve', 'Zeta')]):
+            User.objects.create(username=f'user{number}@example.org', first_name=first_name, last_name=last_name)
+        self.ordering = ('last_name', 'first_name', 'id')
+        self.expected = list(User.objects.order_by(*self.ordering))
+        self.paginator = KeysetPaginator(User.objects.all(), self.ordering, 2)
+
+    def test_first_page(self):
+        page = self.paginator.get_page()
+        self.assertEqual(page.object_list, self.expected[:2])
+        self.assertTrue(page.has_next)
+        self.assertFalse(page.has_previous)
+
+    def test_next_cursors_walk_every_object_once_in_order(self):
+        page = self.paginator.get_page()
+        seen = list(page.object_list)
+        while page.has_next:
+            page = self.paginator.get_page(page.next_cursor)
+            self.assertTrue(page.has_previous)
+            seen += page.object_list
+        self.assertEqual(seen, self.expected)
+
+    def test_previous_cursor_returns_previous_page(self):
+        second = self.paginator.get_page(self.paginator.get_page().next_cursor)
+        third = self.paginator.get_page(second.next_cursor)
+        self.assertEqual(self.paginator.get_page(third.previous_cursor).object_list, second.object_list)
+        first = self.paginator.get_page(second.previous_cursor)
+        self.assertEqual(first.object_list, self.expected[:2])
+        self.assertFalse(first.has_previous)
+        self.assertTrue(first.has_next)
+
+    def test_last_page_has_no_next_page(self):
+        paginator = KeysetPaginator(User.objects.all(), self.ordering, 7)
+        page = paginator.get_page()
+        self.assertEqual(page.object_list, self.expected)
+        self.assertFalse(page.has_next)
+
+    def test_invalid_cursor_returns_first_page(self):
+        for cursor in ['garbage', 'W10', 'WyJ4IiwxXQ']:
+            self.assertEqual(self.paginator.get_page(cursor).object_list, self.expected[:2])
+
+    def test_cursor_with_values_of_wrong_type_returns_first_page(self):
+        for values in [['x', 'abc', 'abc'], ['x', 'y', None], ['x', 'y', 2 ** 70], ['x' * 60, 'y', 1]]:
+            cursor = urlsafe_base64_encode(json.dumps(['n', values]).encode())
+            self.assertEqual(self.paginator.get_page(cursor).object_list, self.expected[:2])
+
+    def test_deep_page_uses_seek_instead_of_offset(self):
+        cursor = self.paginator.get_page(self.paginator.get_page().next_cursor).next_cursor
+        with CaptureQueriesContext(connection) as queries:
+            self.paginator.get_page(cursor)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('OFFSET', queries[0]['sql'])
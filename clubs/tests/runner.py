@@ -0,0 +1,23 @@
+from django.core.cache import caches
+from django.test.runner import DiscoverRunner
+import unittest
+
+class CacheClearingTestResult(unittest.TextTestResult):
+    """Test result that clears every cache before each test.
+
+    Test transactions are rolled back without sending the signals that invalidate
+    cached memberships, so entries cached by one test must not leak into the next."""
+
+    def startTest(self, test):
+        for cache in caches.all():
+            cache.clear()
+        super().startTest(test)
+
+class TestRunner(DiscoverRunner):
+    """Test runner for the project, isolating the cache between tests."""
+
+    def get_resultclass(self):
+        resultclass = super().get_resultclass()
+        if resultclass is None:
+            return CacheClearingTestResult
+        return type('CacheClearing' + resultclass.__name__, (CacheClearingTestResult, resultclass), {})
@@ -0,0 +1,116 @@
+"""Unit tests for member search."""
+from django.test import TestCase, override_settings
+from clubs.models import User,Club
+from clubs.search import normalise, search_members, get_member_search_index, Fts5MemberSearchIndex, TokenMemberSearchIndex
+
+class NormaliseTestCase(TestCase):
+    """Unit tests for name normalisation."""
+
+    def test_folds_accents_and_case(self):
+        self.assertEqual(normalise('Zoë  ÉLODIE-Núñez'), ['zoe', 'elodie', 'nunez'])
+
+    def test_drops_punctuation(self):
+        self.assertEqual(normalise('"O\'Brien" *'), ['o', 'brien'])
+
+
+class MemberSearchTests:
+    """Unit tests shared by every member search backend."""
+
+    fixtures = [
+        'clubs/tests/fixtures/default_user.json',
+        'clubs/tests/fixtures/other_users.json',
+        'clubs/tests/fixtures/default_club.json',
+        'clubs/tests/fixtures/other_clubs.json']
+
+    def setUp(self):
+        self.club = Club.objects.get(club_name='Beatles')
+        self.other_club = Club.objects.exclude(id=self.club.id).first()
+        self.owner = User.objects.get(username='johndoe@example.org')
+        self.member = User.objects.get(username='bobdoe@example.org')
+        self.member.first_name = 'Zoë'
+        self.member.last_name = 'Núñez'
+        self.member.save()
+        self.applicant = User.objects.get(username='janedoe@example.org')
+        self.club.club_members.add(self.owner,through_defaults={'club_role':'OWN'})
+        self.club.club_members.add(self.member,through_defaults={'club_role':'MEM'})
+        self.club.club_members.add(self.applicant,through_defaults={'club_role':'APP'})
+
+    def test_index_backend(self):
+        self.assertIsInstance(get_member_search_index(), self.index_class)
+
+    def test_search_ignores_accents_and_case(self):
+        self.assertEqual(search_members(self.club, 'zoe NUNEZ').members, [self.member])
+        self.assertEqual(search_members(self.club, 'Núñez').members, [self.member])
+
+    def test_search_matches_prefixes(self):
+        self.assertEqual(search_members(self.club, 'nu').members, [self.member])
+        self.assertEqual(search_members(self.club, 'nux').members, [])
+
+    def test_search_requires_every_term(self):
+        self.assertEqual(search_members(self.club, 'zoe doe').members, [])
+
+    def test_search_is_scoped_to_club_members(self):
+        self.assertEqual(search_members(self.club, 'jane').members, [])
+        self.other_club.club_members.add(self.member,through_defaults={'club_role':'MEM'})
+        self.assertEqual(search_members(self.other_club, 'zoe').members, [self.member])
+        self.assertEqual(search_members(self.other_club, 'john').members, [])
+
+    def test_search_follows_renamed_and_deleted_users(self):
+        self.member.first_name = 'Ringo'
+        self.member.save()
+        self.assertEqual(search_members(self.club, 'zoe').members, [])
+        self.assertEqual(search_members(self.club, 'ringo').members, [self.member])
+        self.member.delete()
+        self.assertEqual(search_members(self.club, 'ringo').members, [])
+
+    def test_saves_of_other_fields_leave_the_index_alone(self):
+        with self.assertNumQueries(1):
+            self.member.save(update_fields=['last_login'])
+        self.member.first_name = 'Ringo'
+        self.member.save(update_fields=['first_name'])
+        self.assertEqual(search_members(self.club, 'ringo').members, [self.member])
+
+    def test_empty_query_finds_nobody(self):
+        results = search_members(self.club, ' !? ')
+        self.assertEqual(results.members, [])
+        self.assertFalse(results.has_next)
+
+    def test_search_results_are_paginated(self):
+        for number in range(5):
+            user = User.objects.create_user(f'paged{number}@example.org', first_name='Paged',
+                last_name=f'Player{number}', password='Password123')
+            self.club.club_members.add(user,through_defaults={'club_role':'MEM'})
+        first = search_members(self.club, 'paged', page=1, page_size=2)
+        second = search_members(self.club, 'paged', page=2, page_size=2)
+        third = search_members(self.club, 'paged', page=3, page_size=2)
+        self.assertTrue(first.has_next)
+        self.assertFalse(first.has_previous)
+        self.assertTrue(second.has_next)
+        self.assertFalse(third.has_next)
+        self.assertTrue(third.has_previous)
+        found = first.members + second.members + third.members
+        self.assertEqual(len(found), 5)
+        self.assertEqual(len(set(found)), 5)
+
+    def test_exact_word_matches_rank_first(self):
+        prefix_match = User.objects.create_user('annabel@example.org', first_name='Annabel',
+            last_name='Smith', password='Password123')
+        exact_match = User.objects.create_user('ann@example.org', first_name='Ann',
+            last_name='Smith', password='Password123')
+        self.club.club_members.add(prefix_match,through_defaults={'club_role':'MEM'})
+        self.club.club_members.add(exact_match,through_defaults={'club_role':'MEM'})
+        self.assertEqual(search_members(self.club, 'ann').members, [exact_match, prefix_match])
+
+
+@override_settings(MEMBER_SEARCH_BACKEND='fts5')
+class Fts5MemberSearchTestCase(MemberSearchTests, TestCase):
+    """Unit tests for member search backed by SQLite FTS5."""
+
+    index_class = Fts5MemberSearchIndex
+
+
+@override_settings(MEMBER_SEARCH_BACKEND='tokens')
+class TokenMemberSearchTestCase(MemberSearchTests, TestCase):
+    """Unit tests for member search backed by the normalised token table."""
+
+    index_class = TokenMemberSearchIndex
@@ -0,0 +1,72 @@
+"""Unit tests for member typeahead prefix indexes."""
+from django.test import TestCase, override_settings
+from clubs.models import User,Club
+from clubs.typeahead import MemberPrefixIndex, MemberPrefixIndexes
+
+class MemberPrefixIndexTestCase(TestCase):
+    """Unit tests for a club's member prefix index."""
+
+    def setUp(self):
+        self.index = MemberPrefixIndex([
+            (1, 'John', 'Doe'),
+            (2, 'Jo', 'Núñez'),
+            (3, 'Jane', 'Johnson'),
+        ])
+
+    def test_matches_prefix_of_any_word(self):
+        self.assertEqual(self.index.search('jo', 10), [(2, 'Jo Núñez'), (1, 'John Doe'), (3, 'Jane Johnson')])
+        self.assertEqual(self.index.search('john', 10), [(1, 'John Doe'), (3, 'Jane Johnson')])
+
+    def test_matches_full_name_prefix(self):
+        self.assertEqual(self.index.search('John D', 10), [(1, 'John Doe')])
+
+    def test_ignores_accents_and_case(self):
+        self.assertEqual(self.index.search('NUN', 10), [(2, 'Jo Núñez')])
+
+    def test_respects_limit(self):
+        self.assertEqual(len(self.index.search('j', 2)), 2)
+
+    def test_empty_query_matches_nobody(self):
+        self.assertEqual(self.index.search(' ', 10), [])
+        self.assertEqual(self.index.search('x', 10), [])
+
+
+class MemberPrefixIndexesTestCase(TestCase):
+    """Unit tests for the per-process registry of member prefix indexes."""
+
+    fixtures = [
+        'clubs/tests/fixtures/default_user.json',
+        'clubs/tests/fixtures/other_users.json',
+        'clubs/tests/fixtures/default_club.json',
+        'clubs/tests/fixtures/other_clubs.json']
+
+    def setUp(self):
+        self.indexes = MemberPrefixIndexes()
+        self.club = Club.objects.get(club_name='Beatles')
+        self.owner = User.objects.get(username='johndoe@example.org')
+        self.applicant = User.objects.get(username='janedoe@example.org')
+        self.club.club_members.add(self.owner,through_defaults={'club_role':'OWN'})
+        self.club.club_members.add(self.applicant,through_defaults={'club_role':'APP'})
+
+    def test_index_is_reused_until_roles_change(self):
+        index = self.indexes.get(self.club)
+        self.assertEqual(len(index), 1)
+        with self.assertNumQueries(0):
+            self.assertIs(self.indexes.get(self.club), index)
+        self.club.toggle_member(self.applicant)
+        index = self.indexes.get(self.club)
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.search('jane', 10), [(self.applicant.id, 'Jane Doe')])
+
+    def test_index_is_rebuilt_when_member_is_renamed(self):
+        self.indexes.get(self.club)
+        self.owner.first_name = 'Ringo'
+        self.owner.save()
+        self.assertEqual(self.indexes.get(self.club).search('ringo', 10), [(self.owner.id, 'Ringo Doe')])
+
+    @override_settings(MEMBER_TYPEAHEAD_MAX_CLUBS=1)
+    def test_least_recently_used_index_is_evicted(self):
+        other_club = Club.objects.exclude(id=self.club.id).first()
+        index = self.indexes.get(self.club)
+        self.indexes.get(other_club)
+        self.assertIsNot(self.indexes.get(self.club), index)
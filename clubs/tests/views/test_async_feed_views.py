@@ -0,0 +1,127 @@
+"""Unit tests for the async feed views served through the ASGI entry point"""
+
+from asgiref.sync import sync_to_async
+from django.test import TransactionTestCase, override_settings
+from django.urls import resolve, reverse
+from clubs import cache, views
+from clubs.models import User,Club
+from clubs.tests.helpers import reverse_with_next
+
+class AsyncFeedViewsTestCase(TransactionTestCase):
+    """Unit tests for the async feed views served through the ASGI entry point.
+
+    The views read in the database read pool, whose connections only see committed rows,
+    so the tests do not run in a transaction."""
+
+    fixtures = [
+        'clubs/tests/fixtures/default_user.json',
+        'clubs/tests/fixtures/other_users.json',
+        'clubs/tests/fixtures/default_club.json',
+        'clubs/tests/fixtures/other_clubs.json']
+
+    def setUp(self):
+        self.user = User.objects.get(username='johndoe@example.org')
+        self.member = User.objects.get(username='janedoe@example.org')
+        self.officer = User.objects.get(username='robertdoe@example.org')
+        self.owner = User.objects.get(username='patrickdoe@example.org')
+        self.club = Club.objects.get(club_name='EliteChess')
+        self.club.club_members.add(self.user,through_defaults={'club_role':'APP'})
+        self.club.club_members.add(self.member,through_defaults={'club_role':'MEM'})
+        self.club.club_members.add(self.officer,through_defaults={'club_role':'OFF'})
+        self.club.club_members.add(self.owner,through_defaults={'club_role':'OWN'})
+        self.url = reverse('club_feed',kwargs={'club_name': self.club.club_name})
+
+    def test_asgi_urlconf_serves_async_feeds(self):
+        self.assertEqual(resolve('/feed/', 'chess-island.asgi_urls').func, views.feed_async)
+        self.assertEqual(resolve(self.url, 'chess-island.asgi_urls').func, views.club_feed_async)
+
+    async def test_get_feed(self):
+        await self._log_in(self.member)
+        response = await self.async_client.get(reverse('feed'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'feed.html')
+        self.assertEqual([club.club_name for club in response.context['user_clubs']], ['EliteChess'])
+
+    async def test_get_feed_redirects_when_not_logged_in(self):
+        response = await self.async_client.get(reverse('feed'))
+        self.assertRedirects(response, reverse_with_next('log_in', reverse('feed')), fetch_redirect_response=False)
+
+    async def test_get_club_feed_as_member(self):
+        await self._log_in(self.member)
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'club_feed.html')
+        self.assertEqual(response.context['club'].id, self.club.id)
+        self.assertEqual(response.context['roster_view'], 'member')
+        self.assertEqual([user.id for user in response.context['owner']], [self.owner.id])
+        self.assertEqual([user.id for user in response.context['officers']], [self.officer.id])
+        self.assertEqual([user.id for user in response.context['members']], [self.member.id])
+        self.assertEqual(response.context['number_of_applicants'], 1)
+        self.assertContains(response, self.owner.first_name)
+
+    async def test_get_club_feed_as_officer(self):
+        await self._log_in(self.officer)
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['roster_view'], 'staff')
+        self.assertContains(response, '<th scope="col">Email</th>')
+
+    async def test_get_club_feed_matches_sync_view(self):
+        await self._log_in(self.member)
+        sync_response = await sync_to_async(self.client.get)(self.url)
+        await sync_to_async(cache.invalidate_club)(self.club.id)
+        response = await self.async_client.get(self.url)
+        self.assertEqual(
+            [user.id for user in response.context['members']], [user.id for user in sync_response.context['members']])
+        self.assertEqual(response.context['user_role'], sync_response.context['user_role'])
+
+    @override_settings(ROSTER_PAGE_SIZE=1)
+    async def test_get_club_feed_pages_members_with_cursor(self):
+        await self._log_in(self.member)
+        other_member = await sync_to_async(User.objects.get)(username='samdoe@example.org')
+        await sync_to_async(self.club.club_members.add)(other_member, through_defaults={'club_role':'MEM'})
+        response = await self.async_client.get(self.url)
+        page = response.context['members_page']
+        self.assertTrue(page.has_next)
+        response = await self.async_client.get(self.url + page.next_url)
+        self.assertTrue(response.context['members_page'].has_previous)
+        self.assertEqual(len(response.context['members']), 1)
+        self.assertEqual(list(response.context['owner']), [])
+        self.assertEqual(list(response.context['officers']), [])
+
+    async def test_get_club_feed_with_cached_roster(self):
+        await self._log_in(self.member)
+        cache.stats.reset()
+        await self.async_client.get(self.url)
+        response = await self.async_client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(cache.stats.get('fragment:club_feed_table'), {'hits': 1, 'misses': 1})
+        self.assertContains(response, self.member.first_name)
+        self.assertContains(response, 'name="csrfmiddlewaretoken"')
+
+    async def test_get_club_feed_shares_cached_roster_across_query_parameters(self):
+        await self._log_in(self.member)
+        cache.stats.reset()
+        await self.async_client.get(self.url + '?a=1')
+        response = await self.async_client.get(self.url + '?a=2')
+        self.assertEqual(cache.stats.get('fragment:club_feed_table'), {'hits': 1, 'misses': 1})
+        self.assertContains(response, self.member.first_name)
+
+    async def test_get_club_feed_answers_conditional_get(self):
+        await self._log_in(self.member)
+        response = await self.async_client.get(self.url)
+        response = await self.async_client.get(self.url, **{'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    async def test_get_club_feed_redirects_applicant(self):
+        await self._log_in(self.user)
+        response = await self.async_client.get(self.url)
+        self.assertRedirects(response, reverse('feed'), fetch_redirect_response=False)
+
+    async def test_get_club_feed_redirects_when_not_logged_in(self):
+        response = await self.async_client.get(self.url)
+        self.assertRedirects(response, reverse_with_next('log_in', self.url), fetch_redirect_response=False)
+
+    async def _log_in(self, user):
+        await sync_to_async(self.client.login)(username=user.username, password='Password123')
+        self.async_client.cookies = self.client.cookies
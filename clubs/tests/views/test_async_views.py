@@ -0,0 +1,93 @@
+"""Unit tests for the async views served through the ASGI entry point"""
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.hashers import check_password
+from django.test import TestCase
+from django.urls import resolve, reverse
+from django.utils.http import urlencode
+from clubs import views
+from clubs.models import User
+from clubs.tests.helpers import reverse_with_next
+
+class AsyncViewsTestCase(TestCase):
+    """Unit tests for the async views served through the ASGI entry point."""
+
+    fixtures = ['clubs/tests/fixtures/default_user.json']
+
+    def setUp(self):
+        self.user = User.objects.get(username='johndoe@example.org')
+
+    def test_asgi_urlconf_serves_async_views(self):
+        self.assertEqual(resolve('/log_in/', 'chess-island.asgi_urls').func, views.log_in_async)
+        self.assertEqual(resolve('/sign_up/', 'chess-island.asgi_urls').func, views.sign_up_async)
+        self.assertEqual(resolve('/password/', 'chess-island.asgi_urls').func, views.password_async)
+        self.assertEqual(resolve('/feed/', 'chess-island.asgi_urls').url_name, 'feed')
+
+    async def test_log_in_with_valid_credentials(self):
+        response = await self._post(reverse('log_in'), {'username': self.user.username, 'password': 'Password123'})
+        self.assertRedirects(response, reverse('feed'), fetch_redirect_response=False)
+        self.assertTrue(await self._is_logged_in())
+
+    async def test_log_in_with_invalid_credentials(self):
+        for username in (self.user.username, 'nobody@example.org'):
+            response = await self._post(reverse('log_in'), {'username': username, 'password': 'WrongPassword123'})
+            self.assertEqual(response.status_code, 200)
+            self.assertTemplateUsed(response, 'log_in.html')
+            self.assertFalse(await self._is_logged_in())
+
+    async def test_log_in_redirects_to_next(self):
+        response = await self._post(reverse('log_in'), {
+            'username': self.user.username, 'password': 'Password123', 'next': reverse('profile')})
+        self.assertRedirects(response, reverse('profile'), fetch_redirect_response=False)
+
+    async def test_log_in_rejects_other_methods(self):
+        response = await self.async_client.put(reverse('log_in'))
+        self.assertEqual(response.status_code, 405)
+
+    async def test_sign_up(self):
+        response = await self._post(reverse('sign_up'), {
+            'first_name': 'Jane', 'last_name': 'Doe', 'username': 'janedoe@example.org', 'bio': 'My bio',
+            'chess_experience_level': 1, 'new_password': 'Password123', 'password_confirmation': 'Password123'})
+        self.assertRedirects(response, reverse('feed'), fetch_redirect_response=False)
+        user = await sync_to_async(User.objects.get)(username='janedoe@example.org')
+        self.assertTrue(check_password('Password123', user.password))
+        self.assertEqual(user.bio, 'My bio')
+        self.assertTrue(await self._is_logged_in())
+
+    async def test_sign_up_with_invalid_data(self):
+        response = await self._post(reverse('sign_up'), {
+            'first_name': 'John', 'last_name': 'Doe', 'username': self.user.username, 'bio': '',
+            'chess_experience_level': 1, 'new_password': 'Password123', 'password_confirmation': 'Password123'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['form'].errors)
+
+    async def test_change_password(self):
+        await sync_to_async(self.client.login)(username=self.user.username, password='Password123')
+        self.async_client.cookies = self.client.cookies
+        response = await self._post(reverse('password'), {
+            'password': 'Password123', 'new_password': 'NewPassword123', 'password_confirmation': 'NewPassword123'})
+        self.assertRedirects(response, reverse('feed'), fetch_redirect_response=False)
+        await sync_to_async(self.user.refresh_from_db)()
+        self.assertTrue(check_password('NewPassword123', self.user.password))
+        self.assertTrue(await self._is_logged_in())
+
+    async def test_change_password_with_wrong_current_password(self):
+        await sync_to_async(self.client.login)(username=self.user.username, password='Password123')
+        self.async_client.cookies = self.client.cookies
+        response = await self._post(reverse('password'), {
+            'password': 'WrongPassword123', 'new_password': 'NewPassword123', 'password_confirmation': 'NewPassword123'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('password', response.context['form'].errors)
+        await sync_to_async(self.user.refresh_from_db)()
+        self.assertTrue(check_password('Password123', self.user.password))
+
+    async def test_change_password_redirects_when_not_logged_in(self):
+        response = await self.async_client.get(reverse('password'))
+        self.assertRedirects(response, reverse_with_next('log_in', reverse('password')), fetch_redirect_response=False)
+
+    async def _post(self, url, data):
+        """Post form encoded data, as the async test client of Django 3.2 cannot send multipart bodies"""
+        return await self.async_client.post(url, urlencode(data), content_type='application/x-www-form-urlencoded')
+
+    async def _is_logged_in(self):
+        return await sync_to_async(lambda: '_auth_user_id' in self.async_client.session.keys())()
@@ -0,0 +1,128 @@
+"""Tests of the avatar view."""
+import os
+import shutil
+import tempfile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from clubs.avatars import AvatarFetchError, prune_cache
+from clubs.models import User
+
+GRAVATAR_HASH = 'b' * 32
+PNG = b'\x89PNG\r\n\x1a\nstand-in'
+
+
+class StandInFetcher:
+    """Fetcher answering from a dictionary instead of Gravatar, recording every fetch."""
+
+    avatars = {}
+    fetches = []
+    unavailable = False
+
+    def fetch(self, gravatar_hash, size):
+        StandInFetcher.fetches.append((gravatar_hash, size))
+        if StandInFetcher.unavailable:
+            raise AvatarFetchError('upstream unavailable')
+        return StandInFetcher.avatars.get(gravatar_hash)
+
+
+class AvatarViewTestCase(TestCase):
+    """Tests of the avatar view."""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            AVATAR_CACHE_DIR=self.cache_dir,
+            AVATAR_FETCHER='clubs.tests.views.test_avatar_view.StandInFetcher',
+            AVATAR_SIZE_BUCKETS=(60, 120))
+        self.settings_override.enable()
+        StandInFetcher.avatars = {GRAVATAR_HASH: ('image/png', PNG)}
+        StandInFetcher.fetches = []
+        StandInFetcher.unavailable = False
+        self.url = reverse('avatar',kwargs={'gravatar_hash': GRAVATAR_HASH, 'size': 60})
+        user = User.objects.create(username='avatar@example.org', first_name='Ava', last_name='Tar')
+        User.objects.filter(id=user.id).update(gravatar_hash=GRAVATAR_HASH)
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.cache_dir)
+
+    def test_avatar_url(self):
+        self.assertEqual(self.url,f'/avatar/{GRAVATAR_HASH}/60/')
+
+    def test_avatar_is_fetched_once_and_served_from_disk(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertEqual(b''.join(response.streaming_content), PNG)
+        self.assertIn('max-age=86400', response['Cache-Control'])
+        self.assertIn('public', response['Cache-Control'])
+        self.assertTrue(response.has_header('ETag'))
+        self.assertTrue(response.has_header('Last-Modified'))
+        self.assertTrue(os.path.exists(os.path.join(self.cache_dir, '60', 'bb', f'{GRAVATAR_HASH}.png')))
+        self.client.get(self.url)
+        self.assertEqual(StandInFetcher.fetches, [(GRAVATAR_HASH, 60)])
+
+    def test_sizes_are_bucketed(self):
+        response = self.client.get(reverse('avatar',kwargs={'gravatar_hash': GRAVATAR_HASH, 'size': 90}))
+        self.assertEqual(response.status_code, 200)
+        self.client.get(reverse('avatar',kwargs={'gravatar_hash': GRAVATAR_HASH, 'size': 500}))
+        self.assertEqual(StandInFetcher.fetches, [(GRAVATAR_HASH, 120)])
+
+    def test_matching_etag_returns_not_modified(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_unmodified_since_returns_not_modified(self):
+        last_modified = self.client.get(self.url)['Last-Modified']
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_default_avatar_is_generated_when_there_is_no_avatar(self):
+        StandInFetcher.avatars = {}
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/svg+xml')
+        self.assertIn(b'<svg', b''.join(response.streaming_content))
+        self.assertIn('max-age=86400', response['Cache-Control'])
+
+    @override_settings(AVATAR_CACHE_TIMEOUT=0)
+    def test_stale_avatar_is_served_when_upstream_is_unavailable(self):
+        self.client.get(self.url)
+        StandInFetcher.unavailable = True
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), PNG)
+
+    def test_default_avatar_is_not_cached_when_upstream_is_unavailable(self):
+        StandInFetcher.unavailable = True
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/svg+xml')
+        self.assertIn('max-age=60', response['Cache-Control'])
+        self.assertFalse(os.listdir(self.cache_dir))
+
+    def test_invalid_hash_is_not_found(self):
+        response = self.client.get(reverse('avatar',kwargs={'gravatar_hash': 'B' * 32, 'size': 60}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_hash_of_no_user_is_not_fetched_or_cached(self):
+        response = self.client.get(reverse('avatar',kwargs={'gravatar_hash': 'c' * 32, 'size': 60}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/svg+xml')
+        self.assertIn('max-age=60', response['Cache-Control'])
+        self.assertEqual(StandInFetcher.fetches, [])
+        self.assertFalse(os.listdir(self.cache_dir))
+
+    @override_settings(AVATAR_CACHE_MAX_BYTES=len(PNG) * 2, AVATAR_CACHE_PRUNE_INTERVAL=1)
+    def test_cache_is_pruned_to_its_size_bound_oldest_first(self):
+        for size in (60, 120):
+            self.client.get(reverse('avatar',kwargs={'gravatar_hash': GRAVATAR_HASH, 'size': size}))
+        oldest = os.path.join(self.cache_dir, '60', 'bb', f'{GRAVATAR_HASH}.png')
+        os.utime(oldest, (0, 0))
+        with open(os.path.join(self.cache_dir, 'extra.png'), 'wb') as file:
+            file.write(PNG)
+        prune_cache()
+        self.assertFalse(os.path.exists(oldest))
+        self.assertTrue(os.path.exists(os.path.join(self.cache_dir, '120', 'bb', f'{GRAVATAR_HASH}.png')))
@@ -0,0 +1,100 @@
+"""Tests of the bulk_moderate_applicants view."""
+from django.core.management import call_command
+from django.test import TestCase
+from io import StringIO
+from django.urls import reverse
+from clubs.models import User,Club,Role
+from clubs.tests.helpers import LogInTester,reverse_with_next
+
+
+class BulkModerateApplicantsViewTestCase(TestCase,LogInTester):
+    """Tests of the bulk_moderate_applicants view."""
+
+    fixtures = ['clubs/tests/fixtures/default_user.json',
+                'clubs/tests/fixtures/default_club.json',
+                'clubs/tests/fixtures/other_users.json']
+
+    def setUp(self):
+        self.officer = User.objects.get(username='johndoe@example.org')
+        self.applicant = User.objects.get(username='janedoe@example.org')
+        self.other_applicant = User.objects.get(username='bobdoe@example.org')
+        self.member = User.objects.get(username='robertdoe@example.org')
+        self.club = Club.objects.get(club_name='Beatles')
+        self.club.club_members.add(self.officer,through_defaults={'club_role':'OFF'})
+        self.club.club_members.add(self.applicant,through_defaults={'club_role':'APP'})
+        self.club.club_members.add(self.other_applicant,through_defaults={'club_role':'APP'})
+        self.club.club_members.add(self.member,through_defaults={'club_role':'MEM'})
+        self.url = reverse('bulk_moderate_applicants',kwargs={'club_name': self.club.club_name})
+
+    def test_bulk_moderate_applicants_url(self):
+        self.assertEqual(self.url,f'/club/{self.club.club_name}/applicants/bulk/')
+
+    def test_bulk_accept_applicants(self):
+        self.client.login(username=self.officer.username, password='Password123')
+        user_ids = [self.applicant.id, self.other_applicant.id]
+        response = self.client.post(self.url, {'action': 'accept', 'user_ids': user_ids}, follow=True)
+        response_url = reverse('applicants_list',kwargs={'club_name': self.club.club_name})
+        self.assertRedirects(response, response_url, status_code=302, target_status_code=200)
+        self.assertEqual(Role.objects.filter(club=self.club,club_role='MEM').count(),3)
+        self.assertEqual(Role.objects.filter(club=self.club,club_role='APP').count(),0)
+
+    def test_bulk_reject_applicants_reports_outcomes(self):
+        self.client.login(username=self.officer.username, password='Password123')
+        user_ids = [self.applicant.id, self.member.id]
+        response = self.client.post(self.url, {'action': 'reject', 'user_ids': user_ids}, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            'action': 'reject',
+            'outcomes': {str(self.applicant.id): 'rejected', str(self.member.id): 'skipped'}
+        })
+        self.assertFalse(Role.objects.filter(club=self.club,user=self.applicant).exists())
+        self.assertEqual(Role.objects.get(club=self.club,user=self.member).club_role,'MEM')
+
+    def test_bulk_accept_applicants_uses_constant_number_of_queries(self):
+        User.objects.bulk_create([
+            User(username=f'user{user_id}@test.org', first_name=f'First{user_id}', last_name=f'Last{user_id}')
+            for user_id in range(500)])
+        users = User.objects.filter(username__endswith='@test.org')
+        Role.objects.bulk_create([Role(club=self.club, user=user, club_role='APP') for user in users])
+        call_command('recount_clubs', stdout=StringIO())
+        self.client.login(username=self.officer.username, password='Password123')
+        self.client.get(reverse('feed'))
+        user_ids = [user.id for user in users]
+        """Session, user, club, then the selection and update of the applicants and the club's counters inside a savepoint"""
+        with self.assertNumQueries(8):
+            response = self.client.post(self.url, {'action': 'accept', 'user_ids': user_ids}, HTTP_ACCEPT='application/json')
+        self.assertEqual(set(response.json()['outcomes'].values()), {'accepted'})
+        self.assertEqual(Role.objects.filter(club=self.club,club_role='MEM').count(),501)
+        self.club.refresh_from_db()
+        self.assertEqual(self.club.applicant_count, 2)
+        self.assertEqual(self.club.member_count, 502)
+
+    def test_bulk_moderate_applicants_with_invalid_action(self):
+        self.client.login(username=self.officer.username, password='Password123')
+        response = self.client.post(self.url, {'action': 'ban', 'user_ids': [self.applicant.id]})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Role.objects.get(club=self.club,user=self.applicant).club_role,'APP')
+
+    def test_bulk_moderate_applicants_with_user_id_out_of_range(self):
+        self.client.login(username=self.officer.username, password='Password123')
+        response = self.client.post(
+            self.url, {'action': 'accept', 'user_ids': [self.applicant.id, '99999999999999999999']})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Role.objects.get(club=self.club,user=self.applicant).club_role,'APP')
+
+    def test_bulk_moderate_applicants_requires_post(self):
+        self.client.login(username=self.officer.username, password='Password123')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 405)
+
+    def test_bulk_moderate_applicants_user_does_not_have_permission_is_member(self):
+        self.client.login(username=self.member.username, password='Password123')
+        response = self.client.post(self.url, {'action': 'accept', 'user_ids': [self.applicant.id]}, follow=True)
+        response_url = reverse('feed')
+        self.assertRedirects(response, response_url, status_code=302, target_status_code=200)
+        self.assertEqual(Role.objects.get(club=self.club,user=self.applicant).club_role,'APP')
+
+    def test_bulk_moderate_applicants_redirects_when_not_logged_in(self):
+        redirect_url = reverse_with_next('log_in', self.url)
+        response = self.client.post(self.url, {'action': 'accept', 'user_ids': [self.applicant.id]})
+        self.assertRedirects(response, redirect_url, status_code=302, target_status_code=200)
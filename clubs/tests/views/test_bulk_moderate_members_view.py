@@ -0,0 +1,59 @@
+"""Tests of the bulk_moderate_members view."""
+from django.test import TestCase
+from django.urls import reverse
+from clubs.models import User,Club,Role
+from clubs.tests.helpers import LogInTester,reverse_with_next
+
+
+class BulkModerateMembersViewTestCase(TestCase,LogInTester):
+    """Tests of the bulk_moderate_members view."""
+
+    fixtures = ['clubs/tests/fixtures/default_user.json',
+                'clubs/tests/fixtures/default_club.json',
+                'clubs/tests/fixtures/other_users.json']
+
+    def setUp(self):
+        self.owner = User.objects.get(username='johndoe@example.org')
+        self.member = User.objects.get(username='janedoe@example.org')
+        self.other_member = User.objects.get(username='bobdoe@example.org')
+        self.applicant = User.objects.get(username='robertdoe@example.org')
+        self.club = Club.objects.get(club_name='Beatles')
+        self.club.club_members.add(self.owner,through_defaults={'club_role':'OWN'})
+        self.club.club_members.add(self.member,through_defaults={'club_role':'MEM'})
+        self.club.club_members.add(self.other_member,through_defaults={'club_role':'MEM'})
+        self.club.club_members.add(self.applicant,through_defaults={'club_role':'APP'})
+        self.url = reverse('bulk_moderate_members',kwargs={'club_name': self.club.club_name})
+
+    def test_bulk_moderate_members_url(self):
+        self.assertEqual(self.url,f'/club/{self.club.club_name}/member_management/bulk/')
+
+    def test_bulk_ban_members(self):
+        self.client.login(username=self.owner.username, password='Password123')
+        user_ids = [self.member.id, self.other_member.id]
+        response = self.client.post(self.url, {'action': 'ban', 'user_ids': user_ids}, follow=True)
+        response_url = reverse('member_management',kwargs={'club_name': self.club.club_name})
+        self.assertRedirects(response, response_url, status_code=302, target_status_code=200)
+        self.assertEqual(Role.objects.filter(club=self.club,club_role='BAN').count(),2)
+
+    def test_bulk_promote_members_reports_outcomes(self):
+        self.client.login(username=self.owner.username, password='Password123')
+        user_ids = [self.member.id, self.applicant.id]
+        response = self.client.post(self.url, {'action': 'promote', 'user_ids': user_ids}, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.json(), {
+            'action': 'promote',
+            'outcomes': {str(self.member.id): 'promoted', str(self.applicant.id): 'skipped'}
+        })
+        self.assertEqual(Role.objects.get(club=self.club,user=self.member).club_role,'OFF')
+        self.assertEqual(Role.objects.get(club=self.club,user=self.applicant).club_role,'APP')
+
+    def test_bulk_moderate_members_user_does_not_have_permission_is_applicant(self):
+        self.client.login(username=self.applicant.username, password='Password123')
+        response = self.client.post(self.url, {'action': 'ban', 'user_ids': [self.member.id]}, follow=True)
+        response_url = reverse('feed')
+        self.assertRedirects(response, response_url, status_code=302, target_status_code=200)
+        self.assertEqual(Role.objects.get(club=self.club,user=self.member).club_role,'MEM')
+
+    def test_bulk_moderate_members_redirects_when_not_logged_in(self):
+        redirect_url = reverse_with_next('log_in', self.url)
+        response = self.client.post(self.url, {'action': 'ban', 'user_ids': [self.member.id]})
+        self.assertRedirects(response, redirect_url, status_code=302, target_status_code=200)
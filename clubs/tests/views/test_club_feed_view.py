@@ -1,7 +1,10 @@
 """Unit tests for the club feed view"""
 
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from clubs import cache
 from clubs.models import User,Club,Role
 from clubs.tests.helpers import reverse_with_next,LogInTester
 
@@ -108,6 +111,93 @@ class ClubFeedTestCase(TestCase,LogInTester):
         self.assertRedirects(response, response_url, status_code=302, target_status_code=200)
         self.assertTemplateUsed(response, 'feed.html')
 
+    def test_get_club_feed_query_count_does_not_depend_on_club_size(self):
+        self.client.login(username=self.member.username, password='Password123')
+        self.client.get(self.url)
+        cache.invalidate_club(self.applied_to_club.id)
+        with CaptureQueriesContext(connection) as small_club:
+            self.client.get(self.url)
+        self._create_test_members(15)
+        with CaptureQueriesContext(connection) as large_club:
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.context['members']), 16)
+        self.assertEqual(len(small_club), len(large_club))
+
+    def test_get_club_feed_roster_table_is_cached_until_roles_change(self):
+        cache.stats.reset()
+        self.client.login(username=self.member.username, password='Password123')
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as cached:
+            response = self.client.get(self.url)
+        self.assertFalse(any('"clubs_role"."club_role" IN' in query['sql'] for query in cached.captured_queries))
+        self.assertContains(response, self.officer.full_name())
+        self.applied_to_club.toggle_member(self.user)
+        response = self.client.get(self.url)
+        self.assertContains(response, self.user.full_name())
+        self.assertEqual(cache.stats.get('fragment:club_feed_table'), {'hits': 1, 'misses': 2})
+
+    def test_get_club_feed_roster_table_is_cached_per_viewer_role_class(self):
+        cache.stats.reset()
+        self.client.login(username=self.member.username, password='Password123')
+        response = self.client.get(self.url)
+        self.assertNotContains(response, '<th scope="col">Email</th>')
+        self.client.login(username=self.officer.username, password='Password123')
+        response = self.client.get(self.url)
+        self.assertContains(response, '<th scope="col">Email</th>')
+        self.client.login(username=self.owner.username, password='Password123')
+        response = self.client.get(self.url)
+        self.assertContains(response, '<th scope="col">Email</th>')
+        self.assertEqual(cache.stats.get('fragment:club_feed_table'), {'hits': 1, 'misses': 2})
+
+    @override_settings(ROSTER_PAGE_SIZE=10)
+    def test_get_club_feed_roster_table_is_cached_per_cursor_only(self):
+        cache.stats.reset()
+        self.client.login(username=self.member.username, password='Password123')
+        self._create_test_members(14)
+        self.client.get(self.url, {'a': '1'})
+        self.client.get(self.url, {'a': '2', 'cursor': 'invalid'})
+        response = self.client.get(self.url, {'a': '3'})
+        self.assertEqual(cache.stats.get('fragment:club_feed_table'), {'hits': 2, 'misses': 1})
+        next_url = response.context['members_page'].next_url
+        self.assertNotIn('a=', next_url)
+        response = self.client.get(self.url + next_url + '&a=4')
+        self.assertEqual(cache.stats.get('fragment:club_feed_table'), {'hits': 2, 'misses': 2})
+        self.assertEqual(len(response.context['members']), 5)
+
+    def test_get_club_feed_answers_matching_etag_with_not_modified(self):
+        self.client.login(username=self.member.username, password='Password123')
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.applied_to_club.toggle_member(self.user)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, self.user.full_name())
+
+    def test_get_club_feed_etag_depends_on_cursor(self):
+        self.client.login(username=self.member.username, password='Password123')
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, {'cursor': 'invalid'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(ROSTER_PAGE_SIZE=10)
+    def test_get_club_feed_pages_members_with_cursor(self):
+        self.client.login(username=self.member.username, password='Password123')
+        self._create_test_members(14)
+        response = self.client.get(self.url)
+        first_page = response.context['members']
+        self.assertEqual(len(first_page), 10)
+        self.assertEqual(len(response.context['owner']), 1)
+        next_url = response.context['members_page'].next_url
+        self.assertContains(response, next_url.replace('&', '&amp;'))
+        response = self.client.get(self.url + next_url)
+        self.assertEqual(len(response.context['members']), 5)
+        self.assertEqual(response.context['owner'], [])
+        self.assertEqual(response.context['officers'], [])
+        self.assertFalse(response.context['members_page'].has_next)
+        self.assertFalse(set(first_page) & set(response.context['members']))
+
     def _create_test_members(self, user_count=10):
         for user_id in range(user_count):
             user = User.objects.create_user(
@@ -2,6 +2,7 @@
 
 from django.test import TestCase
 from django.urls import reverse
+from clubs import cache
 from clubs.models import User,Club,Role
 from clubs.tests.helpers import reverse_with_next,LogInTester
 
@@ -81,3 +82,63 @@ class ClubWelcomeTestCase(TestCase,LogInTester):
         redirect_url = reverse_with_next('log_in', self.url)
         response = self.client.get(self.url)
         self.assertRedirects(response, redirect_url, status_code=302, target_status_code=200)
+
+    def test_get_club_welcome_answers_matching_etag_with_not_modified(self):
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.client.get(self.url)
+        self.assertTrue(response.has_header('ETag'))
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertIn('private', response['Cache-Control'])
+        with self.assertNumQueries(2):
+            not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b'')
+
+    def test_get_club_welcome_etag_changes_with_roles(self):
+        self.client.login(username=self.user.username, password='Password123')
+        etag = self.client.get(self.url)['ETag']
+        self.club.club_members.add(self.user,through_defaults={'club_role':'APP'})
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_get_club_welcome_etag_differs_between_users(self):
+        other_user = User.objects.create_user('janedoe@example.org', password='Password123')
+        self.client.login(username=self.user.username, password='Password123')
+        etag = self.client.get(self.url)['ETag']
+        self.client.login(username=other_user.username, password='Password123')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_get_club_welcome_serves_visitors_with_the_same_role_from_cache(self):
+        cache.stats.reset()
+        other_user = User.objects.create_user('janedoe@example.org', password='Password123')
+        self.client.login(username=self.user.username, password='Password123')
+        self.client.get(self.url)
+        self.client.login(username=other_user.username, password='Password123')
+        self.client.get(reverse('feed'))
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertContains(response, 'Best chess club in town!')
+        self.assertContains(response, 'Apply!')
+        self.assertContains(response, 'name="csrfmiddlewaretoken"')
+        self.assertNotContains(response, cache.CSRF_TOKEN_PLACEHOLDER)
+        self.assertEqual(cache.stats.get('fragment:club_welcome'), {'hits': 1, 'misses': 1})
+
+    def test_get_club_welcome_gives_applicants_their_own_withdraw_form(self):
+        other_user = User.objects.create_user('janedoe@example.org', password='Password123')
+        self.club.club_members.add(self.user,through_defaults={'club_role':'APP'})
+        self.club.club_members.add(other_user,through_defaults={'club_role':'APP'})
+        for applicant in (self.user, other_user):
+            self.client.login(username=applicant.username, password='Password123')
+            response = self.client.get(self.url)
+            self.assertContains(response, reverse('withdraw_application', args=[self.club.club_name, applicant.id]))
+
+    def test_get_club_welcome_shows_new_member_count_after_roles_change(self):
+        other_user = User.objects.create_user('janedoe@example.org', password='Password123')
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.client.get(self.url)
+        self.assertContains(response, 'There are currently 0 members in this club.')
+        self.club.club_members.add(other_user,through_defaults={'club_role':'MEM'})
+        response = self.client.get(self.url)
+        self.assertContains(response, 'There are currently 1 members in this club.')
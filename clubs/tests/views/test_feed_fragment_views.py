@@ -0,0 +1,61 @@
+"""Unit tests for the feed fragment views"""
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from clubs.models import User,Club
+from clubs.tests.helpers import reverse_with_next
+
+class FeedFragmentViewsTestCase(TestCase):
+    """Unit tests for the feed fragment views."""
+
+    fixtures = [
+        'clubs/tests/fixtures/default_user.json',
+        'clubs/tests/fixtures/default_club.json',
+        'clubs/tests/fixtures/other_clubs.json'
+    ]
+
+    def setUp(self):
+        self.user = User.objects.get(username='johndoe@example.org')
+        self.club = Club.objects.get(club_name='Beatles')
+        self.applied_to_club = Club.objects.get(club_name='EliteChess')
+        self.club.club_members.add(self.user,through_defaults={'club_role':'MEM'})
+        self.applied_to_club.club_members.add(self.user,through_defaults={'club_role':'APP'})
+        self.all_clubs_url = reverse('feed_all_clubs')
+        self.applied_clubs_url = reverse('feed_applied_clubs')
+
+    def test_feed_fragment_urls(self):
+        self.assertEqual(self.all_clubs_url,'/feed/all_clubs/')
+        self.assertEqual(self.applied_clubs_url,'/feed/applied_clubs/')
+
+    def test_all_clubs_fragment(self):
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.client.get(self.all_clubs_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'partials/feed_all_clubs.html')
+        self.assertTemplateNotUsed(response, 'base.html')
+        self.assertEqual(len(response.context['clubs']), 3)
+
+    @override_settings(CLUB_LIST_PAGE_SIZE=2)
+    def test_all_clubs_fragment_pages_clubs_by_name(self):
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.client.get(self.all_clubs_url)
+        clubs = list(Club.objects.order_by('club_name', 'id'))
+        self.assertEqual(response.context['clubs'], clubs[:2])
+        self.assertContains(response, response.context['clubs_page'].next_url.replace('&', '&amp;'))
+        response = self.client.get(self.all_clubs_url + response.context['clubs_page'].next_url)
+        self.assertEqual(response.context['clubs'], clubs[2:])
+        self.assertFalse(response.context['clubs_page'].has_next)
+        self.assertTrue(response.context['clubs_page'].has_previous)
+
+    def test_applied_clubs_fragment(self):
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.client.get(self.applied_clubs_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'partials/feed_applied_clubs.html')
+        self.assertTemplateNotUsed(response, 'base.html')
+        self.assertEqual(response.context['user_applicant_clubs'], [self.applied_to_club])
+
+    def test_fragments_redirect_when_not_logged_in(self):
+        for url in (self.all_clubs_url, self.applied_clubs_url):
+            response = self.client.get(url)
+            self.assertRedirects(response, reverse_with_next('log_in', url), status_code=302, target_status_code=200)
@@ -1,6 +1,6 @@
 """Unit tests for the feed view"""
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from clubs.models import User,Club,Role
 from clubs.tests.helpers import reverse_with_next,LogInTester
@@ -31,9 +31,20 @@ class FeedTestCase(TestCase,LogInTester):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'feed.html')
-        self.assertEqual(len(response.context['clubs']), 3)
         self.assertEqual(len(response.context['user_clubs']), 1)
-        self.assertEqual(len(response.context['user_applicant_clubs']), 1)
+        self.assertNotIn('clubs', response.context)
+        self.assertNotIn('user_applicant_clubs', response.context)
+        self.assertContains(response, f'data-fragment-url="{reverse("feed_all_clubs")}"')
+        self.assertContains(response, f'data-fragment-url="{reverse("feed_applied_clubs")}"')
+
+    def test_feed_queries_do_not_grow_with_clubs(self):
+        self.client.login(username=self.user.username, password='Password123')
+        self.client.get(self.url)
+        for number in range(20):
+            Club.objects.create(club_name=f'Club{number}', location='London', description='Chess')
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
 
     def test_feed_redirects_when_not_logged_in(self):
             redirect_url = reverse_with_next('log_in',self.url)
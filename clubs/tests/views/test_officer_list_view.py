@@ -1,6 +1,7 @@
 """Unit tests for the officer list view"""
 
 from django.test import TestCase
+from clubs import cache
 from clubs.models import User,Club,Role
 from django.urls import reverse
 from clubs.tests.helpers import LogInTester,reverse_with_next
@@ -35,6 +36,26 @@ class OfficerListViewTestCase(TestCase,LogInTester):
             self.assertContains(response, f'First{user_id}')
             self.assertContains(response, f'Last{user_id}')
 
+    def test_cached_officer_list_has_the_csrf_token_of_the_request(self):
+        cache.stats.reset()
+        self._create_test_officers(2)
+        self.client.login(username=self.user.username, password='Password123')
+        self.client.get(self.url)
+        self.client.logout()
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.client.get(self.url)
+        self.assertEqual(cache.stats.get('fragment:officer_list_table'), {'hits': 1, 'misses': 1})
+        self.assertContains(response, f'value="{response.context["csrf_token"]}"', count=4)
+        self.assertNotContains(response, cache.CSRF_TOKEN_PLACEHOLDER)
+
+    def test_officer_list_is_cached_whatever_the_other_query_parameters(self):
+        cache.stats.reset()
+        self._create_test_officers(2)
+        self.client.login(username=self.user.username, password='Password123')
+        self.client.get(self.url, {'a': '1'})
+        self.client.get(self.url, {'a': '2'})
+        self.assertEqual(cache.stats.get('fragment:officer_list_table'), {'hits': 1, 'misses': 1})
+
     def test_officer_list_invalid_club(self):
         self.client.login(username=self.user.username, password='Password123')
         self.assertTrue(self._is_logged_in())
@@ -118,6 +118,23 @@ class PromoteMemberViewTestCase(TestCase,LogInTester):
         self.assertRedirects(response,response_url,status_code=302,target_status_code=200)
         self.assertTemplateUsed(response,'feed.html')
 
+    def test_promote_member_target_must_be_member(self):
+        applicant = User.objects.get(username='robertdoe@example.org')
+        self.club.club_members.add(applicant,through_defaults={'club_role':'APP'})
+        self.client.login(username=self.user.username, password='Password123')
+        url = reverse('promote_member', kwargs={'club_name':self.club.club_name,'user_id': applicant.id})
+        response = self.client.get(url, follow=True)
+        response_url = reverse('feed')
+        self.assertRedirects(response, response_url, status_code=302, target_status_code=200)
+        self.assertEqual(Role.objects.get(user=applicant, club=self.club).club_role,'APP')
+
+    def test_promote_member_resolves_access_in_one_query(self):
+        self.client.login(username=self.user.username, password='Password123')
+        self.client.get(reverse('feed'))
+        """Session, user, club access, then the conditional update of toggle_officer and the club's counters inside a savepoint"""
+        with self.assertNumQueries(7):
+            self.client.get(self.url)
+
     def test_promote_member_redirects_when_not_logged_in(self):
         redirect_url = reverse_with_next('log_in', self.url)
         response = self.client.get(self.url)
@@ -0,0 +1,56 @@
+"""Tests of the search_member_typeahead view."""
+from django.test import TestCase
+from django.urls import reverse
+from clubs.models import User,Club
+from clubs.tests.helpers import LogInTester,reverse_with_next
+
+
+class SearchMemberTypeaheadViewTestCase(TestCase,LogInTester):
+    """Tests of the search_member_typeahead view."""
+
+    fixtures = ['clubs/tests/fixtures/default_user.json',
+                'clubs/tests/fixtures/default_club.json',
+                'clubs/tests/fixtures/other_users.json']
+
+    def setUp(self):
+        self.user = User.objects.get(username='johndoe@example.org')
+        self.member = User.objects.get(username='bobdoe@example.org')
+        self.visitor = User.objects.get(username='janedoe@example.org')
+        self.club = Club.objects.get(club_name='Beatles')
+        self.club.club_members.add(self.user,through_defaults={'club_role':'OFF'})
+        self.club.club_members.add(self.member,through_defaults={'club_role':'MEM'})
+        self.url = reverse('search_member_typeahead',kwargs={'club_name': self.club.club_name})
+
+    def test_search_member_typeahead_url(self):
+        self.assertEqual(self.url,f'/club/{self.club.club_name}/search_member/typeahead/')
+
+    def test_typeahead_returns_matching_members(self):
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.client.get(self.url,{'q':'bo'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'results': [{
+            'id': self.member.id,
+            'name': 'Bob Doe',
+            'url': reverse('show_user',kwargs={'user_id': self.member.id})}]})
+
+    def test_typeahead_does_not_return_non_members(self):
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.client.get(self.url,{'q':'jane'})
+        self.assertEqual(response.json(), {'results': []})
+
+    def test_typeahead_limits_results(self):
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.client.get(self.url,{'q':'doe','limit':1})
+        self.assertEqual(len(response.json()['results']), 1)
+        response = self.client.get(self.url,{'q':'doe','limit':'many'})
+        self.assertEqual(len(response.json()['results']), 2)
+
+    def test_typeahead_user_not_in_club(self):
+        self.client.login(username=self.visitor.username, password='Password123')
+        response = self.client.get(self.url,{'q':'bo'},follow=True)
+        self.assertRedirects(response,reverse('feed'),status_code=302,target_status_code=200)
+
+    def test_typeahead_user_not_logged_in(self):
+        redirect_url = reverse_with_next('log_in',self.url)
+        response = self.client.get(self.url)
+        self.assertRedirects(response, redirect_url, status_code=302, target_status_code=200)
@@ -1,4 +1,5 @@
 """Tests of the search_member view."""
+from django.conf import settings
 from django.contrib import messages
 from django.test import TestCase
 from django.urls import reverse
@@ -39,6 +40,34 @@ class SearchMemberTestCase(TestCase,LogInTester):
         self.assertContains(response, 'Bob Doe')
         self.assertTemplateUsed(response, 'search_member.html')
 
+    def test_search_ignores_case_and_matches_prefixes(self):
+        self.form_input['member_name'] = 'bo'
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.client.get(self.url,self.form_input)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['members']), [self.member])
+
+    def test_search_results_link_to_next_page(self):
+        for number in range(settings.MEMBER_SEARCH_PAGE_SIZE):
+            user = User.objects.create_user(f'bobby{number}@example.org', first_name='Bobby',
+                last_name=f'Player{number}', password='Password123')
+            self.club.club_members.add(user,through_defaults={'club_role':'MEM'})
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.client.get(self.url,self.form_input)
+        self.assertEqual(len(response.context['members']), settings.MEMBER_SEARCH_PAGE_SIZE)
+        self.assertContains(response, '?member_name=Bob&amp;page=2')
+        response = self.client.get(self.url,{'member_name':'Bob','page':2})
+        self.assertEqual(len(response.context['members']), 1)
+        self.assertContains(response, '?member_name=Bob&amp;page=1')
+        self.assertNotContains(response, 'page=3')
+
+    def test_search_page_past_the_64_bit_range_is_empty(self):
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.client.get(self.url,{'member_name':'Bob','page':'99999999999999999999'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['members']), [])
+        self.assertFalse(response.context['results'].has_next)
+
     def test_search_for_invalid_member(self):
         self.form_input['member_name'] = 'Jane'
         self.client.login(username=self.user.username, password='Password123')
@@ -35,6 +35,22 @@ class ShowUserTest(TestCase):
         self.assertContains(response, "John Doe")
         self.assertContains(response, "johndoe@example.org")
 
+    def test_get_show_user_answers_matching_etag_with_not_modified(self):
+        self.client.login(username=self.user.username, password='Password123')
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_get_show_user_etag_changes_with_user_details(self):
+        self.client.login(username=self.user.username, password='Password123')
+        etag = self.client.get(self.url)['ETag']
+        self.target_user.bio = 'A new bio'
+        self.target_user.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'A new bio')
+
     def test_get_show_user_with_invalid_id(self):
         self.client.login(username=self.user.username, password='Password123')
         url = reverse('show_user', kwargs={'user_id': self.user.id+9999})
@@ -113,6 +113,14 @@ class WithdrawApplicationViewTestCase(TestCase,LogInTester):
         response_url = reverse('feed')
         self.assertRedirects(response, response_url, status_code=302, target_status_code=200)
 
+    def test_applicant_cannot_withdraw_other_application(self):
+        self.club.club_members.add(self.user,through_defaults={'club_role':'APP'})
+        self.client.login(username=self.user.username, password='Password123')
+        response = self.client.get(self.url, follow=True)
+        response_url = reverse('feed')
+        self.assertRedirects(response, response_url, status_code=302, target_status_code=200)
+        self.assertEqual(Role.objects.get(user=self.applicant, club=self.club).club_role,'APP')
+
     def test_withdraw_user_not_logged_in(self):
         redirect_url = reverse_with_next('log_in', self.url)
         response = self.client.get(self.url)
@@ -0,0 +1,78 @@
+from bisect import bisect_left
+from collections import OrderedDict
+from django.conf import settings
+from .search import normalise
+from . import cache
+import threading
+
+"""Per-process prefix indexes of the names of club members, for as-you-type lookup.
+
+Each index is built lazily from the club's owner, officers and members and is rebuilt
+once the club's roster version changes."""
+
+
+class MemberPrefixIndex:
+    """Sorted keys of a club's member names, searched by bisection.
+
+    Every member has one key per word of their name and one for their full name,
+    so 'jo' finds John Doe and 'john d' narrows it down."""
+
+    def __init__(self, users):
+        self.names = {}
+        entries = set()
+        for user_id, first_name, last_name in users:
+            self.names[user_id] = f'{first_name} {last_name}'
+            words = normalise(self.names[user_id])
+            entries.add((' '.join(words), user_id))
+            entries.update((word, user_id) for word in words)
+        entries = sorted(entries)
+        self._keys = [key for key, user_id in entries]
+        self._user_ids = [user_id for key, user_id in entries]
+
+    def __len__(self):
+        return len(self.names)
+
+    def search(self, query, limit):
+        """Returns up to limit (user_id, full_name) pairs whose name has a word starting with the query."""
+        prefix = ' '.join(normalise(query))
+        if not prefix:
+            return []
+        results = []
+        seen = set()
+        position = bisect_left(self._keys, prefix)
+        while position < len(self._keys) and len(results) < limit and self._keys[position].startswith(prefix):
+            user_id = self._user_ids[position]
+            if user_id not in seen:
+                seen.add(user_id)
+                results.append((user_id, self.names[user_id]))
+            position += 1
+        return results
+
+
+class MemberPrefixIndexes:
+    """The most recently used prefix indexes of this process, keyed by club id."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._indexes = OrderedDict()
+
+    def get(self, club):
+        version = cache.get_club_version(club.id)
+        with self._lock:
+            entry = self._indexes.get(club.id)
+            if entry is not None and entry[0] == version:
+                self._indexes.move_to_end(club.id)
+                return entry[1]
+        index = MemberPrefixIndex(club.get_all_users_in_club().values_list('id', 'first_name', 'last_name'))
+        with self._lock:
+            self._indexes[club.id] = (version, index)
+            self._indexes.move_to_end(club.id)
+            while len(self._indexes) > settings.MEMBER_TYPEAHEAD_MAX_CLUBS:
+                self._indexes.popitem(last=False)
+        return index
+
+    def clear(self):
+        with self._lock:
+            self._indexes.clear()
+
+indexes = MemberPrefixIndexes()
@@ -1,9 +1,13 @@
 from .account_views import *
+from .async_views import *
 from .authentication_views import *
 from .feed_views import *
 from .club_feed_views import *
 from .club_views import *
 from .application_views import *
+from .avatar_views import *
 from .club_management_views import *
+from .metrics_views import *
+from .moderation_views import *
 from .static_views import *
 from .user_views import *
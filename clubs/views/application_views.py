@@ -1,8 +1,10 @@
 from django.shortcuts import render, redirect
-from clubs.models import User,Club,Role
+from clubs.models import User,Club,Role,ClubRoster
+from clubs.views.mixins import KeysetPaginationMixin
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from clubs.helpers import club_exists,management_required,user_in_club
+from clubs.helpers import club_exists,management_required,club_access
 from django.core.exceptions import ObjectDoesNotExist
 from django.views.generic import ListView
 from django.utils.decorators import method_decorator
@@ -12,7 +14,7 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 @method_decorator(login_required,name='dispatch')
 @method_decorator(club_exists,name='dispatch')
 @method_decorator(management_required,name='dispatch')
-class ApplicantListView(LoginRequiredMixin,ListView):
+class ApplicantListView(LoginRequiredMixin,KeysetPaginationMixin,ListView):
     """View that diplays a list of current applicants"""
     model = User
     template_name = "applicants_list.html"
@@ -22,37 +24,35 @@ class ApplicantListView(LoginRequiredMixin,ListView):
     def post(self,*args,**kwargs):
         return super().get(*args,**kwargs)
 
+    def get_queryset(self):
+        self.club = Club.objects.get(club_name=self.kwargs['club_name'])
+        self.page = self.paginate_keyset(
+            self.club.get_applicants().only(*ClubRoster.USER_FIELDS), ClubRoster.ORDERING, settings.ROSTER_PAGE_SIZE)
+        return self.page.object_list
+
     def get_context_data(self,*args,**kwargs):
         context = super(ApplicantListView,self).get_context_data(*args,**kwargs)
-        self.club = Club.objects.get(club_name=self.kwargs['club_name'])
         context['club'] = self.club
-        context['applicants'] = self.club.get_applicants()
+        context['applicants_page'] = self.page
         return context
 
 @login_required
-@user_in_club
-@management_required
-def accept_applicant(request,club_name,user_id):
+@club_access(actor_roles={'OFF','OWN'},target_role='APP')
+def accept_applicant(request,club,applicant):
     """View that accepts an application and applicant becomes a member"""
-    current_club = Club.objects.get(club_name=club_name)
-    applicant = User.objects.get(id=user_id,club__club_name = current_club.club_name, role__club_role = 'APP')
-    current_club.toggle_member(applicant)
+    club.toggle_member(applicant)
     if request.method == 'POST':
         messages.add_message(request, messages.SUCCESS, f'{applicant.full_name()} has become a member of the club.')
-    return redirect('applicants_list', current_club.club_name)
+    return redirect('applicants_list', club.club_name)
 
 @login_required
-@club_exists
-@user_in_club
-@management_required
-def reject_applicant(request,club_name,user_id):
+@club_access(actor_roles={'OFF','OWN'},target_role='APP')
+def reject_applicant(request,club,applicant):
     """View that rejects a user from joining the club"""
-    current_club = Club.objects.get(club_name=club_name)
-    applicant = User.objects.get(id=user_id,club__club_name = current_club.club_name, role__club_role = 'APP')
-    current_club.remove_user_from_club(applicant)
+    club.remove_user_from_club(applicant)
     if request.method == 'POST':
         messages.add_message(request, messages.WARNING, f'{applicant.full_name()} has been rejected.')
-    return redirect('applicants_list', current_club.club_name)
+    return redirect('applicants_list', club.club_name)
 
 @login_required
 @club_exists
@@ -72,18 +72,10 @@ def apply_to_club(request,club_name):
             return redirect('feed')
 
 @login_required
-@user_in_club
-@club_exists
-def withdraw_application(request, club_name, user_id):
+@club_access(actor_roles={'APP'},target_role='APP',target_is_actor=True)
+def withdraw_application(request, club, user):
     """View that allows an applicant to stop being an applicant"""
-    club = Club.objects.get(club_name = club_name)
-    user = User.objects.get(id=user_id,club__club_name = club.club_name)
-    """If user is not an applicant"""
-    if club.get_club_role(user) != 'APP':
-        return redirect('feed')
-    else:
-        club.remove_user_from_club(user)
-        club.save()
+    club.remove_user_from_club(user)
     if request.method == 'POST':
-        messages.add_message(request, messages.WARNING, f'Withdrawal from {club_name} completed successfully')
+        messages.add_message(request, messages.WARNING, f'Withdrawal from {club.club_name} completed successfully')
     return redirect('feed')
@@ -0,0 +1,142 @@
+from asgiref.sync import sync_to_async
+from django.shortcuts import render, redirect
+from django.contrib.auth import get_user, login
+from django.contrib.auth.views import redirect_to_login
+from django.contrib import messages
+from django.conf import settings
+from django.http import HttpResponseNotAllowed
+from django.utils.functional import SimpleLazyObject
+from clubs import cache, routers
+from clubs.etags import conditional_page,club_feed_etag
+from clubs.forms import LogInForm,SignUpForm,PasswordForm
+from clubs.models import Club,ClubRoster,Role
+from clubs.pagination import get_request_cursor, paginate_request
+from clubs.reads import gather_reads
+from clubs.memberships import Memberships
+from clubs.views.club_feed_views import get_owner_and_officers
+
+"""Async counterparts of views, served through the ASGI entry point.
+
+The views that hash passwords hash in the password hashing pool instead of on the request thread,
+and the feeds run their independent reads concurrently in the database read pool. Everything else
+reaches the database and session through sync_to_async, since neither may be used from the event loop."""
+
+async def log_in_async(request):
+    """View that handles log in."""
+    if request.method not in ('GET', 'POST'):
+        return HttpResponseNotAllowed(['GET', 'POST'])
+    user = await sync_to_async(get_user)(request)
+    if user.is_authenticated:
+        return redirect(settings.REDIRECT_URL_WHEN_LOGGED_IN)
+    if request.method == 'POST':
+        form = LogInForm(request.POST)
+        next = request.POST.get('next') or settings.REDIRECT_URL_WHEN_LOGGED_IN
+        user = await form.get_user_async()
+        if user is not None:
+            await sync_to_async(login)(request, user)
+            return redirect(next)
+        messages.add_message(request, messages.ERROR, "The credentials provided were invalid!")
+    else:
+        next = request.GET.get('next') or ''
+    return await sync_to_async(render)(request, 'log_in.html', {'form': LogInForm(), 'next': next})
+
+async def sign_up_async(request):
+    """View that signs up user."""
+    if request.method not in ('GET', 'POST'):
+        return HttpResponseNotAllowed(['GET', 'POST'])
+    user = await sync_to_async(get_user)(request)
+    if user.is_authenticated:
+        return redirect(settings.REDIRECT_URL_WHEN_LOGGED_IN)
+    if request.method == 'POST':
+        form = SignUpForm(request.POST)
+        if await sync_to_async(form.is_valid)():
+            user = await form.save_async()
+            await sync_to_async(login)(request, user)
+            return redirect(settings.REDIRECT_URL_WHEN_LOGGED_IN)
+    else:
+        form = SignUpForm()
+    return await sync_to_async(render)(request, 'sign_up.html', {'form': form})
+
+async def password_async(request):
+    """View that handles password change requests."""
+    if request.method not in ('GET', 'POST'):
+        return HttpResponseNotAllowed(['GET', 'POST'])
+    user = await sync_to_async(get_user)(request)
+    if not user.is_authenticated:
+        return redirect_to_login(request.get_full_path())
+    if request.method == 'POST':
+        form = PasswordForm(user=user, data=request.POST)
+        if await form.is_valid_async():
+            await form.save_async()
+            await sync_to_async(login)(request, user)
+            messages.add_message(request, messages.SUCCESS, "Password updated!")
+            return redirect('feed')
+    else:
+        form = PasswordForm()
+    return await sync_to_async(render)(request, 'password.html', {'form': form})
+
+async def _is_authenticated(request):
+    """Loads the lazy request.user off the event loop, and returns whether it is authenticated."""
+    return await sync_to_async(lambda: request.user.is_authenticated)()
+
+async def feed_async(request):
+    """View that displays the feed, reading the user's clubs and memberships concurrently."""
+    if request.method not in ('GET', 'POST'):
+        return HttpResponseNotAllowed(['GET', 'POST'])
+    if not await _is_authenticated(request):
+        return redirect_to_login(request.get_full_path())
+    user = request.user
+    user_clubs, request.memberships = await gather_reads(
+        lambda: list(user.get_user_clubs()), lambda: Memberships(user))
+    return await sync_to_async(render)(request, 'feed.html', {'user_clubs': user_clubs})
+
+@conditional_page(club_feed_etag)
+async def club_feed_async(request, club_name):
+    """View that displays the roster of a club, reading the club and its roster concurrently."""
+    if request.method not in ('GET', 'POST'):
+        return HttpResponseNotAllowed(['GET', 'POST'])
+    if not await _is_authenticated(request):
+        return redirect_to_login(request.get_full_path())
+    """The validator has already loaded the user and their memberships"""
+    user_role = await sync_to_async(request.memberships.get_club_role_by_name)(club_name)
+    if user_role not in Role.IN_CLUB_ROLES:
+        return redirect(settings.REDIRECT_URL_WHEN_LOGGED_IN)
+    club_id = request.memberships.get_club_id(club_name)
+    roster_view = 'staff' if user_role in ('OWN', 'OFF') else 'member'
+
+    members = Club(id=club_id).get_members().only(*ClubRoster.USER_FIELDS)
+    get_club = lambda: Club.objects.get(id=club_id)
+
+    """The roster fills the cached roster table, so it is read from the primary"""
+    @routers.primary_reads()
+    def get_page():
+        return paginate_request(request, members, ClubRoster.ORDERING, settings.ROSTER_PAGE_SIZE, keep_query=False)
+
+    @routers.primary_reads()
+    def get_owner_and_officers_of_club():
+        return get_owner_and_officers(club_id)
+
+    roster_cursor = get_request_cursor(request, members, ClubRoster.ORDERING)
+    roster_cached = await sync_to_async(cache.has_club_fragment)(
+        'club_feed_table', club_id, [roster_view, roster_cursor])
+    if roster_cached:
+        """The cached roster table needs no roster, unless it expires before the template renders"""
+        club, = await gather_reads(get_club)
+        page = SimpleLazyObject(get_page)
+        owner_and_officers = SimpleLazyObject(
+            lambda: ([], []) if page.has_previous else get_owner_and_officers_of_club())
+    else:
+        """The owner and officers head the first page only, but are read alongside the page to overlap the queries"""
+        club, page, owner_and_officers = await gather_reads(get_club, get_page, get_owner_and_officers_of_club)
+        if page.has_previous:
+            owner_and_officers = ([], [])
+    return await sync_to_async(render)(request, 'club_feed.html', {
+        'club': club,
+        'members': SimpleLazyObject(lambda: page.object_list),
+        'members_page': page,
+        'owner': SimpleLazyObject(lambda: owner_and_officers[0]),
+        'officers': SimpleLazyObject(lambda: owner_and_officers[1]),
+        'user_role': user_role,
+        'roster_view': roster_view,
+        'roster_cursor': roster_cursor,
+        'number_of_applicants': club.applicant_count})
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.views.decorators.http import require_GET
+from clubs.avatars import get_avatar, get_default_avatar, get_size_bucket
+from clubs.models import User
+import re
+
+@require_GET
+def avatar(request,gravatar_hash,size):
+    """View that serves a user's avatar from the local avatar cache"""
+    if not re.fullmatch(r'[0-9a-f]{32}', gravatar_hash):
+        raise Http404
+    size = get_size_bucket(size)
+    """Only the avatars of users are fetched and cached, so walking random hashes costs no upstream
+    fetches or disk space"""
+    cached = get_avatar(gravatar_hash, size) if User.objects.filter(gravatar_hash=gravatar_hash).exists() else None
+    if cached is None:
+        """Upstream is unavailable or the hash is no user's, so serve the default briefly"""
+        content_type, content = get_default_avatar(gravatar_hash, size)
+        response = HttpResponse(content, content_type=content_type)
+        patch_cache_control(response, public=True, max_age=settings.AVATAR_FALLBACK_MAX_AGE)
+        return response
+    last_modified = int(cached.modified)
+    response = get_conditional_response(request, etag=cached.etag, last_modified=last_modified)
+    if response is None:
+        response = FileResponse(open(cached.path, 'rb'), content_type=cached.content_type)
+    response['ETag'] = cached.etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, public=True, max_age=settings.AVATAR_MAX_AGE)
+    return response
@@ -1,6 +1,7 @@
 from django.shortcuts import render, redirect
+from django.http import JsonResponse
 from django.contrib.auth import authenticate,login, logout
-from clubs.models import User,Club
+from clubs.models import User,Club,ClubRoster
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from clubs.helpers import membership_required,club_exists
@@ -11,45 +12,83 @@ from django.views.generic import ListView
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import ImproperlyConfigured, ObjectDoesNotExist
 from django.urls import reverse
-from django.db.models import CharField, Value
-from django.db.models.functions import Concat
+from django.db.models import F
+from django.utils.functional import SimpleLazyObject, cached_property
+from clubs.search import search_members
+from clubs.views.mixins import CachedRosterMixin
+from clubs.etags import conditional_page,club_feed_etag
+from clubs.typeahead import indexes as typeahead_indexes
+
+def get_owner_and_officers(club):
+    """Returns the owner and the officers of the club, with one query"""
+    users = User.objects.filter(role__club=club, role__club_role__in=('OWN', 'OFF')).annotate(
+        club_role=F('role__club_role')).only(*ClubRoster.USER_FIELDS).order_by(*ClubRoster.ORDERING)
+    owner, officers = [], []
+    for user in users:
+        (owner if user.club_role == 'OWN' else officers).append(user)
+    return owner, officers
 
 @method_decorator(login_required,name='dispatch')
+@method_decorator(conditional_page(club_feed_etag),name='dispatch')
 @method_decorator(club_exists,name='dispatch')
 @method_decorator(membership_required,name='dispatch')
 
-class ClubFeedView(LoginRequiredMixin,ListView):
+class ClubFeedView(LoginRequiredMixin,CachedRosterMixin,ListView):
     model = User
     template_name = "club_feed.html"
-    context_object_data = 'members'
+    context_object_name = 'members'
+    page_context_name = 'members_page'
 
     def post(self,*args,**kwargs):
         return super().get(*args,**kwargs)
 
+    def get_roster(self):
+        return self.club.get_members()
+
+    @cached_property
+    def owner_and_officers(self):
+        """The owner and officers head the first page only"""
+        if self.page.has_previous:
+            return [], []
+        return get_owner_and_officers(self.club)
+
     def get_context_data(self,*args,**kwargs):
         context = super(ClubFeedView,self).get_context_data(*args,**kwargs)
-        self.club = Club.objects.get(club_name=self.kwargs['club_name'])
-        user_role = self.club.get_club_role(self.request.user)
-        context['members'] = self.club.get_members()
-        context['club'] = self.club
-        context['owner'] = self.club.get_owner()
-        context['officers'] = self.club.get_officers()
-        context['user_role'] = user_role
-        context['number_of_applicants'] = self.club.get_applicants().count()
+        context['owner'] = SimpleLazyObject(lambda: self.owner_and_officers[0])
+        context['officers'] = SimpleLazyObject(lambda: self.owner_and_officers[1])
+        context['user_role'] = self.request.memberships.get_club_role(self.club)
+        context['roster_view'] = 'staff' if context['user_role'] in ('OWN', 'OFF') else 'member'
+        context['number_of_applicants'] = self.club.applicant_count
         return context
 
+
 @login_required
 @membership_required
 def search_member(request,club_name):
-    """View that searches for a member by their name"""
+    """View that searches the owner, officers and members of a club by name, ignoring accents and case"""
     current_club = Club.objects.get(club_name=club_name)
-    members = current_club.get_all_users_in_club()
-    member_name = request.GET.get('member_name')
-    member_name.capitalize()
+    member_name = request.GET.get('member_name', '').strip()
     if member_name == '':
-        member_name = 'None'
         return redirect('club_feed',current_club.club_name)
-    queryset = members.annotate(search_name=Concat('first_name', Value(' '), 'last_name'))
-    search_results = queryset.filter(search_name__contains=member_name)
+    try:
+        page = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        page = 1
+    results = search_members(current_club, member_name, page)
 
-    return render(request,'search_member.html', {'club':current_club,'members':search_results})
+    return render(request,'search_member.html', {'club':current_club,'members':results.members,
+        'results':results,'member_name':member_name})
+
+@login_required
+@membership_required
+def search_member_typeahead(request,club_name):
+    """View that returns the members whose name has a word starting with the query, as JSON"""
+    current_club = Club.objects.get(club_name=club_name)
+    try:
+        limit = min(max(int(request.GET.get('limit', settings.MEMBER_TYPEAHEAD_LIMIT)), 1), settings.MEMBER_TYPEAHEAD_LIMIT)
+    except ValueError:
+        limit = settings.MEMBER_TYPEAHEAD_LIMIT
+    matches = typeahead_indexes.get(current_club).search(request.GET.get('q', ''), limit)
+    return JsonResponse({'results': [
+        {'id': user_id, 'name': name, 'url': reverse('show_user', kwargs={'user_id': user_id})}
+        for user_id, name in matches]})
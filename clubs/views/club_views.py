@@ -1,55 +1,70 @@
-from django.shortcuts import render, redirect
+from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import authenticate,login, logout
-from clubs.models import User,Club
+from clubs.models import User,Club,Role
 from django.contrib import messages
 from clubs.forms import NewClubForm
 from django.contrib.auth.decorators import login_required
-from clubs.helpers import club_exists_id,club_exists,owner_required
+from clubs.helpers import club_exists,owner_required
+from clubs.etags import conditional_page,club_welcome_etag
 from django.views import View
 from django.utils.decorators import method_decorator
 from django.conf import settings
-from django.views.generic.detail import DetailView
+from django.views.generic import TemplateView
 from django.http import HttpResponseForbidden, Http404
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import ImproperlyConfigured, ObjectDoesNotExist
 from django.views.generic.edit import FormView
 from django.urls import reverse
+from django.template.loader import render_to_string
+from django.middleware.csrf import get_token
+from django.utils.safestring import mark_safe
+from clubs import cache
 from django.db.models import CharField, Value
 from django.db.models.functions import Concat
 
-@method_decorator(club_exists_id,name='dispatch')
-class ClubWelcomeView(LoginRequiredMixin,DetailView):
-    """View that displays information of a club"""
-    model = Club
+@method_decorator(conditional_page(club_welcome_etag),name='dispatch')
+class ClubWelcomeView(LoginRequiredMixin,TemplateView):
+    """View that displays information of a club
+
+    The information is cached per club version and role of the viewer, so traffic spikes on a
+    club are served from the cache without loading the club or its owner."""
     template_name = 'club_welcome.html'
-    context_object_name = "club"
-    pk_url_kwarg = 'club_id'
 
     def post(self,*args,**kwargs):
-        return super().get(*args,**kwargs)
+        return self.get(*args,**kwargs)
 
     def get_context_data(self, *args, **kwargs):
         """Generate content to be displayed in the template."""
         context = super(ClubWelcomeView,self).get_context_data(*args, **kwargs)
-        club = Club.objects.get(id=self.kwargs['club_id'])
+        club_id = self.kwargs['club_id']
         user_role = None
-        if club.is_user_in_club(self.request.user):
-            club_role = club.get_club_role(self.request.user)
+        club_role = self.request.memberships.get_club_role_by_id(club_id)
+        if club_role is not None:
             if club_role == 'APP':
                 user_role = 'APP'
             elif club_role == 'BAN':
                 user_role = 'BAN'
             elif club_role ==  'MEM' or club_role ==  'OWN' or club_role ==  'OFF':
                 user_role = 'MEM'
-        context['club'] = club
-        context['user'] = self.request.user
-        context['user_role'] = user_role
-        context['owner'] = club.get_owner()
-        context['member_count'] = club.get_all_users_in_club().count()
+        """The withdraw form of applicants names them, so applicants each get their own entry"""
+        vary_on = [user_role, self.request.user.id] if user_role == 'APP' else [user_role]
+        welcome = cache.get_club_fragment(
+            'club_welcome', club_id, vary_on, lambda: self._render_welcome(club_id, user_role))
+        context['welcome'] = mark_safe(cache.insert_csrf_token(welcome, get_token(self.request)))
         return context
 
+    def _render_welcome(self, club_id, user_role):
+        club = get_object_or_404(Club, id=club_id)
+        return render_to_string('partials/club_welcome_content.html', {
+            'club': club,
+            'user': self.request.user,
+            'user_role': user_role,
+            'owner': club.get_owner(),
+            'member_count': club.member_count,
+            'csrf_token': cache.CSRF_TOKEN_PLACEHOLDER})
+
     def get(self, request, *args, **kwargs):
-        """Handle get request, and redirect to user_list if user_id invalid."""
+        """Handle get request, and redirect to the feed if club_id invalid."""
         try:
           return super().get(request, *args, **kwargs)
         except Http404:
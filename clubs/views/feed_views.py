@@ -2,23 +2,49 @@ from django.shortcuts import render, redirect
 from django.contrib.auth import authenticate,login, logout
 from clubs.models import User,Club
 from django.views import View
-from django.views.generic import ListView
+from django.views.generic import ListView, TemplateView
 from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse
+from clubs.views.mixins import KeysetPaginationMixin
 
 
-class FeedView(LoginRequiredMixin,ListView):
-    """View that displays feed information such as a user's clubs and their applications"""
-    model = Club
+class FeedView(LoginRequiredMixin,TemplateView):
+    """View that displays feed information such as a user's clubs and their applications
+
+    Only the expanded "My clubs" panel is rendered here, the other panels load their fragments when expanded"""
     template_name = "feed.html"
-    context_object_name = 'clubs'
 
     def post(self,*args,**kwargs):
         return super().get(*args,**kwargs)
 
     def get_context_data(self,*args,**kwargs):
         context = super(FeedView,self).get_context_data(*args,**kwargs)
-        context['user_clubs'] = self.request.user.get_user_clubs()
-        context['user_applicant_clubs'] = self.request.user.get_applied_clubs()
+        context['user_clubs'] = list(self.request.user.get_user_clubs())
         return context
+
+
+class FeedAllClubsView(LoginRequiredMixin,KeysetPaginationMixin,ListView):
+    """View that renders a page of the feed's "All clubs" panel"""
+    model = Club
+    template_name = "partials/feed_all_clubs.html"
+    context_object_name = 'clubs'
+
+    def get_queryset(self):
+        self.page = self.paginate_keyset(Club.objects.all(), ('club_name', 'id'), settings.CLUB_LIST_PAGE_SIZE)
+        return self.page.object_list
+
+    def get_context_data(self,*args,**kwargs):
+        context = super(FeedAllClubsView,self).get_context_data(*args,**kwargs)
+        context['clubs_page'] = self.page
+        return context
+
+
+class FeedAppliedClubsView(LoginRequiredMixin,ListView):
+    """View that renders the feed's "Pending applications" panel"""
+    model = Club
+    template_name = "partials/feed_applied_clubs.html"
+    context_object_name = 'user_applicant_clubs'
+
+    def get_queryset(self):
+        return list(self.request.user.get_applied_clubs())
@@ -0,0 +1,11 @@
+from django.contrib.auth.decorators import user_passes_test
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+from clubs.metrics import get_all_snapshots, render_prometheus
+
+@require_GET
+@user_passes_test(lambda user: user.is_staff)
+def metrics(request):
+    """View that exposes the request and cache metrics of every worker in the Prometheus text format"""
+    return HttpResponse(
+        render_prometheus(get_all_snapshots()), content_type='text/plain; version=0.0.4; charset=utf-8')
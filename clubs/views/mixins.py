@@ -1,4 +1,9 @@
+from django.conf import settings
 from django.shortcuts import redirect
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.functional import SimpleLazyObject, cached_property
+from clubs.models import Club, ClubRoster
+from clubs.pagination import get_request_cursor, paginate_request
 
 class LoginProhibitedMixin:
     """Mixin that redirects when a user is logged in."""
@@ -25,3 +30,52 @@ class LoginProhibitedMixin:
             )
         else:
             return self.redirect_when_logged_in_url
+
+
+class KeysetPaginationMixin:
+    """Mixin that paginates lists by keyset, with opaque cursors in the query string."""
+
+    def paginate_keyset(self, queryset, ordering, page_size, cursor_parameter='cursor', keep_query=True):
+        """Returns the page of the queryset selected by the request, with URLs of the pages either side."""
+        return paginate_request(self.request, queryset, ordering, page_size, cursor_parameter, keep_query)
+
+    def get_keyset_cursor(self, queryset, ordering, cursor_parameter='cursor'):
+        """Returns the valid cursor of the request, which selects the page without reading it."""
+        return get_request_cursor(self.request, queryset, ordering, cursor_parameter)
+
+
+class CachedRosterMixin(KeysetPaginationMixin):
+    """Mixin for list views of a club's roster whose table is a cached roster fragment.
+
+    The roster page is read lazily, so a cached table costs no roster queries, and the table is
+    shared by every query string, so it varies on the page's cursor alone."""
+
+    page_context_name = 'page'
+
+    def get_roster(self):
+        """Returns the users of self.club that the view lists."""
+        raise ImproperlyConfigured("CachedRosterMixin requires an implementation for 'get_roster()'.")
+
+    def get_queryset(self):
+        self.club = Club.objects.get(club_name=self.kwargs['club_name'])
+        return SimpleLazyObject(lambda: self.page.object_list)
+
+    def get_template_names(self):
+        """The default names would read the lazy roster to find its model"""
+        return [self.template_name]
+
+    @cached_property
+    def roster(self):
+        return self.get_roster().only(*ClubRoster.USER_FIELDS)
+
+    @cached_property
+    def page(self):
+        """The links of the cached table carry the cursor alone"""
+        return self.paginate_keyset(self.roster, ClubRoster.ORDERING, settings.ROSTER_PAGE_SIZE, keep_query=False)
+
+    def get_context_data(self, *args, **kwargs):
+        context = super().get_context_data(*args, **kwargs)
+        context['club'] = self.club
+        context[self.page_context_name] = SimpleLazyObject(lambda: self.page)
+        context['roster_cursor'] = self.get_keyset_cursor(self.roster, ClubRoster.ORDERING)
+        return context
@@ -0,0 +1,53 @@
+from django.shortcuts import redirect
+from clubs.models import Club
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from clubs.helpers import management_required
+from django.http import JsonResponse, HttpResponseBadRequest
+from django.views.decorators.http import require_POST
+
+"""Bulk actions: the action name maps to the outcome reported for each user and the club method applying it"""
+APPLICANT_ACTIONS = {
+    'accept': ('accepted', Club.bulk_accept_applicants),
+    'reject': ('rejected', Club.bulk_reject_applicants),
+}
+MEMBER_ACTIONS = {
+    'ban': ('banned', Club.bulk_ban_members),
+    'promote': ('promoted', Club.bulk_promote_members),
+}
+
+@login_required
+@require_POST
+@management_required
+def bulk_moderate_applicants(request,club_name):
+    """View that accepts or rejects every selected applicant at once"""
+    return _bulk_moderate(request,club_name,APPLICANT_ACTIONS,'applicants_list')
+
+@login_required
+@require_POST
+@management_required
+def bulk_moderate_members(request,club_name):
+    """View that bans or promotes every selected member at once"""
+    return _bulk_moderate(request,club_name,MEMBER_ACTIONS,'member_management')
+
+def _bulk_moderate(request,club_name,actions,redirect_url):
+    """Apply an action to the posted user ids and report the outcome for each user"""
+    action = request.POST.get('action')
+    try:
+        outcome, apply_action = actions[action]
+        user_ids = [int(user_id) for user_id in request.POST.getlist('user_ids')]
+    except (KeyError, ValueError):
+        return HttpResponseBadRequest('Invalid bulk moderation request.')
+    """Databases fail queries on integers wider than 64 bits"""
+    if not all(-2 ** 63 <= user_id < 2 ** 63 for user_id in user_ids):
+        return HttpResponseBadRequest('Invalid bulk moderation request.')
+    club = Club.objects.get(club_name=club_name)
+    applied = apply_action(club,user_ids)
+    outcomes = {user_id: outcome if user_id in applied else 'skipped' for user_id in user_ids}
+    if 'application/json' in request.headers.get('Accept', ''):
+        return JsonResponse({'action': action, 'outcomes': outcomes})
+    if applied:
+        messages.add_message(request, messages.SUCCESS, f'{len(applied)} users {outcome}.')
+    if len(applied) < len(outcomes):
+        messages.add_message(request, messages.WARNING, f'{len(outcomes) - len(applied)} users skipped.')
+    return redirect(redirect_url, club.club_name)
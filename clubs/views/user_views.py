@@ -7,11 +7,13 @@ from django.conf import settings
 from django.utils.decorators import method_decorator
 from django.views.generic.detail import DetailView
 from clubs.helpers import user_exists
+from clubs.etags import conditional_page,show_user_etag
 from django.http import HttpResponseForbidden, Http404
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import ImproperlyConfigured, ObjectDoesNotExist
 from django.urls import reverse
 
+@method_decorator(conditional_page(show_user_etag),name='dispatch')
 @method_decorator(user_exists,name='dispatch')
 class ShowUserView(LoginRequiredMixin, DetailView):
     """View that shows individual user details."""